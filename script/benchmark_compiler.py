@@ -0,0 +1,180 @@
+"""
+Benchmarks FeeAllocator.vy under each compiler optimization mode.
+
+Every build is deployed against mock contracts in a local boa environment
+and prints one CSV row per number of configured receivers (0 to
+MAX_RECEIVERS) with the bytecode sizes, the deploy gas and the execution
+gas of `set_receiver`, `remove_receiver` and `distribute_fees`:
+
+    mox run benchmark_compiler --network pyevm
+    python -m script.benchmark_compiler gas codesize > benchmark.csv
+
+Run with `python -m`, it imports snekmate from lib/, where `mox install`
+puts it. `set_receiver` adds the n-th receiver and `remove_receiver`
+removes one of n receivers, so both are empty for 0 receivers.
+`distribute_fees` is measured on a second weekly run, once receivers hold
+a balance, and every call starts with cold storage and accounts like a
+transaction would. A build over the EIP-170 size limit is not deployed
+and gets a single row with its sizes. A build the compiler fails on gets
+a row with the failure, also reported on stderr.
+"""
+
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+import boa
+from vyper.compiler.settings import OptimizationLevel
+from vyper.exceptions import ModuleNotFound
+
+from script.utils.dependencies import add_import_paths
+from script.utils.gas import reset_access_lists
+from script.utils.receivers import MAX_RECEIVERS
+from script.utils.report import write_csv
+
+ROOT = Path(__file__).parents[1]
+FEE_ALLOCATOR = ROOT / "src" / "FeeAllocator.vy"
+MOCKS = ROOT / "script" / "mocks"
+
+MAX_CODE_SIZE = 24576  # EIP-170
+AMOUNT_TO_DISTRIBUTE = int(100_000 * 1e18)
+
+# name -> (optimization level, venom pipeline)
+MODES = {
+    "gas": (OptimizationLevel.GAS, False),
+    "codesize": (OptimizationLevel.CODESIZE, False),
+    "none": (OptimizationLevel.NONE, False),
+    "venom": (OptimizationLevel.GAS, True),
+}
+
+
+@dataclass
+class Row:
+    mode: str
+    n_receivers: int | None = None
+    initcode_size: int | None = None
+    runtime_size: int | None = None
+    deployable: bool | None = None
+    deploy_gas: int | None = None
+    set_receiver: int | None = None
+    remove_receiver: int | None = None
+    distribute_fees: int | None = None
+    failure: str | None = None  # why the compiler couldn't build the mode
+
+
+def gas_used(contract) -> int:
+    return contract._computation.get_gas_used()
+
+
+def compile_fee_allocator(mode: str):
+    optimize, venom = MODES[mode]
+    deployer = boa.load_partial(
+        str(FEE_ALLOCATOR),
+        compiler_args={"optimize": optimize, "experimental_codegen": venom},
+    )
+    # force compilation so that unsupported builds fail here
+    deployer.compiler_data.bytecode_runtime
+    return deployer
+
+
+def benchmark_mode(mode: str, deployer) -> list[Row]:
+    initcode_size = len(deployer.compiler_data.bytecode)
+    runtime_size = len(deployer.compiler_data.bytecode_runtime)
+    if runtime_size > MAX_CODE_SIZE:
+        # its deployment would revert, only the sizes are reported
+        return [
+            Row(
+                mode,
+                initcode_size=initcode_size,
+                runtime_size=runtime_size,
+                deployable=False,
+            )
+        ]
+
+    admin = boa.env.generate_address()
+    hooker = boa.env.generate_address()
+    receivers = [boa.env.generate_address() for _ in range(MAX_RECEIVERS)]
+
+    rows = []
+    with boa.env.anchor():
+        token = boa.load(str(MOCKS / "MockERC20.vy"))
+        fee_distributor = boa.load(str(MOCKS / "MockFeeDistributor.vy"), token)
+        fee_collector = boa.load(
+            str(MOCKS / "MockFeeCollector.vy"), token, hooker
+        )
+
+        reset_access_lists()
+        fee_allocator = deployer.deploy(fee_distributor, fee_collector, admin)
+        deploy_gas = gas_used(fee_allocator)
+        with boa.env.prank(hooker):
+            token.approve(fee_allocator, 2**256 - 1)
+
+        def distribute() -> int:
+            token.mint(hooker, AMOUNT_TO_DISTRIBUTE)
+            reset_access_lists()
+            with boa.env.prank(hooker):
+                fee_allocator.distribute_fees()
+            return gas_used(fee_allocator)
+
+        for n in range(MAX_RECEIVERS + 1):
+            set_gas = remove_gas = None
+            with boa.env.anchor():
+                with boa.env.prank(admin):
+                    if n > 0:
+                        configs = [(r, 100) for r in receivers[: n - 1]]
+                        if configs:
+                            fee_allocator.set_multiple_receivers(configs)
+                        reset_access_lists()
+                        fee_allocator.set_receiver(receivers[n - 1], 100)
+                        set_gas = gas_used(fee_allocator)
+
+                        with boa.env.anchor():
+                            reset_access_lists()
+                            fee_allocator.remove_receiver(receivers[0])
+                            remove_gas = gas_used(fee_allocator)
+
+                # a first run so that receivers hold a balance
+                distribute()
+                distribute_gas = distribute()
+
+            rows.append(
+                Row(
+                    mode,
+                    n,
+                    initcode_size,
+                    runtime_size,
+                    True,
+                    deploy_gas,
+                    set_gas,
+                    remove_gas,
+                    distribute_gas,
+                )
+            )
+    return rows
+
+
+def benchmark(modes: list[str] = list(MODES)) -> list[Row]:
+    rows = []
+    for mode in modes:
+        try:
+            deployer = compile_fee_allocator(mode)
+        except ModuleNotFound:
+            # snekmate missing, no mode can build
+            raise
+        except Exception as e:
+            # the experimental Venom pipeline fails with bare assertions
+            failure = f"{type(e).__name__}: {e}"
+            print(f"{mode}: failed, {failure}", file=sys.stderr)
+            rows.append(Row(mode, failure=failure))
+            continue
+        rows += benchmark_mode(mode, deployer)
+    return rows
+
+
+def moccasin_main():
+    write_csv(benchmark())
+
+
+if __name__ == "__main__":
+    add_import_paths()
+    write_csv(benchmark(sys.argv[1:] or list(MODES)))
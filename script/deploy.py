@@ -1,9 +1,9 @@
 from moccasin.boa_tools import VyperContract
 from moccasin.config import get_config
 
+from script.utils.hooker import EMPTY_COMPENSATION
 from script.utils.ipfs import pin_to_ipfs
 from src import FeeAllocator
-from tests.conftest import EMPTY_COMPENSATION
 
 FEE_COLLECTOR = (
     get_config().get_active_network().manifest_named("fee_collector")
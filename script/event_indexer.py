@@ -0,0 +1,454 @@
+"""
+Incremental SQLite index of a FeeAllocator's history.
+
+Ingests the `ReceiverSet`, `ReceiverRemoved`, `FeesDistributed` and
+`FeesCarriedOver` events of a FeeAllocator and the crvUSD transfers of its
+distributions (from or to the FeeAllocator, and from the Hooker within a
+distribution) into a SQLite database, next to moccasin's `.deployments.db`. Every run picks up after
+the last block indexed, whose cursor is saved with the rows in the same
+transaction, so an interrupted run leaves nothing half done. Logs are
+queried in chunks of blocks, several chunks to a batched JSON-RPC request,
+retried with a backoff when the node fails them.
+
+The receiver set as of any block is rebuilt from the indexed events, with
+no archive-node calls, and fees can be summed by receiver or by epoch:
+
+    python -m script.event_indexer sync --allocator 0x... --start 21000000
+    python -m script.event_indexer receivers --allocator 0x... --block 21500000
+    python -m script.event_indexer received --allocator 0x... 0x6508ef65...
+
+`--rpc` defaults to MAINNET_RPC_URL. Tests run the indexer on a local boa
+chain instead, through script/utils/local_chain.py.
+"""
+
+import argparse
+import os
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import requests
+from boa.rpc import RPC, EthereumRPC, RPCError, to_hex, to_int
+from eth_utils import keccak
+
+ROOT = Path(__file__).parents[1]
+DB_PATH = ROOT / ".allocator_events.db"
+
+# mainnet, as in moccasin.toml
+CRVUSD = "0xf939E0A03FB07F59A73314E73794Be0E57ac1b4E"
+HOOKER = "0x9A9DF35cd8E88565694CA6AD5093c236C7f6f69D"
+
+WEEK = 7 * 86400  # the FeeCollector's epochs
+CHUNK_SIZE = 2_000  # blocks to an eth_getLogs query
+BATCH_SIZE = 10  # chunks to a batched request
+RETRIES = 5
+BACKOFF = 1.0  # seconds, doubled on every retry
+
+
+def _topic(signature: str) -> str:
+    return "0x" + keccak(text=signature).hex()
+
+
+RECEIVER_SET = _topic("ReceiverSet(address,uint256,uint256)")
+RECEIVER_REMOVED = _topic("ReceiverRemoved(address)")
+FEES_DISTRIBUTED = _topic("FeesDistributed(uint256,uint256)")
+FEES_CARRIED_OVER = _topic("FeesCarriedOver(uint256,uint256)")
+TRANSFER = _topic("Transfer(address,address,uint256)")
+
+_CREATE_CMD = """
+CREATE TABLE IF NOT EXISTS
+    cursors(
+        allocator text primary key,
+        block integer
+    );
+CREATE TABLE IF NOT EXISTS
+    receiver_events(
+        allocator text,
+        block integer,
+        log_index integer,
+        tx_hash text,
+        epoch integer,
+        receiver text,
+        old_weight integer,
+        new_weight integer,  -- 0 for ReceiverRemoved
+        primary key(allocator, block, log_index)
+    );
+CREATE INDEX IF NOT EXISTS
+    receiver_events_receiver ON receiver_events(allocator, receiver);
+CREATE TABLE IF NOT EXISTS
+    distributions(
+        allocator text,
+        block integer,
+        log_index integer,
+        tx_hash text,
+        epoch integer,
+        -- uint256 amounts, as decimal text
+        total_amount text,
+        distributor_share text,
+        -- from the FeesCarriedOver of the same transaction, 0 without one
+        carried_over text,
+        carry_released text,
+        primary key(allocator, block, log_index)
+    );
+CREATE INDEX IF NOT EXISTS
+    distributions_epoch ON distributions(allocator, epoch);
+CREATE TABLE IF NOT EXISTS
+    transfers(
+        allocator text,
+        block integer,
+        log_index integer,
+        tx_hash text,
+        epoch integer,
+        sender text,
+        receiver text,
+        amount text,
+        primary key(allocator, block, log_index)
+    );
+CREATE INDEX IF NOT EXISTS
+    transfers_receiver ON transfers(allocator, receiver);
+CREATE INDEX IF NOT EXISTS
+    transfers_epoch ON transfers(allocator, epoch);
+"""
+
+
+def _address_topic(address: str) -> str:
+    return "0x" + address.lower().removeprefix("0x").rjust(64, "0")
+
+
+def _topic_address(topic: str) -> str:
+    return "0x" + topic[-40:]
+
+
+def _words(data: str) -> list[int]:
+    data = data.removeprefix("0x")
+    return [int(data[i : i + 64], 16) for i in range(0, len(data), 64)]
+
+
+@dataclass
+class Distribution:
+    block: int
+    epoch: int
+    total_amount: int
+    distributor_share: int
+    carried_over: int
+    carry_released: int
+
+
+class EventIndexer:
+    """
+    Indexes the history of the FeeAllocator at `allocator`, from
+    `start_block` (its deployment) on. `token` and `hooker` are the fee
+    token and the Hooker, whose transfers are indexed along. Blocks within
+    `confirmations` of the head are left for a later run, as they may
+    still be reorganised.
+    """
+
+    def __init__(
+        self,
+        rpc: RPC,
+        allocator: str,
+        token: str = CRVUSD,
+        hooker: str = HOOKER,
+        db_path: Path | str = DB_PATH,
+        start_block: int = 0,
+        chunk_size: int = CHUNK_SIZE,
+        batch_size: int = BATCH_SIZE,
+        retries: int = RETRIES,
+        backoff: float = BACKOFF,
+        confirmations: int = 0,
+    ):
+        self.rpc = rpc
+        self.allocator = allocator.lower()
+        self.token = token.lower()
+        self.hooker = hooker.lower()
+        self.start_block = start_block
+        self.chunk_size = chunk_size
+        self.batch_size = batch_size
+        self.retries = retries
+        self.backoff = backoff
+        self.confirmations = confirmations
+
+        if db_path != ":memory:":  # sqlite magic path
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(db_path)
+        self.db.executescript(_CREATE_CMD)
+
+    def close(self):
+        self.db.close()
+
+    @property
+    def cursor(self) -> int:
+        """
+        The last block indexed, `start_block - 1` before the first run.
+        """
+        row = self.db.execute(
+            "SELECT block FROM cursors WHERE allocator = ?", (self.allocator,)
+        ).fetchone()
+        return self.start_block - 1 if row is None else row[0]
+
+    def _fetch_multi(self, payloads: list[tuple[str, Any]]) -> list[Any]:
+        for attempt in range(self.retries + 1):
+            try:
+                return self.rpc.fetch_multi(payloads)
+            except (RPCError, requests.RequestException):
+                if attempt == self.retries:
+                    raise
+                time.sleep(self.backoff * 2**attempt)
+        raise AssertionError("unreachable")
+
+    def _log_queries(self, start: int, end: int) -> list[tuple[str, Any]]:
+        blocks = {"fromBlock": to_hex(start), "toBlock": to_hex(end)}
+        allocator = _address_topic(self.allocator)
+        return [
+            (
+                "eth_getLogs",
+                [
+                    {
+                        **blocks,
+                        "address": self.allocator,
+                        "topics": [
+                            [
+                                RECEIVER_SET,
+                                RECEIVER_REMOVED,
+                                FEES_DISTRIBUTED,
+                                FEES_CARRIED_OVER,
+                            ]
+                        ],
+                    }
+                ],
+            ),
+            (
+                "eth_getLogs",
+                [
+                    {
+                        **blocks,
+                        "address": self.token,
+                        "topics": [
+                            TRANSFER,
+                            [allocator, _address_topic(self.hooker)],
+                        ],
+                    }
+                ],
+            ),
+            (
+                "eth_getLogs",
+                [
+                    {
+                        **blocks,
+                        "address": self.token,
+                        "topics": [TRANSFER, None, allocator],
+                    }
+                ],
+            ),
+        ]
+
+    def _timestamps(self, blocks: set[int]) -> dict[int, int]:
+        blocks = sorted(blocks)
+        timestamps = {}
+        for i in range(0, len(blocks), self.batch_size):
+            batch = blocks[i : i + self.batch_size]
+            results = self._fetch_multi(
+                [("eth_getBlockByNumber", [to_hex(b), False]) for b in batch]
+            )
+            for block, result in zip(batch, results):
+                timestamps[block] = to_int(result["timestamp"])
+        return timestamps
+
+    def _ingest(self, logs: list[dict[str, Any]], end: int):
+        distribution_txs = {
+            log["transactionHash"]
+            for log in logs
+            if log["address"].lower() == self.allocator
+            and log["topics"][0] == FEES_DISTRIBUTED
+        }
+        carry_overs = {
+            log["transactionHash"]: _words(log["data"])
+            for log in logs
+            if log["address"].lower() == self.allocator
+            and log["topics"][0] == FEES_CARRIED_OVER
+        }
+        kept = {}
+        for log in logs:
+            # transfers from the Hooker belong to a distribution only when
+            # the FeeAllocator pays from it (distribute_fees_direct)
+            if (
+                log["address"].lower() == self.token
+                and _topic_address(log["topics"][1]) == self.hooker
+                and _topic_address(log["topics"][2]) != self.allocator
+                and log["transactionHash"] not in distribution_txs
+            ):
+                continue
+            # folded into the row of its transaction's FeesDistributed
+            if log["topics"][0] == FEES_CARRIED_OVER:
+                continue
+            # a transfer can match more than one query
+            kept[to_int(log["blockNumber"]), to_int(log["logIndex"])] = log
+
+        timestamps = self._timestamps({block for block, _ in kept})
+        receiver_events, distributions, transfers = [], [], []
+        for (block, log_index), log in sorted(kept.items()):
+            row = (
+                self.allocator,
+                block,
+                log_index,
+                log["transactionHash"],
+                timestamps[block] // WEEK,
+            )
+            topics, words = log["topics"], _words(log["data"])
+            if log["address"].lower() == self.token:
+                transfers.append(
+                    row
+                    + (
+                        _topic_address(topics[1]),
+                        _topic_address(topics[2]),
+                        str(words[0]),
+                    )
+                )
+            elif topics[0] == RECEIVER_SET:
+                receiver_events.append(
+                    row + (_topic_address(topics[1]), words[0], words[1])
+                )
+            elif topics[0] == RECEIVER_REMOVED:
+                receiver_events.append(
+                    row + (_topic_address(topics[1]), None, 0)
+                )
+            else:
+                words += carry_overs.get(log["transactionHash"], [0, 0])
+                distributions.append(row + tuple(str(w) for w in words))
+
+        # the rows and the cursor are written at once
+        with self.db:
+            self.db.executemany(
+                "INSERT OR IGNORE INTO receiver_events VALUES(?,?,?,?,?,?,?,?)",
+                receiver_events,
+            )
+            self.db.executemany(
+                "INSERT OR IGNORE INTO distributions VALUES(?,?,?,?,?,?,?,?,?)",
+                distributions,
+            )
+            self.db.executemany(
+                "INSERT OR IGNORE INTO transfers VALUES(?,?,?,?,?,?,?,?)",
+                transfers,
+            )
+            self.db.execute(
+                "INSERT OR REPLACE INTO cursors VALUES(?, ?)",
+                (self.allocator, end),
+            )
+
+    def sync(self, to_block: int | None = None) -> int:
+        """
+        Index the blocks after the cursor up to `to_block`, the head less
+        the confirmations by default. Returns the new cursor.
+        """
+        if to_block is None:
+            (head,) = self._fetch_multi([("eth_blockNumber", [])])
+            to_block = to_int(head) - self.confirmations
+
+        start = self.cursor + 1
+        while start <= to_block:
+            chunks = []
+            for _ in range(self.batch_size):
+                if start > to_block:
+                    break
+                end = min(start + self.chunk_size - 1, to_block)
+                chunks.append((start, end))
+                start = end + 1
+            queries = [
+                query
+                for chunk_start, chunk_end in chunks
+                for query in self._log_queries(chunk_start, chunk_end)
+            ]
+            results = self._fetch_multi(queries)
+            self._ingest([log for logs in results for log in logs], end)
+        return self.cursor
+
+    def receivers_at(self, block: int) -> dict[str, int]:
+        """
+        The receivers and their weights as of the end of `block`, replayed
+        from the indexed events.
+        """
+        assert block <= self.cursor, f"indexer: block {block} not indexed"
+        receivers: dict[str, int] = {}
+        for receiver, new_weight in self.db.execute(
+            "SELECT receiver, new_weight FROM receiver_events "
+            "WHERE allocator = ? AND block <= ? ORDER BY block, log_index",
+            (self.allocator, block),
+        ):
+            if new_weight == 0:
+                receivers.pop(receiver, None)
+            else:
+                receivers[receiver] = new_weight
+        return receivers
+
+    def received(
+        self, receiver: str, from_block: int = 0, to_block: int | None = None
+    ) -> int:
+        """
+        The fee token `receiver` got from the FeeAllocator's distributions
+        and claims, from `from_block` to `to_block` included.
+        """
+        to_block = self.cursor if to_block is None else to_block
+        rows = self.db.execute(
+            "SELECT amount FROM transfers WHERE allocator = ? AND receiver = ? "
+            "AND block BETWEEN ? AND ?",
+            (self.allocator, receiver.lower(), from_block, to_block),
+        )
+        return sum(int(amount) for (amount,) in rows)
+
+    def distributions(self, epoch: int | None = None) -> list[Distribution]:
+        """
+        The indexed `FeesDistributed` events, with the carry-overs of their
+        `FeesCarriedOver`, of a single epoch if given.
+        """
+        query = (
+            "SELECT block, epoch, total_amount, distributor_share, "
+            "carried_over, carry_released FROM distributions "
+            "WHERE allocator = ?"
+        )
+        params: tuple = (self.allocator,)
+        if epoch is not None:
+            query += " AND epoch = ?"
+            params += (epoch,)
+        return [
+            Distribution(*(int(value) for value in row))
+            for row in self.db.execute(
+                query + " ORDER BY block, log_index", params
+            )
+        ]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("command", choices=["sync", "receivers", "received"])
+    parser.add_argument("receiver", nargs="?")
+    parser.add_argument("--allocator", required=True)
+    parser.add_argument("--rpc", default=os.environ.get("MAINNET_RPC_URL"))
+    parser.add_argument("--db", type=Path, default=DB_PATH)
+    parser.add_argument("--start", type=int, default=0, help="first block")
+    parser.add_argument("--block", type=int, help="as of this block")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--confirmations", type=int, default=64)
+    args = parser.parse_args()
+
+    indexer = EventIndexer(
+        EthereumRPC(args.rpc),
+        args.allocator,
+        db_path=args.db,
+        start_block=args.start,
+        chunk_size=args.chunk_size,
+        batch_size=args.batch_size,
+        confirmations=args.confirmations,
+    )
+    if args.command == "sync":
+        print(f"indexed up to block {indexer.sync()}")
+    elif args.command == "receivers":
+        block = indexer.cursor if args.block is None else args.block
+        for receiver, weight in indexer.receivers_at(block).items():
+            print(f"{receiver} {weight}")
+    else:
+        assert args.receiver, "received: receiver address missing"
+        print(indexer.received(args.receiver, to_block=args.block))
+    indexer.close()
@@ -0,0 +1,511 @@
+"""
+Pure Python model of FeeAllocator.vy, used as the reference of the
+differential fuzzing in tests/test_fuzz.py.
+
+It covers the receiver table, payout policies, `distribute_fees`, the
+accrual mode (`accrue_fees` and `claim`) and paginated rounds, with the
+contract's integer rounding, the storage they write, the crvUSD balances
+they move and the events the FeeAllocator logs:
+
+    model = FeeAllocatorModel(fee_allocator.address, fee_distributor.address)
+    events = model.set_receiver(receiver, 1000)
+    events = model.distribute_fees(hooker_balance, timestamp)
+
+Calls that revert raise ModelRevert with the contract's revert reason and
+leave the model unchanged. Merkle epochs, the direct and batch modes, other
+tokens and payout logs are not modelled, and the model assumes they are
+left unused.
+"""
+
+import copy
+from contextlib import contextmanager
+from dataclasses import astuple, dataclass, field
+
+from script.utils.fee_collector import WEEK
+from script.utils.receivers import (
+    MAX_BPS,
+    MAX_RECEIVERS,
+    MAX_TOTAL_WEIGHT,
+    WEIGHT_SHIFT,
+    ZERO_ADDRESS,
+)
+
+MAX_MIN_PAYOUT = (1 << 96) - 1
+MAX_INTERVAL = (1 << 16) - 1
+MAX_CARRY_OVER = (1 << 128) - 1
+FEES_PER_WEIGHT_PRECISION = 10**18
+
+# storage packing
+HAS_PAYOUT_POLICY = 1 << 255
+PAYOUT_MIN_SHIFT = 128
+PAYOUT_INTERVAL_SHIFT = 224
+PAYOUT_WEEK_SHIFT = 240
+
+
+class ModelRevert(Exception):
+    pass
+
+
+@dataclass
+class Receiver:
+    address: str
+    weight: int
+    has_payout_policy: bool = False
+
+
+@dataclass
+class PayoutPolicy:
+    # in the order of the contract's PayoutPolicy struct
+    min_payout: int = 0
+    interval: int = 0
+    last_payout_week: int = 0
+    carried_over: int = 0
+
+
+@dataclass
+class DistributionRound:
+    # in the order of the contract's DistributionRound struct
+    total_amount: int = 0
+    distributor_share: int = 0
+    carried_over: int = 0
+    carry_released: int = 0
+    cursor: int = 0
+
+
+@dataclass
+class FeeAllocatorModel:
+    address: str
+    fee_distributor: str
+    receivers: list[Receiver] = field(default_factory=list)
+    total_weight: int = 0
+    reserved_balance: int = 0
+    payout_policies: dict[str, PayoutPolicy] = field(default_factory=dict)
+    fees_per_weight: int = 0
+    receiver_fees_per_weight: dict[str, int] = field(default_factory=dict)
+    settled_fees: dict[str, int] = field(default_factory=dict)
+    distribution_round: DistributionRound = field(
+        default_factory=DistributionRound
+    )
+    round_receivers: list[Receiver] = field(default_factory=list)
+    # crvUSD balances, of the FeeAllocator, the fee distributor and receivers
+    balances: dict[str, int] = field(default_factory=dict)
+
+    @contextmanager
+    def _atomic(self):
+        # a revert undoes the whole call, like a reverted transaction
+        state = copy.deepcopy(self.__dict__)
+        try:
+            yield
+        except ModelRevert:
+            self.__dict__ = state
+            raise
+
+    def _index(self, receiver: str) -> int | None:
+        for i, entry in enumerate(self.receivers):
+            if entry.address == receiver:
+                return i
+        return None
+
+    def _deposit(self, receiver: str, amount: int):
+        # crvUSD coming from the hooker, whose balance is not tracked
+        self.balances[receiver] = self.balances.get(receiver, 0) + amount
+
+    def _transfer(self, sender: str, receiver: str, amount: int):
+        self.balances[sender] = self.balances.get(sender, 0) - amount
+        self._deposit(receiver, amount)
+
+    def _settle(self, receiver: str, weight: int):
+        last_fees_per_weight = self.receiver_fees_per_weight.get(receiver, 0)
+        if self.fees_per_weight == last_fees_per_weight:
+            return
+        if weight > 0:
+            self.settled_fees[receiver] = (
+                self.settled_fees.get(receiver, 0)
+                + weight
+                * (self.fees_per_weight - last_fees_per_weight)
+                // FEES_PER_WEIGHT_PRECISION
+            )
+        self.receiver_fees_per_weight[receiver] = self.fees_per_weight
+
+    def _pay_carry_over(self, receiver: str, events: list):
+        carried = self.payout_policies.pop(
+            receiver, PayoutPolicy()
+        ).carried_over
+        if carried > 0:
+            self.reserved_balance -= carried
+            self._transfer(self.address, receiver, carried)
+            events.append(("CarryOverPaid", receiver, carried))
+
+    def _release_receiver(self, entry: Receiver, events: list):
+        self._settle(entry.address, entry.weight)
+        if entry.has_payout_policy:
+            self._pay_carry_over(entry.address, events)
+        events.append(("ReceiverRemoved", entry.address))
+
+    def _set_receiver(self, receiver: str, weight: int, events: list):
+        if receiver == ZERO_ADDRESS:
+            raise ModelRevert("zeroaddr: receiver")
+        if weight == 0:
+            raise ModelRevert("receivers: invalid weight, use remove_receiver")
+
+        index = self._index(receiver)
+        old_weight = 0
+        if index is not None:
+            old_weight = self.receivers[index].weight
+        elif len(self.receivers) >= MAX_RECEIVERS:
+            raise ModelRevert("receivers: max limit reached")
+        total_weight = self.total_weight - old_weight + weight
+        if total_weight > MAX_TOTAL_WEIGHT:
+            raise ModelRevert("receivers: exceeds max total weight")
+
+        self._settle(receiver, old_weight)
+        if index is not None:
+            self.receivers[index].weight = weight
+        else:
+            self.receivers.append(Receiver(receiver, weight))
+        self.total_weight = total_weight
+        events.append(("ReceiverSet", receiver, old_weight, weight))
+
+    def _remove_receiver(self, receiver: str, events: list):
+        index = self._index(receiver)
+        if index is None:
+            raise ModelRevert("receivers: does not exist")
+        entry = self.receivers[index]
+        self._release_receiver(entry, events)
+        # the last entry takes the place of the removed one
+        self.receivers[index] = self.receivers[-1]
+        self.receivers.pop()
+        self.total_weight -= entry.weight
+
+    def set_receiver(self, receiver: str, weight: int) -> list:
+        events = []
+        with self._atomic():
+            self._set_receiver(receiver, weight, events)
+        return events
+
+    def set_multiple_receivers(self, configs: list[tuple[str, int]]) -> list:
+        events = []
+        with self._atomic():
+            if not configs:
+                raise ModelRevert("receivers: empty array")
+            for receiver, weight in configs:
+                self._set_receiver(receiver, weight, events)
+        return events
+
+    def remove_receiver(self, receiver: str) -> list:
+        events = []
+        with self._atomic():
+            self._remove_receiver(receiver, events)
+        return events
+
+    def replace_receivers(self, configs: list[tuple[str, int]]) -> list:
+        events = []
+        with self._atomic():
+            old_receivers = {entry.address: entry for entry in self.receivers}
+            new_receivers = []
+            for receiver, weight in configs:
+                if receiver == ZERO_ADDRESS:
+                    raise ModelRevert("zeroaddr: receiver")
+                if weight == 0:
+                    raise ModelRevert(
+                        "receivers: invalid weight, use remove_receiver"
+                    )
+                if any(entry.address == receiver for entry in new_receivers):
+                    raise ModelRevert("receivers: duplicate receiver")
+
+                old = old_receivers.get(receiver)
+                old_weight = 0 if old is None else old.weight
+                if old_weight != weight:
+                    self._settle(receiver, old_weight)
+                    events.append(
+                        ("ReceiverSet", receiver, old_weight, weight)
+                    )
+                new_receivers.append(
+                    Receiver(
+                        receiver,
+                        weight,
+                        old is not None and old.has_payout_policy,
+                    )
+                )
+
+            total_weight = sum(weight for _, weight in configs)
+            if total_weight > MAX_TOTAL_WEIGHT:
+                raise ModelRevert("receivers: exceeds max total weight")
+
+            kept = {receiver for receiver, _ in configs}
+            for entry in self.receivers:
+                if entry.address not in kept:
+                    self._release_receiver(entry, events)
+            self.receivers = new_receivers
+            self.total_weight = total_weight
+        return events
+
+    def set_payout_policy(
+        self, receiver: str, min_payout: int, interval: int, timestamp: int
+    ) -> list:
+        events = []
+        with self._atomic():
+            index = self._index(receiver)
+            if index is None:
+                raise ModelRevert("receivers: does not exist")
+            if min_payout > MAX_MIN_PAYOUT:
+                raise ModelRevert("payouts: invalid min payout")
+            if interval > MAX_INTERVAL:
+                raise ModelRevert("payouts: invalid interval")
+
+            entry = self.receivers[index]
+            if min_payout == 0 and interval == 0:
+                if entry.has_payout_policy:
+                    self._pay_carry_over(receiver, events)
+                    entry.has_payout_policy = False
+            else:
+                policy = self.payout_policies.get(receiver, PayoutPolicy())
+                last_payout_week = policy.last_payout_week
+                if policy == PayoutPolicy():
+                    last_payout_week = timestamp // WEEK
+                self.payout_policies[receiver] = PayoutPolicy(
+                    min_payout, interval, last_payout_week, policy.carried_over
+                )
+                entry.has_payout_policy = True
+            events.append(("PayoutPolicySet", receiver, min_payout, interval))
+        return events
+
+    def _apply_payout_policy(
+        self, receiver: str, amount: int, week: int
+    ) -> tuple[int, int]:
+        policy = self.payout_policies.get(receiver, PayoutPolicy())
+        if policy.min_payout == 0 and policy.interval == 0:
+            return amount, 0
+        carried = policy.carried_over
+        owed = carried + amount
+
+        if (policy.min_payout > 0 and owed >= policy.min_payout) or (
+            policy.interval > 0
+            and week >= policy.last_payout_week + policy.interval
+        ):
+            policy.last_payout_week = week
+            policy.carried_over = 0
+            self.reserved_balance -= carried
+            return owed, carried
+
+        if owed > MAX_CARRY_OVER:
+            raise ModelRevert("payouts: carry-over overflow")
+        policy.carried_over = owed
+        self.reserved_balance += amount
+        return 0, 0
+
+    def distribute_fees(self, hooker_balance: int, timestamp: int) -> list:
+        """
+        Distribute the whole crvUSD balance of the hooker, `hooker_balance`.
+        """
+        events = []
+        with self._atomic():
+            self._deposit(self.address, hooker_balance)
+            balance = self.balances[self.address] - self.reserved_balance
+            if balance == 0:
+                raise ModelRevert("receivers: no fees to distribute")
+
+            remaining_balance = balance
+            carried_over = carry_released = 0
+            for entry in self.receivers:
+                amount = balance * entry.weight // MAX_BPS
+                if amount == 0:
+                    continue
+                remaining_balance -= amount
+
+                payout = amount
+                if entry.has_payout_policy:
+                    payout, released = self._apply_payout_policy(
+                        entry.address, amount, timestamp // WEEK
+                    )
+                    if payout == 0:
+                        carried_over += amount
+                    carry_released += released
+                if payout > 0:
+                    self._transfer(self.address, entry.address, payout)
+
+            self._transfer(
+                self.address, self.fee_distributor, remaining_balance
+            )
+            events.append(("FeesDistributed", balance, remaining_balance))
+            if carried_over > 0 or carry_released > 0:
+                events.append(
+                    ("FeesCarriedOver", carried_over, carry_released)
+                )
+        return events
+
+    def accrue_fees(self, hooker_balance: int) -> list:
+        """
+        Accrue the whole crvUSD balance of the hooker, `hooker_balance`.
+        """
+        events = []
+        with self._atomic():
+            if hooker_balance == 0:
+                raise ModelRevert("receivers: no fees to distribute")
+
+            fees_per_weight = (
+                hooker_balance * FEES_PER_WEIGHT_PRECISION // MAX_BPS
+            )
+            # rounded up, like the contract
+            receivers_share = (
+                fees_per_weight * self.total_weight
+                + FEES_PER_WEIGHT_PRECISION
+                - 1
+            ) // FEES_PER_WEIGHT_PRECISION
+            self.fees_per_weight += fees_per_weight
+            self.reserved_balance += receivers_share
+            self._deposit(self.address, receivers_share)
+            self._deposit(
+                self.fee_distributor, hooker_balance - receivers_share
+            )
+            events.append(
+                (
+                    "FeesAccrued",
+                    hooker_balance,
+                    receivers_share,
+                    self.fees_per_weight,
+                )
+            )
+        return events
+
+    def claim(self, receiver: str) -> list:
+        events = []
+        with self._atomic():
+            index = self._index(receiver)
+            weight = 0 if index is None else self.receivers[index].weight
+            self._settle(receiver, weight)
+            amount = self.settled_fees.pop(receiver, 0)
+            if amount > 0:
+                self.reserved_balance -= amount
+                self._transfer(self.address, receiver, amount)
+            events.append(("FeesClaimed", receiver, amount))
+        return events
+
+    def distribute_fees_paginated(
+        self,
+        max_receivers: int,
+        is_hooker: bool,
+        hooker_balance: int,
+        timestamp: int,
+    ) -> list:
+        """
+        Pay at most `max_receivers` receivers of the current round. A round
+        is started by the hooker, `is_hooker`, with its whole crvUSD
+        balance, `hooker_balance`.
+        """
+        events = []
+        with self._atomic():
+            if max_receivers == 0:
+                raise ModelRevert("distribute: invalid page size")
+
+            distribution_round = self.distribution_round
+            if distribution_round.total_amount == 0:
+                if not is_hooker:
+                    raise ModelRevert("distribute: hooker only")
+                self._deposit(self.address, hooker_balance)
+                balance = self.balances[self.address] - self.reserved_balance
+                if balance == 0:
+                    raise ModelRevert("receivers: no fees to distribute")
+                # the whole round is reserved until it is paid out
+                self.reserved_balance += balance
+                self.round_receivers = copy.deepcopy(self.receivers)
+                distribution_round = DistributionRound(balance, balance)
+                events.append(
+                    (
+                        "DistributionRoundStarted",
+                        balance,
+                        len(self.round_receivers),
+                    )
+                )
+
+            balance = distribution_round.total_amount
+            start = distribution_round.cursor
+            end = min(len(self.round_receivers), start + max_receivers)
+            paid = 0
+            for entry in self.round_receivers[start:end]:
+                amount = balance * entry.weight // MAX_BPS
+                if amount == 0:
+                    continue
+                distribution_round.distributor_share -= amount
+                paid += amount
+
+                payout = amount
+                if entry.has_payout_policy:
+                    payout, released = self._apply_payout_policy(
+                        entry.address, amount, timestamp // WEEK
+                    )
+                    if payout == 0:
+                        distribution_round.carried_over += amount
+                    distribution_round.carry_released += released
+                if payout > 0:
+                    self._transfer(self.address, entry.address, payout)
+            self.reserved_balance -= paid
+
+            if end < len(self.round_receivers):
+                distribution_round.cursor = end
+                self.distribution_round = distribution_round
+                return events
+
+            # the snapshot is kept until the next round overwrites it
+            self.distribution_round = DistributionRound()
+            distributor_share = distribution_round.distributor_share
+            self.reserved_balance -= distributor_share
+            self._transfer(
+                self.address, self.fee_distributor, distributor_share
+            )
+            events.append(("FeesDistributed", balance, distributor_share))
+            if (
+                distribution_round.carried_over > 0
+                or distribution_round.carry_released > 0
+            ):
+                events.append(
+                    (
+                        "FeesCarriedOver",
+                        distribution_round.carried_over,
+                        distribution_round.carry_released,
+                    )
+                )
+        return events
+
+    def storage(self) -> dict:
+        """
+        The storage variables of the FeeAllocator the model covers, packed
+        like the contract stores them, with zero mapping entries left out.
+        """
+        return {
+            "packed_receivers": [_pack(entry) for entry in self.receivers],
+            "receiver_indices": {
+                entry.address: i + 1 for i, entry in enumerate(self.receivers)
+            },
+            "total_weight": self.total_weight,
+            "reserved_balance": self.reserved_balance,
+            "payout_policies": {
+                receiver: (policy.last_payout_week << PAYOUT_WEEK_SHIFT)
+                | (policy.interval << PAYOUT_INTERVAL_SHIFT)
+                | (policy.min_payout << PAYOUT_MIN_SHIFT)
+                | policy.carried_over
+                for receiver, policy in self.payout_policies.items()
+                if policy != PayoutPolicy()
+            },
+            "fees_per_weight": self.fees_per_weight,
+            "receiver_fees_per_weight": _nonzero(
+                self.receiver_fees_per_weight
+            ),
+            "settled_fees": _nonzero(self.settled_fees),
+            "distribution_round": astuple(self.distribution_round),
+            "round_receivers": [
+                _pack(entry) for entry in self.round_receivers
+            ],
+        }
+
+
+def _pack(entry: Receiver) -> int:
+    return (
+        (HAS_PAYOUT_POLICY if entry.has_payout_policy else 0)
+        | (entry.weight << WEIGHT_SHIFT)
+        | int(entry.address, 16)
+    )
+
+
+def _nonzero(mapping: dict) -> dict:
+    return {key: value for key, value in mapping.items() if value != 0}
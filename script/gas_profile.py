@@ -0,0 +1,293 @@
+"""
+Line-level gas profile of FeeAllocator.vy over a scripted scenario.
+
+Deploys a FeeAllocator on the active network, hooks it into the Hooker and
+profiles every step of a scenario: configuring receivers, two weekly
+`FeeCollector.forward` runs through the Hooker, a direct `distribute_fees`
+and removing receivers. Every step runs as a fresh transaction, with cold
+storage and accounts. For each source line of the FeeAllocator (its
+modules included) it reports, summed over the scenario:
+
+- gas: spent by the line itself, external calls excluded,
+- sload, sstore: the number of storage reads and writes it executed,
+- call_gas: spent by the external calls it made,
+- memory_gas: the part of `gas` that paid for memory expansion.
+
+The report is written to out/gas_profile.txt and out/gas_profile.json,
+with lines in source order and no addresses, so that profiles of two
+commits can be diffed:
+
+    mox run gas_profile --network pyevm
+    cp out/gas_profile.txt /tmp/before.txt
+    git checkout <commit> && mox run gas_profile --network pyevm
+    diff /tmp/before.txt out/gas_profile.txt
+"""
+
+import json
+import os
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable
+
+import boa
+import vyper.ast as vy_ast
+from boa.vm.gas_meters import ProfilingGasMeter
+from moccasin.config import get_config
+
+from script.utils.fee_collector import WEEK, set_epoch_to_forward
+from script.utils.gas import reset_access_lists
+from script.utils.hooker import add_fee_allocator_to_hooker
+from src import FeeAllocator
+
+ROOT = Path(__file__).parents[1]
+OUT = ROOT / "out"
+
+AMOUNT_TO_DISTRIBUTE = int(100_000 * 1e18)
+RECEIVERS = ["0x" + f"{i:02x}" * 20 for i in range(0x31, 0x3B)]
+SLOAD, SSTORE = 0x54, 0x55
+
+
+class LineGasMeter(ProfilingGasMeter):
+    """
+    The gas meter of boa's profiler, which keeps the gas of every PC, also
+    keeping the gas every PC spent on memory expansion.
+    """
+
+    def __init__(self, start_gas, *args, **kwargs):
+        super().__init__(start_gas, *args, **kwargs)
+        self._memory_gas_of = {}
+
+    def consume_gas(self, amount: int, reason: str) -> None:
+        super().consume_gas(amount, reason)
+        if reason.startswith("Expanding memory"):
+            self._memory_gas_of.setdefault(self._pc, 0)
+            self._memory_gas_of[self._pc] += amount
+
+
+@dataclass
+class LineStats:
+    module: str
+    line: int
+    function: str
+    source: str
+    gas: int = 0
+    sload: int = 0
+    sstore: int = 0
+    call_gas: int = 0
+    memory_gas: int = 0
+
+
+@dataclass
+class EntryPoint:
+    step: str
+    function: str
+    gas: int
+
+
+def _module_path(node) -> str:
+    path = node.module_node.resolved_path
+    try:
+        return Path(path).resolve().relative_to(ROOT).as_posix()
+    except ValueError:
+        return str(path)
+
+
+def profile_computation(contract, computation, lines: dict):
+    """
+    Add the gas of a call into `contract` to `lines`, keyed by module and
+    line number.
+    """
+    source_map = contract.source_map["pc_raw_ast_map"]
+    meter = computation._gas_meter
+    code = computation.code._raw_code_bytes
+    # the CALL opcode is one before the PC boa records for a child call
+    child_gas = {}
+    for pc, child in zip(computation._child_pcs, computation.children):
+        child_gas.setdefault(pc - 1, 0)
+        child_gas[pc - 1] += child.get_gas_used()
+
+    node = None
+    seen = set()
+    for pc in computation.code._trace:
+        # like boa's profiler, a PC without a source position belongs to
+        # the last line that had one
+        node = source_map.get(pc, node)
+        if node is None:
+            continue
+        key = (_module_path(node), node.lineno)
+        if key not in lines:
+            fn = node.get_ancestor(vy_ast.FunctionDef)
+            lines[key] = LineStats(
+                *key,
+                "<dispatch>" if fn is None else fn.name,
+                node.full_source_code.splitlines()[node.lineno - 1].strip(),
+            )
+        stats = lines[key]
+        stats.sload += code[pc] == SLOAD
+        stats.sstore += code[pc] == SSTORE
+        if pc in seen:
+            # the gas meter sums the gas of every run of a PC
+            continue
+        seen.add(pc)
+        call_gas = child_gas.get(pc, 0)
+        stats.gas += meter._gas_used_of.get(pc, 0) - call_gas
+        stats.call_gas += call_gas
+        stats.memory_gas += meter._memory_gas_of.get(pc, 0)
+
+
+def fee_allocator_calls(computation, address: bytes):
+    # the calls into the FeeAllocator made within a transaction
+    if computation.msg.code_address == address:
+        yield computation
+        return
+    for child in computation.children:
+        yield from fee_allocator_calls(child, address)
+
+
+def scenario(
+    fee_allocator, admin, network
+) -> list[tuple[str, Callable[[], object]]]:
+    """
+    The scenario steps, as a label and a call returning the contract whose
+    last transaction it made.
+    """
+    fee_collector = network.manifest_named("fee_collector")
+    hooker = network.manifest_named("hooker")
+    crvusd = network.manifest_named("crvusd")
+    keeper = boa.env.generate_address()
+
+    def mint(receiver: str):
+        with boa.env.prank(crvusd.minter()):
+            crvusd.mint(receiver, AMOUNT_TO_DISTRIBUTE)
+
+    def as_admin(call):
+        def step():
+            with boa.env.prank(admin.address):
+                call()
+            return fee_allocator
+
+        return step
+
+    def forward():
+        mint(fee_collector.address)
+        with boa.env.prank(keeper):
+            fee_collector.forward([(0, 0, b"")], keeper)
+        return fee_collector
+
+    def next_week_forward():
+        boa.env.time_travel(seconds=WEEK)
+        return forward()
+
+    def distribute_fees():
+        mint(hooker.address)
+        with boa.env.prank(hooker.address):
+            fee_allocator.distribute_fees()
+        return fee_allocator
+
+    configs = [(receiver, 500) for receiver in RECEIVERS]
+    return [
+        (
+            "set_multiple_receivers",
+            as_admin(
+                lambda: fee_allocator.set_multiple_receivers(configs[:-1])
+            ),
+        ),
+        (
+            "set_receiver (add)",
+            as_admin(lambda: fee_allocator.set_receiver(*configs[-1])),
+        ),
+        (
+            "set_receiver (update)",
+            as_admin(lambda: fee_allocator.set_receiver(RECEIVERS[0], 400)),
+        ),
+        ("forward (first week)", forward),
+        ("forward (second week)", next_week_forward),
+        ("distribute_fees", distribute_fees),
+        (
+            "remove_receiver (tail)",
+            as_admin(lambda: fee_allocator.remove_receiver(RECEIVERS[-1])),
+        ),
+        # the last receiver moves into the slot of the first
+        (
+            "remove_receiver (swap)",
+            as_admin(lambda: fee_allocator.remove_receiver(RECEIVERS[0])),
+        ),
+    ]
+
+
+def gas_profile() -> tuple[list[EntryPoint], list[LineStats]]:
+    network = get_config().get_active_network()
+    admin = network.get_default_account()
+
+    entry_points = []
+    lines: dict[tuple[str, int], LineStats] = {}
+    with boa.env.anchor(), boa.env.gas_meter_class(LineGasMeter):
+        fee_collector = network.manifest_named("fee_collector")
+        set_epoch_to_forward(fee_collector)
+        fee_allocator = FeeAllocator.deploy(
+            network.manifest_named("fee_distributor"), fee_collector, admin
+        )
+        add_fee_allocator_to_hooker(
+            network.manifest_named("hooker"),
+            network.manifest_named("crvusd"),
+            fee_allocator,
+        )
+
+        address = fee_allocator.address.canonical_address
+        for step, run in scenario(fee_allocator, admin, network):
+            reset_access_lists()
+            contract = run()
+            for computation in fee_allocator_calls(
+                contract._computation, address
+            ):
+                fn = fee_allocator._get_fn_from_computation(computation)
+                entry_points.append(
+                    EntryPoint(step, fn.name, computation.get_gas_used())
+                )
+                profile_computation(fee_allocator, computation, lines)
+    return entry_points, sorted(
+        lines.values(), key=lambda s: (s.module, s.line)
+    )
+
+
+def format_report(
+    entry_points: list[EntryPoint], lines: list[LineStats]
+) -> str:
+    report = ["# entry points", ""]
+    report += [
+        f"{entry.step:<24} {entry.function:<24} {entry.gas:>9}"
+        for entry in entry_points
+    ]
+    header = (
+        f"{'line':>5} {'gas':>9} {'sload':>6} {'sstore':>6} "
+        f"{'call_gas':>9} {'memory_gas':>10}  source"
+    )
+    functions: dict[tuple[str, str], list[LineStats]] = {}
+    for stats in lines:
+        functions.setdefault((stats.module, stats.function), []).append(stats)
+    for (module, function), function_lines in functions.items():
+        report += ["", f"# {module}: {function}", "", header]
+        report += [
+            f"{s.line:>5} {s.gas:>9} {s.sload:>6} {s.sstore:>6} "
+            f"{s.call_gas:>9} {s.memory_gas:>10}  {s.source}"
+            for s in function_lines
+        ]
+    return "\n".join(report) + "\n"
+
+
+def write_report(
+    entry_points: list[EntryPoint], lines: list[LineStats], out: Path = OUT
+):
+    out.mkdir(parents=True, exist_ok=True)
+    (out / "gas_profile.txt").write_text(format_report(entry_points, lines))
+    data = {
+        "entry_points": [asdict(entry) for entry in entry_points],
+        "lines": [asdict(stats) for stats in lines],
+    }
+    (out / "gas_profile.json").write_text(json.dumps(data, indent=2) + "\n")
+
+
+def moccasin_main():
+    entry_points, lines = gas_profile()
+    write_report(entry_points, lines)
+    print(f"gas profile written to {os.path.relpath(OUT)}/gas_profile.txt")
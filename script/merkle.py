@@ -0,0 +1,120 @@
+"""
+Builds the merkle trees used by the FeeAllocator merkle mode.
+
+Leaves are keccak256(abi_encode(index, receiver, weight)) and every node
+hashes its two children sorted, so proofs are plain lists of siblings.
+Leaves are 96 bytes and nodes 64 bytes, so a node can't be passed off as
+a leaf.
+"""
+
+import json
+from dataclasses import dataclass, field
+
+from eth_abi import encode
+from eth_utils import keccak, to_checksum_address
+
+from script.utils.receivers import MAX_TOTAL_WEIGHT
+
+MAX_MERKLE_DEPTH = 32
+
+
+def leaf_hash(index: int, receiver: str, weight: int) -> bytes:
+    return keccak(
+        encode(["uint256", "address", "uint256"], [index, receiver, weight])
+    )
+
+
+def node_hash(a: bytes, b: bytes) -> bytes:
+    return keccak(a + b) if a < b else keccak(b + a)
+
+
+@dataclass
+class MerkleTree:
+    leaves: list[tuple[str, int]]
+    layers: list[list[bytes]] = field(default_factory=list)
+
+    def __post_init__(self):
+        assert self.leaves, "merkle: no leaves"
+        # claims() keys the proofs by receiver
+        assert len({receiver.lower() for receiver, _ in self.leaves}) == len(
+            self.leaves
+        ), "merkle: duplicate receiver"
+        assert (
+            self.total_weight <= MAX_TOTAL_WEIGHT
+        ), "merkle: exceeds max total weight"
+        layer = [
+            leaf_hash(i, receiver, weight)
+            for i, (receiver, weight) in enumerate(self.leaves)
+        ]
+        self.layers = [layer]
+        while len(layer) > 1:
+            # an unpaired node is carried up to the next layer as is
+            layer = [
+                (
+                    node_hash(layer[i], layer[i + 1])
+                    if i + 1 < len(layer)
+                    else layer[i]
+                )
+                for i in range(0, len(layer), 2)
+            ]
+            self.layers.append(layer)
+        assert self.depth <= MAX_MERKLE_DEPTH, "merkle: tree too deep"
+
+    @property
+    def root(self) -> bytes:
+        return self.layers[-1][0]
+
+    @property
+    def depth(self) -> int:
+        return len(self.layers) - 1
+
+    @property
+    def total_weight(self) -> int:
+        return sum(weight for _, weight in self.leaves)
+
+    def proof(self, index: int) -> list[bytes]:
+        proof = []
+        for layer in self.layers[:-1]:
+            sibling = index ^ 1
+            if sibling < len(layer):
+                proof.append(layer[sibling])
+            index //= 2
+        return proof
+
+    def verify(
+        self, index: int, receiver: str, weight: int, proof: list[bytes]
+    ) -> bool:
+        node = leaf_hash(index, receiver, weight)
+        for sibling in proof:
+            node = node_hash(node, sibling)
+        return node == self.root
+
+    def claims(self) -> dict:
+        """Claim arguments for every receiver, keyed by receiver address."""
+        return {
+            to_checksum_address(receiver): {
+                "index": i,
+                "weight": weight,
+                "proof": ["0x" + p.hex() for p in self.proof(i)],
+            }
+            for i, (receiver, weight) in enumerate(self.leaves)
+        }
+
+
+def build_tree(leaves: list[tuple[str, int]]) -> MerkleTree:
+    """Build the tree of (receiver, weight) leaves, indexed in list order."""
+    return MerkleTree(list(leaves))
+
+
+def write_claims(tree: MerkleTree, path: str):
+    """Dump the root, total weight and per-receiver proofs to a JSON file."""
+    with open(path, "w") as f:
+        json.dump(
+            {
+                "root": "0x" + tree.root.hex(),
+                "total_weight": tree.total_weight,
+                "claims": tree.claims(),
+            },
+            f,
+            indent=2,
+        )
@@ -0,0 +1,78 @@
+# pragma version ^0.4.1
+"""
+@title MockERC20
+@license MIT
+@notice Mintable ERC20 used as a stand-in token in tests
+@dev Like crvUSD, an allowance of max_value(uint256) is never decreased
+"""
+
+from ethereum.ercs import IERC20
+
+implements: IERC20
+
+
+event Transfer:
+    sender: indexed(address)
+    receiver: indexed(address)
+    value: uint256
+
+
+event Approval:
+    owner: indexed(address)
+    spender: indexed(address)
+    value: uint256
+
+
+name: public(constant(String[32])) = "Mock Token"
+symbol: public(constant(String[8])) = "MOCK"
+decimals: public(constant(uint8)) = 18
+
+minter: public(address)
+balanceOf: public(HashMap[address, uint256])
+allowance: public(HashMap[address, HashMap[address, uint256]])
+totalSupply: public(uint256)
+
+
+@deploy
+def __init__():
+    self.minter = msg.sender
+
+
+@internal
+def _transfer(_from: address, _to: address, _value: uint256):
+    assert _to not in [self, empty(address)]
+    self.balanceOf[_from] -= _value
+    self.balanceOf[_to] += _value
+    log Transfer(sender=_from, receiver=_to, value=_value)
+
+
+@external
+def transfer(_to: address, _value: uint256) -> bool:
+    self._transfer(msg.sender, _to, _value)
+    return True
+
+
+@external
+def transferFrom(_from: address, _to: address, _value: uint256) -> bool:
+    allowance: uint256 = self.allowance[_from][msg.sender]
+    if allowance != max_value(uint256):
+        self.allowance[_from][msg.sender] = allowance - _value
+    self._transfer(_from, _to, _value)
+    return True
+
+
+@external
+def approve(_spender: address, _value: uint256) -> bool:
+    self.allowance[msg.sender][_spender] = _value
+    log Approval(owner=msg.sender, spender=_spender, value=_value)
+    return True
+
+
+@external
+def mint(_to: address, _value: uint256) -> bool:
+    assert msg.sender == self.minter
+    assert _to not in [self, empty(address)]
+    self.balanceOf[_to] += _value
+    self.totalSupply += _value
+    log Transfer(sender=empty(address), receiver=_to, value=_value)
+    return True
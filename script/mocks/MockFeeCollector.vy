@@ -0,0 +1,66 @@
+# pragma version ^0.4.1
+"""
+@title MockFeeCollector
+@license MIT
+@notice Stand-in for the FeeCollector in tests and benchmarks
+@dev Only the FORWARD epoch is modelled: it spans the last day of every week
+     and `forward` pays the caller a flat `FORWARD_FEE` cut
+"""
+
+from ethereum.ercs import IERC20
+
+
+interface Hooker:
+    def duty_act(
+        _hook_inputs: DynArray[HookInput, MAX_HOOKS_LEN], _receiver: address
+    ) -> uint256: payable
+
+
+struct HookInput:
+    hook_id: uint8
+    value: uint256
+    data: Bytes[8192]
+
+
+MAX_HOOKS_LEN: constant(uint256) = 32
+WEEK: constant(uint256) = 7 * 86400
+FORWARD: constant(uint256) = 8
+FORWARD_START: constant(uint256) = 6 * 86400
+FORWARD_FEE: constant(uint256) = 10**16  # 1%, 10**18 precision
+
+target: public(IERC20)
+hooker: public(Hooker)
+
+
+@deploy
+def __init__(_target: IERC20, _hooker: Hooker):
+    self.target = _target
+    self.hooker = _hooker
+
+
+@external
+@view
+def epoch_time_frame(_epoch: uint256, _ts: uint256 = block.timestamp) -> (uint256, uint256):
+    assert _epoch == FORWARD, "Bad Epoch"
+    start: uint256 = _ts // WEEK * WEEK + FORWARD_START
+    return start, start + WEEK - FORWARD_START
+
+
+@external
+@view
+def fee(_epoch: uint256 = 0, _ts: uint256 = block.timestamp) -> uint256:
+    return FORWARD_FEE
+
+
+@external
+@nonreentrant
+def forward(
+    _hook_inputs: DynArray[HookInput, MAX_HOOKS_LEN], _receiver: address = msg.sender
+) -> uint256:
+    assert block.timestamp % WEEK >= FORWARD_START, "Wrong epoch"
+    amount: uint256 = staticcall self.target.balanceOf(self)
+    fee: uint256 = amount * FORWARD_FEE // 10**18
+    extcall self.target.transfer(self.hooker.address, amount - fee)
+    fee += extcall self.hooker.duty_act(_hook_inputs, _receiver)
+    extcall self.target.transfer(_receiver, fee)
+    return fee
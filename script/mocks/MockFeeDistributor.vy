@@ -0,0 +1,25 @@
+# pragma version ^0.4.1
+"""
+@title MockFeeDistributor
+@license MIT
+@notice Stand-in for a veCRV FeeDistributor in tests
+@dev Mirrors `burn`: pulls the caller's whole balance of the distributed token
+"""
+
+from ethereum.ercs import IERC20
+
+token: public(IERC20)
+
+
+@deploy
+def __init__(_token: IERC20):
+    self.token = _token
+
+
+@external
+def burn(_coin: address) -> bool:
+    assert _coin == self.token.address
+    amount: uint256 = staticcall self.token.balanceOf(msg.sender)
+    if amount != 0:
+        extcall self.token.transferFrom(msg.sender, self, amount)
+    return True
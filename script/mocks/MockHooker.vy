@@ -0,0 +1,88 @@
+# pragma version ^0.4.1
+"""
+@title MockHooker
+@license MIT
+@notice Stand-in for the FeeCollector's Hooker in tests
+@dev Keeps the mainnet `set_hooks`, `one_time_hooks` and `duty_act` ABI,
+     compensation strategies are accepted but never paid
+"""
+
+MAX_HOOKS_LEN: constant(uint256) = 32
+
+
+struct CompensationCooldown:
+    duty_counter: uint64
+    used: uint64
+    limit: uint64
+
+
+struct CompensationStrategy:
+    amount: uint256
+    cooldown: CompensationCooldown
+    start: uint256
+    end: uint256
+    dutch: bool
+
+
+struct Hook:
+    to: address
+    foreplay: Bytes[1024]
+    compensation_strategy: CompensationStrategy
+    duty: bool
+
+
+struct HookInput:
+    hook_id: uint8
+    value: uint256
+    data: Bytes[8192]
+
+
+owner: public(address)
+hooks: public(DynArray[Hook, MAX_HOOKS_LEN])
+
+
+@deploy
+def __init__(_owner: address):
+    self.owner = _owner
+
+
+@internal
+def _act(_hooks: DynArray[Hook, MAX_HOOKS_LEN], _inputs: DynArray[HookInput, MAX_HOOKS_LEN]):
+    for i: uint256 in range(MAX_HOOKS_LEN):
+        if i >= len(_hooks):
+            break
+        data: Bytes[8192] = b""
+        value: uint256 = 0
+        for hook_input: HookInput in _inputs:
+            if convert(hook_input.hook_id, uint256) == i:
+                data = hook_input.data
+                value = hook_input.value
+        raw_call(_hooks[i].to, concat(_hooks[i].foreplay, data), value=value)
+
+
+@external
+def set_hooks(_new_hooks: DynArray[Hook, MAX_HOOKS_LEN]):
+    assert msg.sender == self.owner, "Only owner"
+    self.hooks = _new_hooks
+
+
+@external
+@payable
+def one_time_hooks(
+    _hooks: DynArray[Hook, MAX_HOOKS_LEN], _inputs: DynArray[HookInput, MAX_HOOKS_LEN]
+):
+    assert msg.sender == self.owner, "Only owner"
+    self._act(_hooks, _inputs)
+
+
+@external
+@payable
+def duty_act(
+    _hook_inputs: DynArray[HookInput, MAX_HOOKS_LEN], _receiver: address = msg.sender
+) -> uint256:
+    hooks: DynArray[Hook, MAX_HOOKS_LEN] = []
+    for hook: Hook in self.hooks:
+        if hook.duty:
+            hooks.append(hook)
+    self._act(hooks, _hook_inputs)
+    return 0
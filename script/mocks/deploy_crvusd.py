@@ -0,0 +1,8 @@
+from moccasin.boa_tools import VyperContract
+
+from script.mocks import MockERC20
+
+
+def moccasin_main() -> VyperContract:
+    # the deployer is the minter, as returned by `crvusd.minter()`
+    return MockERC20.deploy()
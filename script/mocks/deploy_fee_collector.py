@@ -0,0 +1,11 @@
+from moccasin.boa_tools import VyperContract
+from moccasin.config import get_config
+
+from script.mocks import MockFeeCollector
+
+
+def moccasin_main() -> VyperContract:
+    network = get_config().get_active_network()
+    return MockFeeCollector.deploy(
+        network.manifest_named("crvusd"), network.manifest_named("hooker")
+    )
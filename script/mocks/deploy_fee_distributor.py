@@ -0,0 +1,9 @@
+from moccasin.boa_tools import VyperContract
+from moccasin.config import get_config
+
+from script.mocks import MockFeeDistributor
+
+
+def moccasin_main() -> VyperContract:
+    crvusd = get_config().get_active_network().manifest_named("crvusd")
+    return MockFeeDistributor.deploy(crvusd)
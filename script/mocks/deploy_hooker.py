@@ -0,0 +1,8 @@
+from moccasin.boa_tools import VyperContract
+
+from script.mocks import MockHooker
+from script.utils.hooker import FEE_COLLECTOR_ADMIN
+
+
+def moccasin_main() -> VyperContract:
+    return MockHooker.deploy(FEE_COLLECTOR_ADMIN)
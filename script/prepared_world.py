@@ -0,0 +1,164 @@
+"""
+Saves and restores the EVM state left by the test session setup.
+
+The session setup of tests/conftest.py deploys the mocks and the
+FeeAllocator, locks CRV on a fork, travels to the FORWARD epoch and hooks
+the FeeAllocator into the Hooker. `dump_world` serializes the state it
+left to JSON:
+
+- the nonce, balance and code of every account it wrote to, of every
+  contract known to boa and of the given accounts (on a fork, this
+  includes what was fetched from the node for them),
+- every storage slot written since the environment was created,
+- the block timestamp and number, and the state of boa's address
+  generator, so that the session goes on exactly as it would have.
+
+`restore_world` writes it back into a fresh environment. Worlds are keyed
+by `world_key`, a hash of every source the setup depends on, of the
+network and its default account and, on a fork, of the fork block, so an
+edit to a contract or to the setup is never served a stale world.
+
+The mainnet-fork network pins its block in moccasin.toml, so its world is
+built once and reused until the pin moves. A fork of a moving block
+("safe", moccasin's default) is keyed by the block it resolved to and
+rebuilt every session, unless a replayed cassette pins it.
+"""
+
+import hashlib
+import json
+from importlib import import_module
+from importlib.metadata import version
+from pathlib import Path
+from typing import Any
+
+import boa
+from boa.util.abi import Address
+from moccasin.config import get_config
+
+ROOT = Path(__file__).parents[1]
+WORLD_SOURCES = [
+    "moccasin.toml",
+    "src/*.vy",
+    # the installed snekmate modules the contracts import
+    "lib/pypi/snekmate/**/*.vy",
+    "lib/pypi/snekmate/**/*.vyi",
+    "tests/conftest.py",
+    "script/mocks/*.py",
+    "script/mocks/*.vy",
+    "script/prepared_world.py",
+    "script/utils/fee_collector.py",
+    "script/utils/hooker.py",
+]
+
+
+def world_key() -> str:
+    network = get_config().get_active_network()
+    fork_block = network.block_identifier
+    if not isinstance(fork_block, int):
+        account_db = boa.env.evm.vm.state._account_db
+        fork_block = getattr(account_db, "_block_number", None)
+    key = hashlib.sha256()
+    key.update(
+        json.dumps(
+            [
+                network.name,
+                boa.env.evm.patch.chain_id,
+                # the default account the world was built for, which xdist
+                # workers do not share with the controller
+                str(boa.env.eoa),
+                fork_block,
+                version("titanoboa"),
+                version("vyper"),
+            ]
+        ).encode()
+    )
+    for pattern in WORLD_SOURCES:
+        for path in sorted(ROOT.glob(pattern)):
+            key.update(path.relative_to(ROOT).as_posix().encode())
+            key.update(path.read_bytes())
+    return key.hexdigest()
+
+
+def dump_world(key: str, contracts: dict, accounts: list) -> dict[str, Any]:
+    """
+    Serialize the state of `boa.env` along with `contracts`, a mapping of
+    name to contract that `restore_world` gives back.
+    """
+    state = boa.env.evm.vm.state
+    addresses = (
+        {Address(account) for account in accounts}
+        | {Address(address) for address in boa.env._contracts}
+        | set(boa.env.sstore_trace)
+    )
+    return {
+        "key": key,
+        "timestamp": boa.env.evm.patch.timestamp,
+        "block_number": boa.env.evm.patch.block_number,
+        "random": boa.env._random.getstate(),
+        "accounts": {
+            str(address): {
+                "nonce": state.get_nonce(address.canonical_address),
+                "balance": boa.env.get_balance(address),
+                "code": boa.env.get_code(address).hex(),
+                "storage": {
+                    str(slot): boa.env.get_storage(address, slot)
+                    for slot in sorted(boa.env.sstore_trace.get(address, ()))
+                },
+            }
+            for address in sorted(addresses)
+        },
+        "contracts": {
+            name: {
+                "address": str(contract.address),
+                "module": _deployer_module(contract),
+            }
+            for name, contract in contracts.items()
+        },
+    }
+
+
+def _deployer_module(contract) -> str | None:
+    # contracts known by address only (e.g. fetched from the explorer on a
+    # fork) have no source and are looked up again by name
+    filename = getattr(contract, "filename", None)
+    if filename is None:
+        return None
+    module = Path(filename).resolve().relative_to(ROOT).with_suffix("")
+    return ".".join(module.parts)
+
+
+def restore_world(world: dict[str, Any]) -> dict:
+    """
+    Write a world saved by `dump_world` back into `boa.env` and return its
+    contracts.
+    """
+    state = boa.env.evm.vm.state
+    for address, account in world["accounts"].items():
+        address = Address(address)
+        state.set_nonce(address.canonical_address, account["nonce"])
+        boa.env.set_balance(address, account["balance"])
+        boa.env.set_code(address, bytes.fromhex(account["code"]))
+        for slot, value in account["storage"].items():
+            boa.env.set_storage(address, int(slot), value)
+
+    boa.env.evm.patch.timestamp = world["timestamp"]
+    boa.env.evm.patch.block_number = world["block_number"]
+    random_version, internal_state, gauss_next = world["random"]
+    boa.env._random.setstate(
+        (random_version, tuple(internal_state), gauss_next)
+    )
+
+    network = get_config().get_active_network()
+    contracts = {}
+    for name, entry in world["contracts"].items():
+        if entry["module"] is None:
+            contracts[name] = network.manifest_named(name)
+            continue
+        # the deployer moccasin already imported, rather than compiling the
+        # source again
+        contract = import_module(entry["module"]).at(entry["address"])
+        if name in network.named_contracts:
+            # so that moccasin finds it rather than deploying it again
+            network.named_contracts[name].recently_deployed_contract = contract
+        contracts[name] = contract
+    return contracts
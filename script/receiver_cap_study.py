@@ -0,0 +1,200 @@
+"""
+Scaling study of the receiver cap, MAX_RECEIVERS, of FeeAllocator.vy.
+
+Compiles a variant of the contract for every cap (10, 25, 50, 100 and 255
+by default), deploys it against the mocks in script/mocks in a local boa
+environment and, with every receiver slot taken, measures:
+
+- the bytecode sizes, whether the runtime fits EIP-170, and deploy gas,
+- `set_multiple_receivers` filling every slot in one call,
+- `remove_receiver` of the first receiver, which the last one replaces,
+- `distribute_fees` on a second weekly run, once receivers hold a balance,
+- the worst `distribute_fees`: a first run to receivers without a
+  balance, each on a payout policy that pays out, with payout logs on.
+
+The worst case is compared with the gas budget of the `forward`
+transaction that calls `distribute_fees` through the Hooker, by default a
+30M gas block (`--budget` sets a tighter keeper limit), and extrapolated
+to the largest number of receivers the budget fits. It prints a CSV with
+one row per cap, and a summary on stderr:
+
+    python -m script.receiver_cap_study > receiver_caps.csv
+    python -m script.receiver_cap_study --budget 5000000 10 20 40
+    mox run receiver_cap_study --network pyevm > receiver_caps.csv
+
+Run with `python -m`, it imports snekmate from lib/, where `mox install`
+puts it.
+"""
+
+import argparse
+import re
+import sys
+from dataclasses import dataclass
+
+import boa
+
+from script.benchmark_compiler import (
+    FEE_ALLOCATOR,
+    MAX_CODE_SIZE,
+    MOCKS,
+    gas_used,
+)
+from script.utils.dependencies import add_import_paths
+from script.utils.gas import reset_access_lists
+from script.utils.report import write_csv
+
+CAPS = [10, 25, 50, 100, 255]
+# the `kept` bitmap of replace_receivers has a bit per receiver
+MAX_CAP = 256
+CAP_DEFINITION = re.compile(
+    r"^MAX_RECEIVERS: public\(constant\(uint256\)\) = \d+$", re.MULTILINE
+)
+FORWARD_GAS_BUDGET = 30_000_000  # a block
+AMOUNT_TO_DISTRIBUTE = int(100_000 * 1e18)
+
+
+@dataclass
+class Row:
+    max_receivers: int
+    initcode_size: int
+    runtime_size: int
+    deployable: bool
+    deploy_gas: int
+    set_multiple_receivers: int
+    remove_receiver: int
+    distribute_fees: int
+    distribute_fees_worst: int
+    gas_per_receiver: int  # of the worst case, over no receivers
+    budget_share: float  # of the worst case
+    max_receivers_in_budget: int
+
+
+def compile_variant(cap: int):
+    assert 0 < cap <= MAX_CAP, f"cap: {cap} out of range"
+    source = FEE_ALLOCATOR.read_text()
+    source, n = CAP_DEFINITION.subn(
+        f"MAX_RECEIVERS: public(constant(uint256)) = {cap}", source
+    )
+    assert n == 1, "cap: MAX_RECEIVERS definition not found"
+    # compiled as src/FeeAllocator.vy, for its imports to resolve
+    return boa.loads_partial(
+        source, name=f"FeeAllocator{cap}", filename=str(FEE_ALLOCATOR)
+    )
+
+
+def study_cap(cap: int, budget: int = FORWARD_GAS_BUDGET) -> Row:
+    deployer = compile_variant(cap)
+    initcode_size = len(deployer.compiler_data.bytecode)
+    runtime_size = len(deployer.compiler_data.bytecode_runtime)
+
+    admin = boa.env.generate_address()
+    hooker = boa.env.generate_address()
+    receivers = [boa.env.generate_address() for _ in range(cap)]
+
+    with boa.env.anchor():
+        token = boa.load(str(MOCKS / "MockERC20.vy"))
+        fee_distributor = boa.load(str(MOCKS / "MockFeeDistributor.vy"), token)
+        fee_collector = boa.load(
+            str(MOCKS / "MockFeeCollector.vy"), token, hooker
+        )
+
+        reset_access_lists()
+        fee_allocator = deployer.deploy(fee_distributor, fee_collector, admin)
+        deploy_gas = gas_used(fee_allocator)
+        weight = fee_allocator.MAX_TOTAL_WEIGHT() // cap
+        configs = [(receiver, weight) for receiver in receivers]
+        with boa.env.prank(hooker):
+            token.approve(fee_allocator, 2**256 - 1)
+
+        def distribute() -> int:
+            token.mint(hooker, AMOUNT_TO_DISTRIBUTE)
+            reset_access_lists()
+            with boa.env.prank(hooker):
+                fee_allocator.distribute_fees()
+            return gas_used(fee_allocator)
+
+        with boa.env.anchor():
+            no_receivers_gas = distribute()
+
+        with boa.env.prank(admin):
+            reset_access_lists()
+            fee_allocator.set_multiple_receivers(configs)
+            set_gas = gas_used(fee_allocator)
+
+            with boa.env.anchor():
+                reset_access_lists()
+                fee_allocator.remove_receiver(receivers[0])
+                remove_gas = gas_used(fee_allocator)
+
+        with boa.env.anchor():
+            with boa.env.prank(admin):
+                fee_allocator.set_log_payouts(True)
+                for receiver in receivers:
+                    fee_allocator.set_payout_policy(receiver, 1, 0)
+            worst_gas = distribute()
+
+        # a first run so that receivers hold a balance
+        distribute()
+        distribute_gas = distribute()
+
+    gas_per_receiver = (worst_gas - no_receivers_gas) // cap
+    return Row(
+        cap,
+        initcode_size,
+        runtime_size,
+        runtime_size <= MAX_CODE_SIZE,
+        deploy_gas,
+        set_gas,
+        remove_gas,
+        distribute_gas,
+        worst_gas,
+        gas_per_receiver,
+        round(worst_gas / budget, 4),
+        (budget - no_receivers_gas) // gas_per_receiver,
+    )
+
+
+def study(caps: list[int] = CAPS, budget: int = FORWARD_GAS_BUDGET):
+    return [study_cap(cap, budget) for cap in caps]
+
+
+def summary(rows: list[Row], budget: int = FORWARD_GAS_BUDGET) -> str:
+    safe = [row for row in rows if row.deployable and row.budget_share <= 1]
+    lines = [
+        f"{row.max_receivers:>3} receivers: worst distribute_fees "
+        f"{row.distribute_fees_worst} gas, {row.budget_share:.1%} of "
+        f"{budget}, runtime {row.runtime_size} bytes"
+        + ("" if row.deployable else " (over EIP-170)")
+        for row in rows
+    ]
+    if safe:
+        lines.append(
+            f"largest cap deployable and within budget: "
+            f"{max(row.max_receivers for row in safe)}"
+        )
+    fits = min(row.max_receivers_in_budget for row in rows)
+    lines.append(f"the budget fits about {fits} receivers in the worst case")
+    if fits > MAX_CAP:
+        lines.append(
+            f"caps above {MAX_CAP} need a wider `kept` bitmap in "
+            "replace_receivers"
+        )
+    return "\n".join(lines)
+
+
+def moccasin_main():
+    rows = study()
+    write_csv(rows)
+    print(summary(rows), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    add_import_paths()
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("caps", type=int, nargs="*", default=CAPS)
+    parser.add_argument("--budget", type=int, default=FORWARD_GAS_BUDGET)
+    args = parser.parse_args()
+
+    rows = study(args.caps, args.budget)
+    write_csv(rows)
+    print(summary(rows, args.budget), file=sys.stderr)
@@ -0,0 +1,192 @@
+"""
+Records and replays the network traffic of the mainnet-fork tests.
+
+In record mode, every JSON-RPC response the fork gets is saved to a
+gzipped JSON cassette, keyed by method and params. The ABIs fetched from
+the explorer and the IPFS pin of the deployment test are saved too. In
+replay mode the suite is served from the cassette alone, so it runs
+offline, and a request the cassette does not hold fails with
+CassetteMiss:
+
+    python -m script.rpc_cassette record [test args]
+    python -m script.rpc_cassette replay [test args]
+
+The cassette pins the fork block. The first request resolves the network's
+block identifier (pinned in moccasin.toml, "safe" otherwise) to a block
+number, and every state request that follows is keyed by that number.
+Move the pin and record again to move to a newer block.
+"""
+
+import gzip
+import json
+import sys
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+
+import boa
+from boa.environment import Env
+from boa.rpc import RPC, EthereumRPC
+
+ROOT = Path(__file__).parents[1]
+CASSETTE = ROOT / "tests" / "cassettes" / "mainnet-fork.json.gz"
+CASSETTE_VERSION = 1
+
+
+class CassetteMiss(Exception):
+    pass
+
+
+def request_key(method: str, params: Any) -> str:
+    return method + json.dumps(params, sort_keys=True, separators=(",", ":"))
+
+
+@dataclass
+class Cassette:
+    path: Path
+    record: bool
+    responses: dict[str, Any] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, path: Path = CASSETTE) -> "Cassette":
+        with gzip.open(path, "rt") as f:
+            data = json.load(f)
+        assert data["version"] == CASSETTE_VERSION, "cassette: bad version"
+        return cls(path, False, data["responses"])
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {"version": CASSETTE_VERSION, "responses": self.responses}
+        # mtime=0 so that the same responses give the same file
+        self.path.write_bytes(
+            gzip.compress(json.dumps(data, sort_keys=True).encode(), mtime=0)
+        )
+
+    def fetch(self, key: str, fetch_upstream: Callable[[], Any]) -> Any:
+        if key in self.responses:
+            return self.responses[key]
+        if not self.record:
+            raise CassetteMiss(key)
+        result = fetch_upstream()
+        self.responses[key] = result
+        return result
+
+
+class CassetteRPC(RPC):
+    """
+    Serves requests from a cassette, and in record mode fetches the ones it
+    does not hold from `upstream`.
+    """
+
+    def __init__(self, cassette: Cassette, upstream: RPC | None = None):
+        assert upstream is not None or not cassette.record
+        self._cassette = cassette
+        self._upstream = upstream
+
+    @property
+    def identifier(self) -> str:
+        return f"cassette:{self._cassette.path}"
+
+    @property
+    def name(self) -> str:
+        return self.identifier
+
+    def fetch(self, method: str, params: Any) -> Any:
+        return self._cassette.fetch(
+            request_key(method, params),
+            lambda: self._upstream.fetch(method, params),
+        )
+
+    def fetch_uncached(self, method: str, params: Any) -> Any:
+        return self._cassette.fetch(
+            request_key(method, params),
+            lambda: self._upstream.fetch_uncached(method, params),
+        )
+
+    def fetch_multi(self, payloads: list[tuple[str, Any]]) -> list[Any]:
+        keys = [request_key(method, params) for method, params in payloads]
+        missing = [
+            i
+            for i, key in enumerate(keys)
+            if key not in self._cassette.responses
+        ]
+        if missing and self._cassette.record:
+            results = self._upstream.fetch_multi(
+                [payloads[i] for i in missing]
+            )
+            for i, result in zip(missing, results):
+                self._cassette.responses[keys[i]] = result
+        return [self._cassette.fetch(key, lambda: None) for key in keys]
+
+
+@contextmanager
+def use_cassette(cassette: Cassette):
+    """
+    Route the forks made with `boa.fork`, the explorer ABI fetches of
+    moccasin and the IPFS pins of script/deploy.py through `cassette`.
+    """
+    import moccasin.commands.explorer as explorer
+
+    import script.utils.ipfs as ipfs
+
+    fork = boa.fork
+    get_abi = explorer.boa_get_abi_from_explorer
+    pin_to_ipfs = ipfs.pin_to_ipfs
+
+    def cassette_fork(url, block_identifier="safe", **kwargs):
+        upstream = EthereumRPC(url) if cassette.record else None
+        env = Env()
+        # without boa's disk cache, so that every request reaches the cassette
+        env.fork_rpc(
+            CassetteRPC(cassette, upstream),
+            block_identifier=block_identifier,
+            cache_dir=None,
+        )
+        return boa.set_env(env)
+
+    def cassette_get_abi(address, *args, **kwargs):
+        return cassette.fetch(
+            request_key("explorer_getabi", [address.lower()]),
+            lambda: get_abi(address, *args, **kwargs),
+        )
+
+    def cassette_pin_to_ipfs(description):
+        return cassette.fetch(
+            request_key("ipfs_pin", [description]),
+            lambda: pin_to_ipfs(description),
+        )
+
+    boa.fork = cassette_fork
+    explorer.boa_get_abi_from_explorer = cassette_get_abi
+    ipfs.pin_to_ipfs = cassette_pin_to_ipfs
+    try:
+        yield cassette
+    finally:
+        boa.fork = fork
+        explorer.boa_get_abi_from_explorer = get_abi
+        ipfs.pin_to_ipfs = pin_to_ipfs
+        if cassette.record:
+            cassette.save()
+
+
+def main(argv: list[str]) -> int:
+    from moccasin.__main__ import main as mox
+
+    mode, *test_args = argv
+    assert mode in ("record", "replay"), "usage: record|replay [test args]"
+    if mode == "record":
+        cassette = Cassette(CASSETTE, record=True)
+        # rebuild the prepared world, so that its setup is recorded too
+        test_args.append("--cache-clear")
+    else:
+        cassette = Cassette.load()
+        # installing the dependencies would need the network
+        test_args.append("--no-install")
+
+    with use_cassette(cassette):
+        return mox(["test", "--network", "mainnet-fork", *test_args])
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,41 @@
+"""
+Off-chain simulator of the weekly fee split, with the contracts' rounding.
+
+Runs receiver configurations against series of weekly fees, recorded or
+synthetic, and computes for every scenario and week the FeeCollector's
+caller fee, each receiver's payout, the veCRV share and the dust the
+floored shares leave to it, exactly as `FeeCollector.forward` and
+`FeeAllocator.distribute_fees` would. Thousands of scenarios are computed
+at once on NumPy arrays:
+
+    from script.simulator import simulate, synthetic_fees
+
+    fees = synthetic_fees(scenarios=1000, weeks=52)
+    split = simulate([[1000, 500], [1500, 0]], fees[:, None, :])
+    split.total_payouts  # (1000, 2, 2): series, configuration, receiver
+
+`python -m script.simulator` does the same from CSV files.
+"""
+
+from script.simulator.distribution import (
+    FEE_PRECISION,
+    MAX_BPS,
+    MAX_RECEIVERS,
+    MAX_TOTAL_WEIGHT,
+    Distribution,
+    as_uint256,
+    simulate,
+)
+from script.simulator.fees import load_fees, synthetic_fees
+
+__all__ = [
+    "FEE_PRECISION",
+    "MAX_BPS",
+    "MAX_RECEIVERS",
+    "MAX_TOTAL_WEIGHT",
+    "Distribution",
+    "as_uint256",
+    "load_fees",
+    "simulate",
+    "synthetic_fees",
+]
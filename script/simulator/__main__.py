@@ -0,0 +1,49 @@
+"""
+Simulate receiver configurations against weekly fees.
+
+Configurations come from a CSV with `scenario`, `receiver` and `weight`
+columns, one row per receiver of each scenario. Each is run against every
+fee series: a recorded one with `--fees` (a `fees` column in crvUSD, one
+row per week), or `--series` seeded synthetic ones. It prints a CSV with,
+for every scenario, the total each receiver, the fee distributor (veCRV),
+the caller and the dust got over the weeks, in wei, as the minimum, mean
+and maximum over the fee series:
+
+    python -m script.simulator proposal.csv --fees weekly_fees.csv
+    python -m script.simulator proposal.csv --series 1000 --weeks 52
+"""
+
+import argparse
+from pathlib import Path
+
+from script.simulator.distribution import simulate
+from script.simulator.fees import load_fees, synthetic_fees
+from script.simulator.report import load_scenarios, summarize, weight_matrix
+from script.utils.report import write_csv
+
+CALLER_FEE = 10**16  # 1%, the flat fee of MockFeeCollector
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("scenarios", type=Path, help="CSV of receivers")
+    parser.add_argument("--fees", type=Path, help="CSV of recorded fees")
+    parser.add_argument("--series", type=int, default=1000)
+    parser.add_argument("--weeks", type=int, default=52)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--caller-fee",
+        type=int,
+        default=CALLER_FEE,
+        help="the FeeCollector's caller fee, at 10**18 precision",
+    )
+    args = parser.parse_args()
+
+    scenarios = load_scenarios(args.scenarios)
+    if args.fees:
+        fees = load_fees(args.fees)[None, :]
+    else:
+        fees = synthetic_fees(args.series, args.weeks, args.seed)
+    split = simulate(
+        weight_matrix(scenarios), fees[:, None, :], args.caller_fee
+    )
+    write_csv(summarize(scenarios, split))
@@ -0,0 +1,124 @@
+"""
+The weekly split of fees, for many scenarios at once.
+
+Amounts are NumPy arrays of Python integers (`dtype=object`), so that every
+product and floor division is exact over the whole uint256 range, as in the
+contracts. Anything the contracts would revert on, a value or a product
+past 2^256 - 1, raises an OverflowError instead of wrapping around.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from script.utils.receivers import MAX_BPS, MAX_RECEIVERS, MAX_TOTAL_WEIGHT
+
+FEE_PRECISION = 10**18  # of the FeeCollector's caller fee
+MAX_UINT256 = 2**256 - 1
+
+
+def as_uint256(values, name: str) -> np.ndarray:
+    """
+    `values` as an array of Python integers, checked to be uint256.
+    """
+    array = np.asarray(values)
+    if array.dtype.kind == "f":
+        raise TypeError(f"{name}: integers expected, got floats")
+    array = array.astype(object)
+    if not all(isinstance(value, int) for value in array.flat):
+        raise TypeError(f"{name}: integers expected")
+    if np.any(array < 0) or np.any(array > MAX_UINT256):
+        raise OverflowError(f"{name}: out of uint256 range")
+    return array
+
+
+def _checked(array: np.ndarray, name: str) -> np.ndarray:
+    if np.any(array > MAX_UINT256):
+        raise OverflowError(f"{name}: overflows uint256")
+    return array
+
+
+@dataclass
+class Distribution:
+    """
+    The split of every scenario and week. `caller_fee`, `distributed`,
+    `vecrv` and `dust` have the shape of the fees, (..., weeks), and
+    `payouts` one more axis, (..., weeks, receivers).
+    """
+
+    caller_fee: np.ndarray  # the FeeCollector's cut to the keeper
+    distributed: np.ndarray  # what the FeeAllocator split
+    payouts: np.ndarray
+    vecrv: np.ndarray  # to the fee distributor
+    # the part of the veCRV share owed to the receivers' floored shares: the
+    # receivers' share of the exact split, floored, less their payouts
+    dust: np.ndarray
+
+    @property
+    def total_payouts(self) -> np.ndarray:
+        return self.payouts.sum(axis=-2)
+
+    @property
+    def total_vecrv(self) -> np.ndarray:
+        return self.vecrv.sum(axis=-1)
+
+    @property
+    def total_dust(self) -> np.ndarray:
+        return self.dust.sum(axis=-1)
+
+
+def validate_weights(weights: np.ndarray):
+    # the limits set_receiver and set_multiple_receivers enforce, a weight
+    # of 0 standing for an empty slot
+    if weights.ndim == 0:
+        raise ValueError("receivers: weights need a receiver axis")
+    if np.any(weights > MAX_BPS):
+        raise ValueError("receivers: invalid weight")
+    if np.any((weights > 0).sum(axis=-1) > MAX_RECEIVERS):
+        raise ValueError("receivers: max limit reached")
+    if np.any(weights.sum(axis=-1) > MAX_TOTAL_WEIGHT):
+        raise ValueError("receivers: exceeds max total weight")
+
+
+def simulate(weights, fees, caller_fee=0) -> Distribution:
+    """
+    Split weekly fees the way `FeeCollector.forward` and
+    `FeeAllocator.distribute_fees` do: the caller takes
+    `amount * caller_fee // 10**18` of what the FeeCollector forwards, every
+    receiver gets `balance * weight // MAX_BPS` of the rest and the fee
+    distributor what is left. Merkle epochs and payout policies are not
+    modelled: receivers are paid their whole share every week.
+
+    `weights` has a receiver axis last, (..., receivers), `fees` the weekly
+    amounts the FeeCollector holds, (..., weeks), in wei. Leading axes are
+    scenarios and broadcast against each other, so a single receiver
+    configuration can be run against many fee series and the other way
+    round. `caller_fee`, at 10**18 precision, broadcasts against `fees`.
+    """
+    weights = as_uint256(weights, "weights")
+    validate_weights(weights)
+    fees = as_uint256(fees, "fees")
+    if fees.ndim == 0:
+        raise ValueError("fees: need a week axis")
+    caller_fee = as_uint256(caller_fee, "caller_fee")
+    if np.any(caller_fee > FEE_PRECISION):
+        raise ValueError("caller_fee: above 100%")
+
+    caller = _checked(fees * caller_fee, "fees * caller_fee") // FEE_PRECISION
+    distributed = fees - caller
+    products = _checked(
+        distributed[..., :, None] * weights[..., None, :],
+        "balance * weight",
+    )
+    payouts = products // MAX_BPS
+    paid = payouts.sum(axis=-1)
+    # a 0-d array rather than an int when there is a single configuration
+    total_weight = np.asarray(weights.sum(axis=-1), dtype=object)
+    exact = distributed * total_weight[..., None] // MAX_BPS
+    caller, distributed = (
+        np.broadcast_to(array, paid.shape).copy()
+        for array in (caller, distributed)
+    )
+    return Distribution(
+        caller, distributed, payouts, distributed - paid, exact - paid
+    )
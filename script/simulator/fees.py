@@ -0,0 +1,43 @@
+"""
+Series of weekly fees to run the simulator on.
+"""
+
+import csv
+from fractions import Fraction
+from pathlib import Path
+
+import numpy as np
+
+MEAN_FEES = 500_000  # crvUSD per week, as in script/soak_benchmark.py
+VOLATILITY = 0.15
+
+
+def load_fees(path: Path) -> np.ndarray:
+    """
+    A recorded series, from a CSV with a `fees` column in crvUSD and one row
+    per week, the format script/soak_benchmark.py reads.
+    """
+    with open(path) as f:
+        return np.array(
+            [int(Fraction(row["fees"]) * 10**18) for row in csv.DictReader(f)],
+            dtype=object,
+        )
+
+
+def synthetic_fees(
+    scenarios: int,
+    weeks: int,
+    seed: int = 0,
+    mean: int = MEAN_FEES,
+    volatility: float = VOLATILITY,
+) -> np.ndarray:
+    """
+    `scenarios` random walks of weekly fees starting at `mean` crvUSD, in
+    wei with 18 decimals of noise, as a (scenarios, weeks) array.
+    """
+    rng = np.random.default_rng(seed)
+    steps = rng.lognormal(0, volatility, (scenarios, weeks))
+    levels = np.clip(mean * np.cumprod(steps, axis=-1), 1e3, 1e8)
+    # whole crvUSD, exact in float64, then wei
+    fees = np.floor(levels).astype(np.int64).astype(object) * 10**18
+    return fees + rng.integers(0, 10**18, (scenarios, weeks)).astype(object)
@@ -0,0 +1,73 @@
+"""
+Receiver configurations from CSV, and the report of their simulation.
+"""
+
+import csv
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from script.simulator.distribution import Distribution
+from script.utils.receivers import MAX_BPS
+
+
+@dataclass
+class Row:
+    scenario: str
+    recipient: str
+    weight: int | str  # empty for the caller and the dust
+    min: int
+    mean: int
+    max: int
+
+
+def load_scenarios(path: Path) -> dict[str, dict[str, int]]:
+    scenarios: dict[str, dict[str, int]] = {}
+    with open(path) as f:
+        for row in csv.DictReader(f):
+            receivers = scenarios.setdefault(row["scenario"], {})
+            receivers[row["receiver"]] = int(row["weight"])
+    return scenarios
+
+
+def weight_matrix(scenarios: dict[str, dict[str, int]]) -> np.ndarray:
+    # one row per scenario, padded with empty slots
+    width = max(len(receivers) for receivers in scenarios.values())
+    return np.array(
+        [
+            list(receivers.values()) + [0] * (width - len(receivers))
+            for receivers in scenarios.values()
+        ],
+        dtype=object,
+    )
+
+
+def summarize(
+    scenarios: dict[str, dict[str, int]], split: Distribution
+) -> list[Row]:
+    """
+    The rows of the report, from a split of shape (series, scenario, ...).
+    """
+
+    def stats(totals: np.ndarray) -> tuple[int, int, int]:
+        return min(totals), sum(totals) // len(totals), max(totals)
+
+    payouts = split.total_payouts
+    vecrv = split.total_vecrv
+    caller = split.caller_fee.sum(axis=-1)
+    dust = split.total_dust
+    rows = []
+    for i, (scenario, receivers) in enumerate(scenarios.items()):
+        for j, (receiver, weight) in enumerate(receivers.items()):
+            rows.append(
+                Row(scenario, receiver, weight, *stats(payouts[:, i, j]))
+            )
+        distributor_weight = MAX_BPS - sum(receivers.values())
+        for recipient, weight, totals in [
+            ("veCRV", distributor_weight, vecrv),
+            ("caller", "", caller),
+            ("dust", "", dust),
+        ]:
+            rows.append(Row(scenario, recipient, weight, *stats(totals[:, i])))
+    return rows
@@ -0,0 +1,252 @@
+"""
+Soak benchmark: years of weekly FeeCollector.forward runs.
+
+Every epoch travels to the next FORWARD window, mints that week's fees to
+the FeeCollector, sometimes adds, reweights or removes a receiver, and has
+a keeper call `FeeCollector.forward`, which goes through the Hooker to
+`FeeAllocator.distribute_fees`. It runs on the stand-ins of script/mocks in
+a local boa environment and prints one CSV row per epoch with the gas of
+the `forward` transaction and of the `distribute_fees` call within it, the
+rounding of the receivers' shares, the fees left in the FeeAllocator and
+the wall-clock time, then a trend report on stderr:
+
+    python -m script.soak_benchmark > soak.csv
+    python -m script.soak_benchmark --epochs 520 --seed 7
+    python -m script.soak_benchmark --fees weekly_fees.csv
+    mox run soak_benchmark --network pyevm > soak.csv
+
+Fees follow a seeded synthetic series unless `--fees` gives a recorded
+one, a CSV with a `fees` column in crvUSD, one row per epoch. Run with
+`python -m`, it imports snekmate from lib/, where `mox install` puts it.
+"""
+
+import argparse
+import random
+import sys
+import time
+from dataclasses import dataclass
+from fractions import Fraction
+from pathlib import Path
+
+import boa
+
+from script.simulator.fees import load_fees
+from script.utils.dependencies import add_import_paths
+from script.utils.fee_collector import WEEK
+from script.utils.gas import reset_access_lists
+from script.utils.hooker import (
+    FEE_COLLECTOR_ADMIN,
+    add_fee_allocator_to_hooker,
+)
+from script.utils.receivers import MAX_BPS, MAX_RECEIVERS
+from script.utils.report import write_csv
+
+ROOT = Path(__file__).parents[1]
+FEE_ALLOCATOR = ROOT / "src" / "FeeAllocator.vy"
+MOCKS = ROOT / "script" / "mocks"
+
+FORWARD_START = 6 * 86400  # as in MockFeeCollector
+
+EPOCHS = 260  # five years
+MEAN_FEES = 500_000  # crvUSD per week
+CHURN = 0.2  # chance of a receiver change per epoch
+
+
+@dataclass
+class Row:
+    epoch: int
+    n_receivers: int
+    fees: int
+    forward_gas: int
+    distribute_gas: int
+    rounding: float  # wei the fee distributor got from floored shares
+    cumulative_rounding: float
+    allocator_dust: int  # unreserved crvUSD left in the FeeAllocator
+    seconds: float
+
+
+def synthetic_fees(epochs: int, rng: random.Random) -> list[int]:
+    # a random walk of weekly fees, in wei with 18 decimals of noise
+    fees, level = [], float(MEAN_FEES)
+    for _ in range(epochs):
+        level = min(max(level * rng.lognormvariate(0, 0.15), 1e3), 1e8)
+        fees.append(int(level * 10**18) + rng.randrange(10**18))
+    return fees
+
+
+def call_gas(computation, address) -> int | None:
+    # gas of the first call into `address` made within `computation`
+    if computation.msg.storage_address == address.canonical_address:
+        return computation.get_gas_used()
+    for child in computation.children:
+        gas = call_gas(child, address)
+        if gas is not None:
+            return gas
+    return None
+
+
+def next_forward_window():
+    now = boa.env.evm.patch.timestamp
+    boa.env.time_travel(seconds=(now // WEEK + 1) * WEEK + FORWARD_START - now)
+
+
+def deploy(admin):
+    token = boa.load(str(MOCKS / "MockERC20.vy"))
+    fee_distributor = boa.load(str(MOCKS / "MockFeeDistributor.vy"), token)
+    hooker = boa.load(str(MOCKS / "MockHooker.vy"), FEE_COLLECTOR_ADMIN)
+    fee_collector = boa.load(str(MOCKS / "MockFeeCollector.vy"), token, hooker)
+    fee_allocator = boa.load(
+        str(FEE_ALLOCATOR), fee_distributor, fee_collector, admin
+    )
+    add_fee_allocator_to_hooker(hooker, token, fee_allocator)
+    return token, fee_distributor, fee_collector, fee_allocator
+
+
+def churn(fee_allocator, receivers: dict[str, int], rng: random.Random):
+    """
+    Add a receiver, reweight one or remove one, within the contract's
+    limits. `receivers` maps the configured receivers to their weights.
+    """
+    action = rng.choice(["add", "reweight", "remove"])
+    if action == "remove" and receivers:
+        receiver = rng.choice(list(receivers))
+        fee_allocator.remove_receiver(receiver)
+        del receivers[receiver]
+        return
+
+    if action == "add" and len(receivers) < MAX_RECEIVERS or not receivers:
+        receiver = boa.env.generate_address()
+    else:
+        receiver = rng.choice(list(receivers))
+    available = fee_allocator.MAX_TOTAL_WEIGHT() - sum(receivers.values())
+    available += receivers.get(receiver, 0)
+    if available == 0:
+        return
+    weight = rng.randint(1, min(available, 1_000))
+    fee_allocator.set_receiver(receiver, weight)
+    receivers[receiver] = weight
+
+
+def soak(
+    epochs: int = EPOCHS,
+    seed: int = 0,
+    fees: list[int] | None = None,
+    churn_rate: float = CHURN,
+) -> list[Row]:
+    rng = random.Random(seed)
+    if fees is None:
+        fees = synthetic_fees(epochs, rng)
+    admin = boa.env.generate_address()
+    keeper = boa.env.generate_address()
+
+    rows = []
+    with boa.env.anchor():
+        token, fee_distributor, fee_collector, fee_allocator = deploy(admin)
+        receivers: dict[str, int] = {}
+        cumulative_rounding = Fraction(0)
+        for epoch, amount in enumerate(fees):
+            start = time.perf_counter()
+            next_forward_window()
+            token.mint(fee_collector, amount)
+            if rng.random() < churn_rate:
+                with boa.env.prank(admin):
+                    churn(fee_allocator, receivers, rng)
+
+            distributor_balance = token.balanceOf(fee_distributor)
+            reset_access_lists()
+            with boa.env.prank(keeper):
+                fee_collector.forward([], keeper)
+            forward = fee_collector._computation
+
+            # the amount the FeeAllocator split, after the keeper's cut
+            (log,) = [
+                log
+                for log in fee_collector.get_logs()
+                if type(log).__name__ == "FeesDistributed"
+            ]
+            total_amount = log.total_amount
+            distributor_share = (
+                token.balanceOf(fee_distributor) - distributor_balance
+            )
+            exact_share = Fraction(
+                total_amount * (MAX_BPS - sum(receivers.values())), MAX_BPS
+            )
+            rounding = distributor_share - exact_share
+            cumulative_rounding += rounding
+
+            rows.append(
+                Row(
+                    epoch,
+                    len(receivers),
+                    amount,
+                    forward.get_gas_used(),
+                    call_gas(forward, fee_allocator.address),
+                    float(rounding),
+                    float(cumulative_rounding),
+                    token.balanceOf(fee_allocator)
+                    - fee_allocator.reserved_balance(),
+                    time.perf_counter() - start,
+                )
+            )
+    return rows
+
+
+def trend_report(rows: list[Row]) -> str:
+    """
+    The distribute_fees gas by number of receivers, and its drift: how far
+    the first and the last fifth of the epochs are from the mean gas of
+    their number of receivers, so that a cost growing with the age of the
+    deployment shows whatever the churn. Then the rounding, the dust and
+    the time spent.
+    """
+    by_receivers: dict[int, list[int]] = {}
+    for row in rows:
+        by_receivers.setdefault(row.n_receivers, []).append(row.distribute_gas)
+    mean_gas = {n: sum(gas) / len(gas) for n, gas in by_receivers.items()}
+
+    lines = ["n_receivers  epochs  distribute_fees gas (min / mean / max)"]
+    for n, gas in sorted(by_receivers.items()):
+        lines.append(
+            f"{n:>11}  {len(gas):>6}  "
+            f"{min(gas)} / {mean_gas[n]:.0f} / {max(gas)}"
+        )
+
+    def drift(rows: list[Row]) -> float:
+        excess = [
+            row.distribute_gas - mean_gas[row.n_receivers] for row in rows
+        ]
+        return sum(excess) / len(excess)
+
+    fifth = max(len(rows) // 5, 1)
+    seconds = sum(row.seconds for row in rows)
+    lines += [
+        f"drift: {drift(rows[:fifth]):+.0f} gas over the first fifth, "
+        f"{drift(rows[-fifth:]):+.0f} over the last",
+        f"rounding: {rows[-1].cumulative_rounding:.0f} wei to the fee "
+        f"distributor over {len(rows)} epochs",
+        f"dust: {max(row.allocator_dust for row in rows)} wei at most left "
+        "in the FeeAllocator",
+        f"time: {seconds:.1f}s, {1000 * seconds / len(rows):.1f}ms per epoch",
+    ]
+    return "\n".join(lines)
+
+
+def moccasin_main():
+    rows = soak()
+    write_csv(rows)
+    print(trend_report(rows), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    add_import_paths()
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--epochs", type=int, default=EPOCHS)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--churn", type=float, default=CHURN)
+    parser.add_argument("--fees", type=Path, help="CSV of recorded fees")
+    args = parser.parse_args()
+
+    fees = list(load_fees(args.fees)) if args.fees else None
+    rows = soak(args.epochs, args.seed, fees, args.churn)
+    write_csv(rows)
+    print(trend_report(rows), file=sys.stderr)
@@ -0,0 +1,13 @@
+import sys
+
+from moccasin._sys_path_and_config_setup import get_sys_paths_list
+from moccasin.config import Config, get_or_initialize_config
+
+
+def add_import_paths(config: Config | None = None):
+    """Puts the contracts folder and the dependencies `mox install` puts
+    in lib/ (snekmate) on the import path, as `mox run` and `mox test` do,
+    for the scripts run with `python -m`.
+    """
+    config = config or get_or_initialize_config()
+    sys.path[:0] = [str(path) for path in get_sys_paths_list(config)]
@@ -0,0 +1,15 @@
+import boa
+
+WEEK = 7 * 24 * 3600
+
+
+def set_epoch_to_forward(fee_collector):
+    """Time travels to the start of the FeeCollector's next FORWARD
+    period, a year on at least so that all later time travels lead to
+    positive values.
+    """
+    boa.env.time_travel(seconds=52 * WEEK)
+    timeframe = fee_collector.epoch_time_frame(8)  # FORWARD period = 8
+    seconds = timeframe[0] - boa.env.evm.vm.state.timestamp
+    extra_week = WEEK * (seconds // WEEK)
+    boa.env.time_travel(seconds=seconds + extra_week)
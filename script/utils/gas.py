@@ -0,0 +1,10 @@
+import boa
+
+
+def reset_access_lists():
+    """Clears the accounts and slots boa keeps warm across calls, so that
+    the next call is measured with cold ones, like a fresh transaction.
+
+    Unlike `boa.env.reset_gas_used`, this is rolled back by anchors.
+    """
+    boa.env.evm.vm.state._account_db._journal_accessed_state.clear()
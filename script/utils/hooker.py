@@ -0,0 +1,36 @@
+import boa
+
+# the DAO agent, owner of the Hooker on mainnet and of its stand-in
+FEE_COLLECTOR_ADMIN = "0x40907540d8a6C65c637785e8f8B742ae6b0b9968"
+EMPTY_COMPENSATION = (0, (0, 0, 0), 0, 0, False)
+
+
+def add_fee_allocator_to_hooker(hooker, crvusd, fee_allocator):
+    """Hooks `fee_allocator.distribute_fees` into the Hooker's forward and
+    has the Hooker approve it for its crvUSD, as the DAO vote of
+    script/deploy.py does.
+    """
+    with boa.env.prank(FEE_COLLECTOR_ADMIN):
+        hooker.set_hooks(
+            [
+                (
+                    fee_allocator.address,
+                    fee_allocator.distribute_fees.prepare_calldata(),
+                    EMPTY_COMPENSATION,
+                    True,
+                )
+            ]
+        )
+        hooker.one_time_hooks(
+            [
+                (
+                    crvusd.address,
+                    crvusd.approve.prepare_calldata(
+                        fee_allocator.address, 2**256 - 1
+                    ),
+                    EMPTY_COMPENSATION,
+                    False,
+                )
+            ],
+            [(0, 0, b"")],
+        )
@@ -0,0 +1,277 @@
+"""
+A local boa chain served over boa's RPC interface, as a stand-in for a node.
+
+boa's local EVM keeps no blocks or receipts, so `record_chain` records the
+logs of every transaction the environment runs, under the block number and
+timestamp the environment is at. `LocalChainRPC` then answers the few
+JSON-RPC methods a log indexer needs (`eth_blockNumber`, `eth_getLogs`
+and `eth_getBlockByNumber`) from that record, with the results a node
+would give. Transactions rolled back by `boa.env.anchor()` stay recorded.
+
+It also answers the account and storage reads a fork makes, from the
+environment's current state, and `serve_rpc` serves it over HTTP, so that
+`boa.fork` and the cassettes of script/rpc_cassette.py can be pointed at
+it like at a node.
+"""
+
+import json
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Iterator
+
+import boa
+from boa.environment import Env
+from boa.rpc import RPC, RPCError, to_hex, to_int
+from eth_utils import keccak, to_canonical_address
+
+
+@dataclass
+class Log:
+    block: int
+    tx_index: int
+    log_index: int
+    address: str
+    topics: list[str]
+    data: str
+
+    @property
+    def tx_hash(self) -> str:
+        # boa's local transactions have no hash, one is made up
+        return "0x" + keccak(f"{self.block}:{self.tx_index}".encode()).hex()
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "address": self.address,
+            "topics": self.topics,
+            "data": self.data,
+            "blockNumber": to_hex(self.block),
+            "blockHash": block_hash(self.block),
+            "transactionHash": self.tx_hash,
+            "transactionIndex": to_hex(self.tx_index),
+            "logIndex": to_hex(self.log_index),
+            "removed": False,
+        }
+
+
+def block_hash(block: int) -> str:
+    return "0x" + keccak(f"block:{block}".encode()).hex()
+
+
+@dataclass
+class LocalChain:
+    env: Env
+    logs: list[Log] = field(default_factory=list)
+    timestamps: dict[int, int] = field(default_factory=dict)
+    _n_transactions: dict[int, int] = field(default_factory=dict)
+    _n_logs: dict[int, int] = field(default_factory=dict)
+
+    @property
+    def head(self) -> int:
+        return self.env.evm.patch.block_number
+
+    def record(self, computation):
+        if computation.is_error:
+            return
+        block = self.head
+        self.timestamps.setdefault(block, self.env.evm.patch.timestamp)
+        tx_index = self._n_transactions.get(block, 0)
+        self._n_transactions[block] = tx_index + 1
+        for address, topics, data in computation.get_log_entries():
+            log_index = self._n_logs.get(block, 0)
+            self._n_logs[block] = log_index + 1
+            self.logs.append(
+                Log(
+                    block,
+                    tx_index,
+                    log_index,
+                    "0x" + address.hex(),
+                    [to_hex(topic.to_bytes(32, "big")) for topic in topics],
+                    to_hex(data),
+                )
+            )
+
+
+@contextmanager
+def record_chain(env: Env | None = None):
+    """
+    Record the logs of the transactions run by `env`, the active boa
+    environment by default, into the LocalChain it yields.
+    """
+    env = env or boa.env
+    chain = LocalChain(env)
+    execute_code = env.execute_code
+    deploy = env.deploy
+
+    def recording_execute_code(*args, **kwargs):
+        computation = execute_code(*args, **kwargs)
+        if kwargs.get("is_modifying", True):
+            chain.record(computation)
+        return computation
+
+    def recording_deploy(*args, **kwargs):
+        address, computation = deploy(*args, **kwargs)
+        chain.record(computation)
+        return address, computation
+
+    env.execute_code = recording_execute_code
+    env.deploy = recording_deploy
+    try:
+        yield chain
+    finally:
+        del env.execute_code
+        del env.deploy
+
+
+def _matches(log: Log, address, topics: list) -> bool:
+    if address is not None:
+        addresses = address if isinstance(address, list) else [address]
+        if log.address not in [a.lower() for a in addresses]:
+            return False
+    for i, wanted in enumerate(topics):
+        if wanted is None:
+            continue
+        if i >= len(log.topics):
+            return False
+        wanted = wanted if isinstance(wanted, list) else [wanted]
+        if log.topics[i] not in [topic.lower() for topic in wanted]:
+            return False
+    return True
+
+
+STATE_METHODS = (
+    "eth_getBalance",
+    "eth_getTransactionCount",
+    "eth_getCode",
+    "eth_getStorageAt",
+)
+
+
+class LocalChainRPC(RPC):
+    """
+    Serves a LocalChain. `max_block_range`, like the limit providers put on
+    `eth_getLogs`, fails queries over a wider range of blocks.
+    """
+
+    def __init__(self, chain: LocalChain, max_block_range: int | None = None):
+        self._chain = chain
+        self._max_block_range = max_block_range
+
+    @property
+    def identifier(self) -> str:
+        return "local-chain"
+
+    @property
+    def name(self) -> str:
+        return self.identifier
+
+    def _block(self, tag: str) -> int:
+        if tag in ("latest", "safe", "finalized"):
+            return self._chain.head
+        if tag == "earliest":
+            return 0
+        return to_int(tag)
+
+    def get_logs(self, query: dict[str, Any]) -> list[dict[str, Any]]:
+        start = self._block(query.get("fromBlock", "latest"))
+        end = self._block(query.get("toBlock", "latest"))
+        if (
+            self._max_block_range is not None
+            and end - start + 1 > self._max_block_range
+        ):
+            raise RPCError(
+                f"query exceeds max block range {self._max_block_range}",
+                -32005,
+            )
+        return [
+            log.to_json()
+            for log in self._chain.logs
+            if start <= log.block <= end
+            and _matches(log, query.get("address"), query.get("topics", []))
+        ]
+
+    def fetch(self, method: str, params: Any) -> Any:
+        if method == "eth_blockNumber":
+            return to_hex(self._chain.head)
+        if method == "eth_getLogs":
+            return self.get_logs(params[0])
+        if method == "eth_getBlockByNumber":
+            block = self._block(params[0])
+            if block > self._chain.head:
+                return None
+            timestamp = self._chain.timestamps.get(block)
+            if timestamp is None:
+                # a block without recorded transactions, 12s a block
+                timestamp = self._chain.env.evm.patch.timestamp - 12 * (
+                    self._chain.head - block
+                )
+            return {
+                "number": to_hex(block),
+                "hash": block_hash(block),
+                "parentHash": block_hash(block - 1),
+                "timestamp": to_hex(timestamp),
+            }
+        if method == "eth_chainId":
+            return to_hex(self._chain.env.evm.patch.chain_id)
+        if method in STATE_METHODS:
+            # served at the head whatever the block asked for, which is
+            # what a fork of the latest block asks for
+            state = self._chain.env.evm.vm.state
+            address = to_canonical_address(params[0])
+            if method == "eth_getBalance":
+                return to_hex(state.get_balance(address))
+            if method == "eth_getTransactionCount":
+                return to_hex(state.get_nonce(address))
+            if method == "eth_getCode":
+                return to_hex(state.get_code(address))
+            slot = state.get_storage(address, to_int(params[1]))
+            return to_hex(slot.to_bytes(32, "big"))
+        raise RPCError(f"method {method} not supported", -32601)
+
+    def fetch_multi(self, payloads: list[tuple[str, Any]]) -> list[Any]:
+        return [self.fetch(method, params) for method, params in payloads]
+
+
+@contextmanager
+def serve_rpc(rpc: RPC) -> Iterator[str]:
+    """
+    Serve `rpc` as a JSON-RPC node on a local port, and yield its URL.
+    """
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            length = int(self.headers["Content-Length"])
+            request = json.loads(self.rfile.read(length))
+            if isinstance(request, list):
+                response = [self._answer(item) for item in request]
+            else:
+                response = self._answer(request)
+            body = json.dumps(response).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _answer(self, item: dict[str, Any]) -> dict[str, Any]:
+            response = {"jsonrpc": "2.0", "id": item["id"]}
+            try:
+                response["result"] = rpc.fetch(item["method"], item["params"])
+            except RPCError as e:
+                message = str(e).removeprefix(f"{e.code}: ")
+                response["error"] = {"code": e.code, "message": message}
+            return response
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}"
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
@@ -0,0 +1,18 @@
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+
+# the FeeAllocator's limits, checked against the contract by tests/test_views.py
+MAX_RECEIVERS = 10
+MAX_BPS = 10_000
+MAX_TOTAL_WEIGHT = 5_000  # in bps
+
+WEIGHT_SHIFT = 160
+
+
+def pack_receivers(configs: list[tuple[str, int]]) -> list[bytes]:
+    """Packs (receiver, weight) pairs into the words taken by
+    FeeAllocator.set_receivers_packed: weight << 160 | address.
+    """
+    return [
+        ((weight << WEIGHT_SHIFT) | int(receiver, 16)).to_bytes(32, "big")
+        for receiver, weight in configs
+    ]
@@ -0,0 +1,19 @@
+import csv
+import sys
+from dataclasses import asdict, fields
+
+
+def write_csv(rows: list, file=sys.stdout):
+    """Writes dataclass `rows` as CSV, a column per field of their class,
+    with a header unless there are no rows.
+    """
+    if not rows:
+        return
+    writer = csv.DictWriter(
+        file,
+        fieldnames=[field.name for field in fields(rows[0])],
+        lineterminator="\n",
+    )
+    writer.writeheader()
+    for row in rows:
+        writer.writerow(asdict(row))
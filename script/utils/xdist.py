@@ -0,0 +1,34 @@
+import os
+
+from moccasin.config import get_config, get_or_initialize_config
+
+from script.utils.dependencies import add_import_paths
+
+NETWORK_VAR = "FEE_ALLOCATOR_TEST_NETWORK"
+
+
+def is_worker() -> bool:
+    return "PYTEST_XDIST_WORKER" in os.environ
+
+
+def is_first_process() -> bool:
+    # the controller without xdist, the first worker with it
+    return os.environ.get("PYTEST_XDIST_WORKER", "gw0") == "gw0"
+
+
+def share_network():
+    """Lets the xdist workers `mox test -n` spawns know the active network.
+
+    The workers inherit the environment of the controller.
+    """
+    os.environ[NETWORK_VAR] = get_config().get_active_network().name
+
+
+def setup_worker():
+    """Sets up moccasin in an xdist worker the way `mox test` did in the
+    controller: the config, the import paths of the dependencies and the
+    network, which on a fork gives every worker its own fork backend.
+    """
+    config = get_or_initialize_config()
+    add_import_paths(config)
+    config.set_active_network(os.environ[NETWORK_VAR])
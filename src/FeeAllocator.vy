@@ -38,23 +38,179 @@ event FeesDistributed:
     distributor_share: uint256
 
 
+event FeesCarriedOver:
+    carried_over: uint256
+    carry_released: uint256
+
+
+event ReceiversPaid:
+    payouts: DynArray[uint256, MAX_RECEIVERS]  # amount << 160 | receiver
+
+
+event DistributionRoundStarted:
+    total_amount: uint256
+    n_receivers: uint256
+
+
+event FeesAccrued:
+    total_amount: uint256
+    receivers_share: uint256
+    fees_per_weight: uint256
+
+
+event FeesClaimed:
+    receiver: indexed(address)
+    amount: uint256
+
+
+event MerkleRootSet:
+    root: bytes32
+    total_weight: uint256
+
+
+event MerkleEpochStarted:
+    epoch: indexed(uint256)
+    root: bytes32
+    amount: uint256
+
+
+event MerkleFeesClaimed:
+    epoch: indexed(uint256)
+    receiver: indexed(address)
+    amount: uint256
+
+
+event TokenFeesDistributed:
+    token: indexed(address)
+    total_amount: uint256
+    distributor_share: uint256
+
+
+event TokenDistributorSet:
+    token: indexed(address)
+    distributor: indexed(address)
+
+
+event PayoutPolicySet:
+    receiver: indexed(address)
+    min_payout: uint256
+    interval: uint256
+
+
+event CarryOverPaid:
+    receiver: indexed(address)
+    amount: uint256
+
+
+event LogPayoutsSet:
+    enabled: bool
+
+
+event HookerSynced:
+    old_hooker: indexed(address)
+    new_hooker: indexed(address)
+
+
 struct ReceiverConfig:
     receiver: address
     weight: uint256
 
 
+struct PayoutPolicy:
+    min_payout: uint256
+    interval: uint256
+    last_payout_week: uint256
+    carried_over: uint256
+
+
+struct DistributionRound:
+    total_amount: uint256  # 0 when no round is in progress
+    distributor_share: uint256  # left for the fee distributor once every receiver is paid
+    carried_over: uint256
+    carry_released: uint256
+    cursor: uint256  # index of the next receiver to pay
+
+
 MAX_RECEIVERS: public(constant(uint256)) = 10
+MAX_BATCH_TOKENS: public(constant(uint256)) = 16
 MAX_BPS: constant(uint256) = 10_000
 MAX_TOTAL_WEIGHT: public(constant(uint256)) = 5_000  # in bps
+MAX_LOGGED_PAYOUT: constant(uint256) = (1 << 96) - 1
+
+# receiver entries pack the address in the low 160 bits, the weight above it and
+# whether the receiver has a payout policy in the top bit
+WEIGHT_SHIFT: constant(uint256) = 160
+ADDRESS_MASK: constant(uint256) = (1 << WEIGHT_SHIFT) - 1
+WEIGHT_MASK: constant(uint256) = (1 << 16) - 1
+HAS_PAYOUT_POLICY: constant(uint256) = 1 << 255
+
+# the slot read by every distribution packs the total weight (low 16 bits), the weight
+# of the merkle root above it, whether payouts are logged and, from bit 128, the
+# fee_token reserved for accrual, merkle claims, carry-overs and rounds
+MERKLE_WEIGHT_SHIFT: constant(uint256) = 16
+LOG_PAYOUTS_FLAG: constant(uint256) = 1 << 32
+RESERVED_SHIFT: constant(uint256) = 128
+MAX_RESERVED_BALANCE: constant(uint256) = (1 << (256 - RESERVED_SHIFT)) - 1
 
-fee_distributor: public(immutable(FeeDistributor))
-fee_collector: public(immutable(FeeCollector))
-fee_token: public(immutable(IERC20))
+WEEK: constant(uint256) = 7 * 86400
+# payout policies pack the carried over amount (low 128 bits), the minimum payout,
+# the payout interval in weeks and the week of the last payout
+PAYOUT_MIN_SHIFT: constant(uint256) = 128
+PAYOUT_INTERVAL_SHIFT: constant(uint256) = 224
+PAYOUT_WEEK_SHIFT: constant(uint256) = 240
+CARRY_MASK: constant(uint256) = (1 << PAYOUT_MIN_SHIFT) - 1
+MIN_PAYOUT_MASK: constant(uint256) = (1 << (PAYOUT_INTERVAL_SHIFT - PAYOUT_MIN_SHIFT)) - 1
+PAYOUT_INTERVAL_MASK: constant(uint256) = (1 << (PAYOUT_WEEK_SHIFT - PAYOUT_INTERVAL_SHIFT)) - 1
+PAYOUT_SETTINGS_MASK: constant(uint256) = (1 << PAYOUT_WEEK_SHIFT) - 1 - CARRY_MASK
 
-receiver_weights: public(HashMap[address, uint256])
-receivers: public(DynArray[address, MAX_RECEIVERS])
-receiver_indices: HashMap[address, uint256]
-total_weight: public(uint256)
+FEES_PER_WEIGHT_PRECISION: constant(uint256) = 10**18
+
+MAX_MERKLE_DEPTH: constant(uint256) = 32
+MERKLE_CLAIM_PERIOD: public(constant(uint256)) = 52 * 7 * 86400
+# merkle epoch data packs the amount (low 128 bits), the root's weight and the start timestamp
+EPOCH_WEIGHT_SHIFT: constant(uint256) = 128
+EPOCH_TIMESTAMP_SHIFT: constant(uint256) = 144
+EPOCH_AMOUNT_MASK: constant(uint256) = (1 << EPOCH_WEIGHT_SHIFT) - 1
+EPOCH_WEIGHT_MASK: constant(uint256) = (1 << (EPOCH_TIMESTAMP_SHIFT - EPOCH_WEIGHT_SHIFT)) - 1
+
+# instances deployed directly keep their configuration in immutables, while clones
+# deployed by FeeAllocatorFactory share an implementation deployed without one and
+# keep theirs in storage, see `initialize`
+FEE_DISTRIBUTOR: immutable(FeeDistributor)
+FEE_COLLECTOR: immutable(FeeCollector)
+FEE_TOKEN: immutable(IERC20)
+clone_fee_distributor: FeeDistributor
+clone_fee_collector: FeeCollector
+clone_fee_token: IERC20
+
+hooker: public(address)  # cached fee_collector.hooker(), see sync_hooker
+packed_receivers: DynArray[uint256, MAX_RECEIVERS]
+receiver_indices: HashMap[address, uint256]  # offset by 1, 0 is for non-receivers
+packed_state: uint256  # weights, payout logs and reserved balance, see RESERVED_SHIFT
+
+# batch mode: distributors of tokens other than fee_token, and the one each token is approved for
+token_distributors: public(HashMap[address, FeeDistributor])
+approved_distributors: HashMap[address, address]
+
+# accrual mode: fee_token accrued per unit of weight since deployment, scaled by precision
+fees_per_weight: public(uint256)
+receiver_fees_per_weight: HashMap[address, uint256]  # fees_per_weight at last settlement
+settled_fees: HashMap[address, uint256]  # accrued and settled but not yet claimed
+
+# fee_token shares below a receiver's minimum payout, carried over until paid out
+payout_policies: HashMap[address, uint256]
+
+# merkle mode: long tail of receivers claiming (index, receiver, weight) leaves of a root
+merkle_root: public(bytes32)  # root used for the epochs started by the next distributions
+n_merkle_epochs: public(uint256)
+merkle_epoch_roots: public(HashMap[uint256, bytes32])
+merkle_epoch_data: HashMap[uint256, uint256]
+merkle_epoch_claimed: public(HashMap[uint256, uint256])
+merkle_claimed_bitmap: HashMap[uint256, HashMap[uint256, uint256]]  # epoch -> word -> bits
+
+# paginated mode: fee_token distribution paid out to a snapshot of the receivers over several calls
+distribution_round: public(DistributionRound)
+round_receivers: DynArray[uint256, MAX_RECEIVERS]  # packed_receivers when the round started
 
 VERSION: public(constant(String[8])) = "0.1.0"
 
@@ -68,59 +224,399 @@ def __init__(
     """
     @notice Initialize the contract with the fee distributor address
     @notice The fee distributor will receive whatever is not distributed to other receivers
+    @dev Leave both the fee distributor and the fee collector empty to deploy the
+         implementation of FeeAllocatorFactory clones
     @param _fee_distributor The address of the fee distributor contract
     @param _fee_collector The address of the fee collector contract
     @param _owner The address of the contract's owner
     """
     assert _owner != empty(address), "zeroaddr: owner"
-    assert _fee_distributor.address != empty(address), "zeroaddr: fee_distributor"
-    assert _fee_collector.address != empty(address), "zeroaddr: fee_collector"
 
     ownable.__init__()
     ownable._transfer_ownership(_owner)
 
-    fee_distributor = _fee_distributor
-    fee_collector = _fee_collector
+    fee_token: IERC20 = empty(IERC20)
+    if _fee_distributor.address != empty(address) or _fee_collector.address != empty(address):
+        fee_token = self._configure(_fee_distributor, _fee_collector)
+
+    FEE_DISTRIBUTOR = _fee_distributor
+    FEE_COLLECTOR = _fee_collector
+    FEE_TOKEN = fee_token
+
+
+@internal
+def _configure(_fee_distributor: FeeDistributor, _fee_collector: FeeCollector) -> IERC20:
+    """
+    @notice Check the fee distributor and the fee collector, cache the hooker and
+            approve the fee distributor
+    @param _fee_distributor The address of the fee distributor contract
+    @param _fee_collector The address of the fee collector contract
+    @return The fee collector's target token
+    """
+    assert _fee_distributor.address != empty(address), "zeroaddr: fee_distributor"
+    assert _fee_collector.address != empty(address), "zeroaddr: fee_collector"
+
     # the distributor only handles crvusd so any change of target token would imply a change
     # of distributor (and necessitate a redeploy)
-    fee_token = IERC20(staticcall fee_collector.target())
+    fee_token: IERC20 = IERC20(staticcall _fee_collector.target())
+    self.hooker = staticcall _fee_collector.hooker()
     extcall fee_token.approve(
-        fee_distributor.address, max_value(uint256), default_return_value=True
+        _fee_distributor.address, max_value(uint256), default_return_value=True
+    )
+    return fee_token
+
+
+@external
+def initialize(_fee_distributor: FeeDistributor, _fee_collector: FeeCollector, _owner: address):
+    """
+    @notice Initialize a clone deployed by FeeAllocatorFactory
+    @dev Can only be called once, on a clone: instances deployed directly, the
+         clones' implementation included, get their owner in the constructor
+    @param _fee_distributor The address of the fee distributor contract
+    @param _fee_collector The address of the fee collector contract
+    @param _owner The address of the contract's owner
+    """
+    assert ownable.owner == empty(address), "initialize: already initialized"
+    assert FEE_COLLECTOR.address == empty(address), "initialize: implementation is configured"
+    assert _owner != empty(address), "zeroaddr: owner"
+    ownable._transfer_ownership(_owner)
+
+    self.clone_fee_token = self._configure(_fee_distributor, _fee_collector)
+    self.clone_fee_distributor = _fee_distributor
+    self.clone_fee_collector = _fee_collector
+
+
+@internal
+@view
+def _fee_distributor() -> FeeDistributor:
+    """
+    @notice Get the fee distributor, from storage for clones
+    @return The fee distributor
+    """
+    if FEE_DISTRIBUTOR.address != empty(address):
+        return FEE_DISTRIBUTOR
+    return self.clone_fee_distributor
+
+
+@internal
+@view
+def _fee_collector() -> FeeCollector:
+    """
+    @notice Get the fee collector, from storage for clones
+    @return The fee collector
+    """
+    if FEE_COLLECTOR.address != empty(address):
+        return FEE_COLLECTOR
+    return self.clone_fee_collector
+
+
+@internal
+@view
+def _fee_token() -> IERC20:
+    """
+    @notice Get the fee token, from storage for clones
+    @return The fee token
+    """
+    if FEE_TOKEN.address != empty(address):
+        return FEE_TOKEN
+    return self.clone_fee_token
+
+
+@internal
+@pure
+def _pack(_receiver: address, _weight: uint256) -> uint256:
+    """
+    @notice Pack a receiver's address and weight into a single storage word
+    @param _receiver The address of the receiver
+    @param _weight The weight assigned to the receiver
+    @return The packed receiver entry
+    """
+    return (_weight << WEIGHT_SHIFT) | convert(_receiver, uint256)
+
+
+@internal
+@pure
+def _unpack(_entry: uint256) -> (address, uint256):
+    """
+    @notice Unpack a receiver entry into its address and weight
+    @param _entry The packed receiver entry
+    @return The address and the weight of the receiver
+    """
+    return convert(_entry & ADDRESS_MASK, address), (_entry >> WEIGHT_SHIFT) & WEIGHT_MASK
+
+
+@internal
+@pure
+def _pack_payout(_receiver: address, _payout: uint256) -> uint256:
+    """
+    @notice Pack a receiver's payout for the ReceiversPaid event
+    @dev The payout includes any carry-over released with it, so it is checked
+         rather than the distributed balance
+    @param _receiver The address of the receiver
+    @param _payout The amount paid out to the receiver
+    @return The packed payout, amount << 160 | receiver
+    """
+    assert _payout <= MAX_LOGGED_PAYOUT, "distribute: too large to log"
+    return (_payout << WEIGHT_SHIFT) | convert(_receiver, uint256)
+
+
+@internal
+@view
+def _receiver_weight(_receiver: address) -> uint256:
+    """
+    @notice Get the weight of a receiver, 0 if it is not a receiver
+    @param _receiver The address of the receiver
+    @return The weight of the receiver
+    """
+    index: uint256 = self.receiver_indices[_receiver]
+    if index == 0:
+        return 0
+    return (self.packed_receivers[index - 1] >> WEIGHT_SHIFT) & WEIGHT_MASK
+
+
+@internal
+def _set_total_weight(_total_weight: uint256):
+    """
+    @notice Store the total weight of the receivers
+    @param _total_weight The new total weight
+    """
+    self.packed_state = (self.packed_state & ~WEIGHT_MASK) | _total_weight
+
+
+@internal
+def _reserve(_amount: uint256):
+    """
+    @notice Add to the fee_token held for later payouts
+    @param _amount The amount to reserve
+    """
+    state: uint256 = self.packed_state
+    assert (state >> RESERVED_SHIFT) + _amount <= MAX_RESERVED_BALANCE, "reserve: overflow"
+    self.packed_state = state + (_amount << RESERVED_SHIFT)
+
+
+@internal
+def _release(_amount: uint256):
+    """
+    @notice Subtract from the fee_token held for later payouts
+    @dev Reverts on underflow like a checked subtraction, as the reserved balance
+         fills the top bits of the slot
+    @param _amount The amount to release
+    """
+    self.packed_state -= _amount << RESERVED_SHIFT
+
+
+@internal
+def _settle(_receiver: address, _weight: uint256):
+    """
+    @notice Move the fees a receiver accrued since its last settlement to its claimable balance
+    @dev Must be called with the receiver's current weight before that weight changes
+    @param _receiver The address of the receiver
+    @param _weight The weight the receiver held since its last settlement
+    """
+    fees_per_weight: uint256 = self.fees_per_weight
+    last_fees_per_weight: uint256 = self.receiver_fees_per_weight[_receiver]
+    if fees_per_weight == last_fees_per_weight:
+        return
+
+    if _weight > 0:
+        self.settled_fees[_receiver] += (
+            _weight * (fees_per_weight - last_fees_per_weight) // FEES_PER_WEIGHT_PRECISION
+        )
+    self.receiver_fees_per_weight[_receiver] = fees_per_weight
+
+
+@internal
+def _burn(_amount: uint256):
+    """
+    @notice Hand over fee_token held by this contract to the fee distributor
+    @dev `burn` pulls the whole balance of the caller, so while fees are reserved for
+         accrual or merkle claims the amount is transferred instead and picked up at
+         the distributor's next token checkpoint
+    @param _amount The amount to hand over
+    """
+    if self.packed_state >> RESERVED_SHIFT == 0:
+        extcall self._fee_distributor().burn(self._fee_token().address)
+    else:
+        extcall self._fee_token().transfer(
+            self._fee_distributor().address, _amount, default_return_value=True
+        )
+
+
+@internal
+@pure
+def _merkle_amount(_balance: uint256, _state: uint256) -> uint256:
+    """
+    @notice Get the share of `_balance` going to the claim epoch of the current merkle root
+    @dev The weight of the root is capped so that table receivers and merkle leaves
+         together never take more than MAX_TOTAL_WEIGHT of the fees
+    @param _balance The amount being distributed
+    @param _state The packed state, holding the weights of the receivers and of the root
+    @return The merkle epoch's share
+    """
+    merkle_weight: uint256 = (_state >> MERKLE_WEIGHT_SHIFT) & WEIGHT_MASK
+    return _balance * min(merkle_weight, MAX_TOTAL_WEIGHT - (_state & WEIGHT_MASK)) // MAX_BPS
+
+
+@internal
+def _start_merkle_epoch(_balance: uint256, _state: uint256) -> uint256:
+    """
+    @notice Start a claim epoch for the current merkle root funded from `_balance`
+    @param _balance The amount being distributed
+    @param _state The packed state read by the distribution
+    @return The amount reserved for the epoch's claims
+    """
+    merkle_weight: uint256 = (_state >> MERKLE_WEIGHT_SHIFT) & WEIGHT_MASK
+    if merkle_weight == 0:
+        return 0
+
+    amount: uint256 = self._merkle_amount(_balance, _state)
+    if amount == 0:
+        return 0
+    assert amount <= EPOCH_AMOUNT_MASK, "merkle: amount overflow"
+
+    epoch: uint256 = self.n_merkle_epochs
+    root: bytes32 = self.merkle_root
+    self.merkle_epoch_roots[epoch] = root
+    self.merkle_epoch_data[epoch] = (
+        (block.timestamp << EPOCH_TIMESTAMP_SHIFT) | (merkle_weight << EPOCH_WEIGHT_SHIFT) | amount
     )
+    self.n_merkle_epochs = epoch + 1
+    self._reserve(amount)
+
+    log MerkleEpochStarted(epoch=epoch, root=root, amount=amount)
+    return amount
+
+
+@internal
+def _apply_payout_policy(_receiver: address, _amount: uint256) -> (uint256, uint256):
+    """
+    @notice Add a fee_token share to a receiver's carry-over, and pay out the whole
+            carry-over once the minimum payout or the payout interval is reached
+    @dev The carry-over is held by this contract and counted in the reserved balance. A
+         policy removed since a paginated round's snapshot pays out the share as is
+    @param _receiver The address of the receiver
+    @param _amount The receiver's share of the distribution
+    @return The amount to pay out now, 0 if the share is carried over, and the part
+            of it carried over from previous distributions
+    """
+    policy: uint256 = self.payout_policies[_receiver]
+    if policy & PAYOUT_SETTINGS_MASK == 0:
+        return _amount, 0
+    carried: uint256 = policy & CARRY_MASK
+    owed: uint256 = carried + _amount
+    min_payout: uint256 = (policy >> PAYOUT_MIN_SHIFT) & MIN_PAYOUT_MASK
+    interval: uint256 = (policy >> PAYOUT_INTERVAL_SHIFT) & PAYOUT_INTERVAL_MASK
+    week: uint256 = block.timestamp // WEEK
+
+    if (min_payout > 0 and owed >= min_payout) or (
+        interval > 0 and week >= (policy >> PAYOUT_WEEK_SHIFT) + interval
+    ):
+        settings: uint256 = policy & PAYOUT_SETTINGS_MASK
+        self.payout_policies[_receiver] = (week << PAYOUT_WEEK_SHIFT) | settings
+        self._release(carried)
+        return owed, carried
+
+    assert owed <= CARRY_MASK, "payouts: carry-over overflow"
+    self.payout_policies[_receiver] = policy + _amount
+    self._reserve(_amount)
+    return 0, 0
+
+
+@internal
+def _pay_carry_over(_receiver: address):
+    """
+    @notice Pay out a receiver's carry-over and delete its payout policy
+    @param _receiver The address of the receiver
+    """
+    carried: uint256 = self.payout_policies[_receiver] & CARRY_MASK
+    self.payout_policies[_receiver] = 0
+    if carried > 0:
+        self._release(carried)
+        extcall self._fee_token().transfer(_receiver, carried, default_return_value=True)
+        log CarryOverPaid(receiver=_receiver, amount=carried)
+
+
+@internal
+def _release_receiver(_receiver: address, _entry: uint256):
+    """
+    @notice Settle the accrued fees and pay out the carry-over of a receiver being removed
+    @param _receiver The address of the receiver
+    @param _entry The packed receiver entry
+    """
+    self._settle(_receiver, (_entry >> WEIGHT_SHIFT) & WEIGHT_MASK)
+    if _entry & HAS_PAYOUT_POLICY != 0:
+        self._pay_carry_over(_receiver)
+    self.receiver_indices[_receiver] = 0
+    log ReceiverRemoved(receiver=_receiver)
 
 
 @internal
-def _set_receiver(_receiver: address, _weight: uint256):
+def _set_receiver(_receiver: address, _weight: uint256, _total_weight: uint256) -> uint256:
     """
     @notice Add or update a receiver with a specified weight
+    @dev The caller checks the owner and stores the returned total weight
     @param _receiver The address of the receiver
     @param _weight The weight assigned to the receiver
+    @param _total_weight The total weight before the update
+    @return The total weight after the update
     """
-    ownable._check_owner()
     assert _receiver != empty(address), "zeroaddr: receiver"
     assert _weight > 0, "receivers: invalid weight, use remove_receiver"
 
-    old_weight: uint256 = self.receiver_weights[_receiver]
-    new_total_weight: uint256 = self.total_weight
+    index: uint256 = self.receiver_indices[_receiver]
+    old_entry: uint256 = 0
+    old_weight: uint256 = 0
+    new_total_weight: uint256 = _total_weight
 
-    if old_weight > 0:
+    if index > 0:
+        old_entry = self.packed_receivers[index - 1]
+        old_weight = (old_entry >> WEIGHT_SHIFT) & WEIGHT_MASK
         new_total_weight = new_total_weight - old_weight + _weight
     else:
-        assert (len(self.receivers) < MAX_RECEIVERS), "receivers: max limit reached"
+        assert (len(self.packed_receivers) < MAX_RECEIVERS), "receivers: max limit reached"
         new_total_weight += _weight
 
     assert (new_total_weight <= MAX_TOTAL_WEIGHT), "receivers: exceeds max total weight"
 
-    if old_weight == 0:
-        self.receiver_indices[_receiver] = (
-            len(self.receivers) + 1
-        )  # offset by 1, 0 is for deleted receivers
-        self.receivers.append(_receiver)
+    self._settle(_receiver, old_weight)
 
-    self.receiver_weights[_receiver] = _weight
-    self.total_weight = new_total_weight  # Update the stored total weight
+    if index > 0:
+        self.packed_receivers[index - 1] = self._pack(_receiver, _weight) | (
+            old_entry & HAS_PAYOUT_POLICY
+        )
+    else:
+        self.packed_receivers.append(self._pack(_receiver, _weight))
+        self.receiver_indices[_receiver] = len(self.packed_receivers)
 
     log ReceiverSet(receiver=_receiver, old_weight=old_weight, new_weight=_weight)
+    return new_total_weight
+
+
+@internal
+def _remove_receiver(_receiver: address) -> uint256:
+    """
+    @notice Remove a receiver from the list, moving the last entry in its place
+    @dev The caller checks the owner and updates the total weight
+    @param _receiver The address of the receiver to remove
+    @return The weight of the removed receiver
+    """
+    index: uint256 = self.receiver_indices[_receiver]
+    assert index > 0, "receivers: does not exist"
+
+    index_to_remove: uint256 = index - 1
+    last_index: uint256 = len(self.packed_receivers) - 1
+    entry: uint256 = self.packed_receivers[index_to_remove]
+    assert convert(entry & ADDRESS_MASK, address) == _receiver
+    self._release_receiver(_receiver, entry)
+
+    if index_to_remove < last_index:
+        last_entry: uint256 = self.packed_receivers[last_index]
+        self.packed_receivers[index_to_remove] = last_entry
+        self.receiver_indices[convert(last_entry & ADDRESS_MASK, address)] = index
+
+    self.packed_receivers.pop()
+
+    return (entry >> WEIGHT_SHIFT) & WEIGHT_MASK
 
 
 @external
@@ -130,7 +626,8 @@ def set_receiver(_receiver: address, _weight: uint256):
     @param _receiver The address of the receiver
     @param _weight The weight assigned to the receiver
     """
-    self._set_receiver(_receiver, _weight)
+    ownable._check_owner()
+    self._set_total_weight(self._set_receiver(_receiver, _weight, self.packed_state & WEIGHT_MASK))
 
 
 @external
@@ -139,44 +636,212 @@ def set_multiple_receivers(_configs: DynArray[ReceiverConfig, MAX_RECEIVERS]):
     @notice Add or update multiple receivers with specified weights
     @param _configs Array of receiver configurations (address, weight)
     @dev When adding new receivers, if total weight might exceed MAX_TOTAL_WEIGHT,
-         place receivers being updated with lower weights first in the array
+         place receivers being updated with lower weights first in the array, or
+         use `replace_receivers`
     """
+    ownable._check_owner()
     assert len(_configs) > 0, "receivers: empty array"
 
+    total_weight: uint256 = self.packed_state & WEIGHT_MASK
     for i: uint256 in range(MAX_RECEIVERS):
         if i >= len(_configs):
             break
 
         config: ReceiverConfig = _configs[i]
-        self._set_receiver(config.receiver, config.weight)
+        total_weight = self._set_receiver(config.receiver, config.weight, total_weight)
+    self._set_total_weight(total_weight)
 
 
 @external
+def set_receivers_packed(_packed_configs: DynArray[bytes32, MAX_RECEIVERS]):
+    """
+    @notice Add or update multiple receivers with configurations packed in one word each
+    @dev Each word holds the receiver's address in its low 160 bits and the weight
+         above it, halving the calldata of `set_multiple_receivers`. The same
+         ordering note applies
+    @param _packed_configs Array of packed receiver configurations (weight << 160 | address)
+    """
+    ownable._check_owner()
+    assert len(_packed_configs) > 0, "receivers: empty array"
+
+    total_weight: uint256 = self.packed_state & WEIGHT_MASK
+    for packed_config: bytes32 in _packed_configs:
+        config: uint256 = convert(packed_config, uint256)
+        total_weight = self._set_receiver(
+            convert(config & ADDRESS_MASK, address), config >> WEIGHT_SHIFT, total_weight
+        )
+    self._set_total_weight(total_weight)
+
+
+@external
+@nonreentrant
 def remove_receiver(_receiver: address):
     """
     @notice Remove a receiver from the list
+    @dev Pays out the receiver's carry-over, if any
     @param _receiver The address of the receiver to remove
     """
     ownable._check_owner()
-    weight: uint256 = self.receiver_weights[_receiver]
-    assert weight > 0, "receivers: does not exist"
+    self._set_total_weight((self.packed_state & WEIGHT_MASK) - self._remove_receiver(_receiver))
 
-    index_to_remove: uint256 = self.receiver_indices[_receiver] - 1
-    last_index: uint256 = len(self.receivers) - 1
-    assert self.receivers[index_to_remove] == _receiver
-    if index_to_remove < last_index:
-        last_receiver: address = self.receivers[last_index]
-        self.receivers[index_to_remove] = last_receiver
-        self.receiver_indices[last_receiver] = index_to_remove + 1
 
-    self.receivers.pop()
+@external
+@nonreentrant
+def remove_receivers(_receivers: DynArray[address, MAX_RECEIVERS]):
+    """
+    @notice Remove multiple receivers from the list
+    @dev Pays out the receivers' carry-overs, if any
+    @param _receivers The addresses of the receivers to remove
+    """
+    ownable._check_owner()
+    assert len(_receivers) > 0, "receivers: empty array"
+
+    removed_weight: uint256 = 0
+    for receiver: address in _receivers:
+        removed_weight += self._remove_receiver(receiver)
+    self._set_total_weight((self.packed_state & WEIGHT_MASK) - removed_weight)
 
-    self.receiver_weights[_receiver] = 0
-    self.receiver_indices[_receiver] = 0
 
-    self.total_weight -= weight
+@external
+@nonreentrant
+def replace_receivers(_configs: DynArray[ReceiverConfig, MAX_RECEIVERS]):
+    """
+    @notice Replace the whole set of receivers with the given configurations
+    @dev The final configuration is validated once, so the order of `_configs` does
+         not matter. Receivers are stored in the order of `_configs` and only the
+         entries that change are written. Receivers left out are removed, which pays
+         out their carry-over. Payout policies of the receivers kept are preserved
+    @param _configs Array of receiver configurations (address, weight), can be empty
+    """
+    ownable._check_owner()
+
+    old_receivers: DynArray[uint256, MAX_RECEIVERS] = self.packed_receivers
+    n_old_receivers: uint256 = len(old_receivers)
+    new_receivers: DynArray[uint256, MAX_RECEIVERS] = []
+    new_total_weight: uint256 = 0
+    kept: uint256 = 0  # bitmap of the old positions of the receivers kept
 
-    log ReceiverRemoved(receiver=_receiver)
+    for config: ReceiverConfig in _configs:
+        assert config.receiver != empty(address), "zeroaddr: receiver"
+        assert config.weight > 0, "receivers: invalid weight, use remove_receiver"
+        new_total_weight += config.weight
+
+        entry: uint256 = self._pack(config.receiver, config.weight)
+        old_weight: uint256 = 0
+        index: uint256 = self.receiver_indices[config.receiver]
+        if index > 0:
+            # the index was already moved to the new position if the receiver is repeated
+            if index <= len(new_receivers):
+                assert (new_receivers[index - 1] ^ entry) & ADDRESS_MASK != 0, (
+                    "receivers: duplicate receiver"
+                )
+            old_entry: uint256 = old_receivers[index - 1]
+            old_weight = (old_entry >> WEIGHT_SHIFT) & WEIGHT_MASK
+            entry |= old_entry & HAS_PAYOUT_POLICY
+            kept |= 1 << (index - 1)
+        if old_weight != config.weight:
+            self._settle(config.receiver, old_weight)
+            log ReceiverSet(
+                receiver=config.receiver, old_weight=old_weight, new_weight=config.weight
+            )
+
+        position: uint256 = len(new_receivers)
+        if position >= n_old_receivers:
+            self.packed_receivers.append(entry)
+        elif old_receivers[position] != entry:
+            self.packed_receivers[position] = entry
+        if index != position + 1:
+            self.receiver_indices[config.receiver] = position + 1
+        new_receivers.append(entry)
+
+    assert new_total_weight <= MAX_TOTAL_WEIGHT, "receivers: exceeds max total weight"
+
+    for i: uint256 in range(MAX_RECEIVERS):
+        if i >= n_old_receivers:
+            break
+        if kept & (1 << i) == 0:
+            old_entry: uint256 = old_receivers[i]
+            self._release_receiver(convert(old_entry & ADDRESS_MASK, address), old_entry)
+    for i: uint256 in range(MAX_RECEIVERS):
+        if len(self.packed_receivers) <= len(new_receivers):
+            break
+        self.packed_receivers.pop()
+
+    self._set_total_weight(new_total_weight)
+
+
+@internal
+def _distribute(_token: IERC20, _receivers: DynArray[uint256, MAX_RECEIVERS]) -> uint256:
+    """
+    @notice Pull the hooker's balance of a token and split it between the receivers
+            and the token's fee distributor
+    @dev Only fee_token funds merkle epochs, follows payout policies and has to leave
+         reserved fees untouched
+    @param _token The token to distribute
+    @param _receivers The packed receiver entries to distribute to
+    @return The amount distributed, 0 if there was nothing to distribute
+    """
+    amount_receivable: uint256 = staticcall _token.balanceOf(msg.sender)
+    extcall _token.transferFrom(msg.sender, self, amount_receivable, default_return_value=True)
+
+    is_fee_token: bool = _token == self._fee_token()
+    balance: uint256 = staticcall _token.balanceOf(self)
+    state: uint256 = 0
+    if is_fee_token:
+        state = self.packed_state
+        balance -= state >> RESERVED_SHIFT
+    if balance == 0:
+        return 0
+
+    remaining_balance: uint256 = balance
+    log_payouts: bool = False
+    if is_fee_token:
+        remaining_balance -= self._start_merkle_epoch(balance, state)
+        log_payouts = state & LOG_PAYOUTS_FLAG != 0
+    carried_over: uint256 = 0
+    carry_released: uint256 = 0
+    payouts: DynArray[uint256, MAX_RECEIVERS] = []
+
+    for entry: uint256 in _receivers:
+        receiver: address = empty(address)
+        weight: uint256 = 0
+        receiver, weight = self._unpack(entry)
+        amount: uint256 = balance * weight // MAX_BPS
+        if amount == 0:
+            continue
+        remaining_balance -= amount
+
+        payout: uint256 = amount
+        if is_fee_token and entry & HAS_PAYOUT_POLICY != 0:
+            released: uint256 = 0
+            payout, released = self._apply_payout_policy(receiver, amount)
+            if payout == 0:
+                carried_over += amount
+            carry_released += released
+        if payout > 0:
+            extcall _token.transfer(receiver, payout, default_return_value=True)
+            if log_payouts:
+                payouts.append(self._pack_payout(receiver, payout))
+    if is_fee_token:
+        self._burn(remaining_balance)
+        log FeesDistributed(total_amount=balance, distributor_share=remaining_balance)
+        if carried_over > 0 or carry_released > 0:
+            log FeesCarriedOver(carried_over=carried_over, carry_released=carry_released)
+        if log_payouts:
+            log ReceiversPaid(payouts=payouts)
+    else:
+        distributor: FeeDistributor = self.token_distributors[_token.address]
+        assert distributor.address != empty(address), "distribute: no distributor for token"
+        if self.approved_distributors[_token.address] != distributor.address:
+            extcall _token.approve(
+                distributor.address, max_value(uint256), default_return_value=True
+            )
+            self.approved_distributors[_token.address] = distributor.address
+        extcall distributor.burn(_token.address)
+        log TokenFeesDistributed(
+            token=_token.address, total_amount=balance, distributor_share=remaining_balance
+        )
+    return balance
 
 
 @external
@@ -184,24 +849,455 @@ def remove_receiver(_receiver: address):
 def distribute_fees():
     """
     @notice Distribute accumulated crvUSD fees to receivers based on their weights
+    @dev Unlike the other hooker-only entry points, the hooker is read from the fee
+         collector on every call rather than from `self.hooker`. This is the hook the
+         weekly `forward` runs, so a hooker change must not stall it until someone
+         calls `sync_hooker`
     """
-    assert (msg.sender == staticcall fee_collector.hooker()), "distribute: hooker only"
+    assert (msg.sender == staticcall self._fee_collector().hooker()), "distribute: hooker only"
+    assert (
+        self._distribute(self._fee_token(), self.packed_receivers) > 0
+    ), "receivers: no fees to distribute"
 
-    amount_receivable: uint256 = staticcall fee_token.balanceOf(msg.sender)
-    extcall fee_token.transferFrom(msg.sender, self, amount_receivable)
-    balance: uint256 = staticcall fee_token.balanceOf(self)
+
+@external
+@nonreentrant
+def distribute_fees_batch(_tokens: DynArray[IERC20, MAX_BATCH_TOKENS]):
+    """
+    @notice Distribute the hooker's balance of several tokens to receivers based on
+            their weights in a single call
+    @dev Every token is split with the same receivers. Tokens other than fee_token
+         need a distributor set with `set_token_distributor`, which is approved on
+         the token's first distribution. Tokens without fees are skipped
+    @param _tokens The tokens to distribute
+    """
+    assert msg.sender == self.hooker, "distribute: hooker only"
+
+    receivers: DynArray[uint256, MAX_RECEIVERS] = self.packed_receivers
+    for token: IERC20 in _tokens:
+        self._distribute(token, receivers)
+
+
+@external
+@nonreentrant
+def distribute_fees_direct():
+    """
+    @notice Distribute the hooker's crvUSD to receivers based on their weights
+            without routing the fees through this contract
+    @dev Every share is moved with `transferFrom` straight from the hooker, the
+         veCRV share included. As `burn` is not called, the fee distributor
+         accounts for its share at its next token checkpoint. Merkle epochs and
+         carried over shares are pulled into this contract with a single transfer
+    """
+    assert msg.sender == self.hooker, "distribute: hooker only"
+
+    fee_token: IERC20 = self._fee_token()
+    balance: uint256 = staticcall fee_token.balanceOf(msg.sender)
     assert balance > 0, "receivers: no fees to distribute"
 
-    remaining_balance: uint256 = balance
+    state: uint256 = self.packed_state
+    merkle_amount: uint256 = self._start_merkle_epoch(balance, state)
+    remaining_balance: uint256 = balance - merkle_amount
+    carried_over: uint256 = 0
+    carry_released: uint256 = 0
+    log_payouts: bool = state & LOG_PAYOUTS_FLAG != 0
+    payouts: DynArray[uint256, MAX_RECEIVERS] = []
 
-    for receiver: address in self.receivers:
-        weight: uint256 = self.receiver_weights[receiver]
+    for entry: uint256 in self.packed_receivers:
+        receiver: address = empty(address)
+        weight: uint256 = 0
+        receiver, weight = self._unpack(entry)
         amount: uint256 = balance * weight // MAX_BPS
-        if amount > 0:
-            extcall fee_token.transfer(receiver, amount, default_return_value=True)
-            remaining_balance -= amount
-    extcall fee_distributor.burn(fee_token.address)
+        if amount == 0:
+            continue
+        remaining_balance -= amount
+
+        payout: uint256 = amount
+        if entry & HAS_PAYOUT_POLICY != 0:
+            released: uint256 = 0
+            payout, released = self._apply_payout_policy(receiver, amount)
+            if payout == 0:
+                carried_over += amount
+                continue
+            if released > 0:
+                extcall fee_token.transfer(receiver, released, default_return_value=True)
+                carry_released += released
+        extcall fee_token.transferFrom(msg.sender, receiver, amount, default_return_value=True)
+        if log_payouts:
+            payouts.append(self._pack_payout(receiver, payout))
+    if merkle_amount + carried_over > 0:
+        extcall fee_token.transferFrom(
+            msg.sender, self, merkle_amount + carried_over, default_return_value=True
+        )
+    extcall fee_token.transferFrom(
+        msg.sender, self._fee_distributor().address, remaining_balance, default_return_value=True
+    )
     log FeesDistributed(total_amount=balance, distributor_share=remaining_balance)
+    if carried_over > 0 or carry_released > 0:
+        log FeesCarriedOver(carried_over=carried_over, carry_released=carry_released)
+    if log_payouts:
+        log ReceiversPaid(payouts=payouts)
+
+
+@internal
+def _start_distribution_round() -> DistributionRound:
+    """
+    @notice Pull the hooker's crvUSD and snapshot the receivers for a paginated round
+    @dev The whole round is counted in the reserved balance until it is paid out, so that
+         other distributions leave it untouched
+    @return The new round
+    """
+    fee_token: IERC20 = self._fee_token()
+    amount_receivable: uint256 = staticcall fee_token.balanceOf(msg.sender)
+    extcall fee_token.transferFrom(msg.sender, self, amount_receivable, default_return_value=True)
+
+    state: uint256 = self.packed_state
+    balance: uint256 = staticcall fee_token.balanceOf(self) - (state >> RESERVED_SHIFT)
+    assert balance > 0, "receivers: no fees to distribute"
+
+    distributor_share: uint256 = balance - self._start_merkle_epoch(balance, state)
+    self._reserve(distributor_share)
+    receivers: DynArray[uint256, MAX_RECEIVERS] = self.packed_receivers
+    self.round_receivers = receivers
+
+    log DistributionRoundStarted(total_amount=balance, n_receivers=len(receivers))
+    return DistributionRound(
+        total_amount=balance,
+        distributor_share=distributor_share,
+        carried_over=0,
+        carry_released=0,
+        cursor=0,
+    )
+
+
+@external
+@nonreentrant
+def distribute_fees_paginated(_max_receivers: uint256) -> bool:
+    """
+    @notice Distribute the hooker's crvUSD to receivers based on their weights, paying
+            at most `_max_receivers` receivers per call
+    @dev The hooker starts a round, which pulls its balance and snapshots the
+         receivers. Anyone can then continue the round from its stored cursor, and the
+         veCRV share is handed over to the fee distributor once every receiver of the
+         snapshot is paid. Receiver changes made during a round apply from the next one
+    @param _max_receivers The maximum number of receivers to pay in this call
+    @return Whether the round is complete
+    """
+    assert _max_receivers > 0, "distribute: invalid page size"
+
+    distribution_round: DistributionRound = self.distribution_round
+    if distribution_round.total_amount == 0:
+        assert msg.sender == self.hooker, "distribute: hooker only"
+        distribution_round = self._start_distribution_round()
+
+    fee_token: IERC20 = self._fee_token()
+    balance: uint256 = distribution_round.total_amount
+    log_payouts: bool = self.packed_state & LOG_PAYOUTS_FLAG != 0
+    payouts: DynArray[uint256, MAX_RECEIVERS] = []
+
+    start: uint256 = distribution_round.cursor
+    end: uint256 = len(self.round_receivers)
+    if end - start > _max_receivers:
+        end = start + _max_receivers
+    # released from the reserved balance, carried over shares are reserved again by their policy
+    paid: uint256 = 0
+
+    for i: uint256 in range(start, end, bound=MAX_RECEIVERS):
+        receiver: address = empty(address)
+        weight: uint256 = 0
+        entry: uint256 = self.round_receivers[i]
+        receiver, weight = self._unpack(entry)
+        amount: uint256 = balance * weight // MAX_BPS
+        if amount == 0:
+            continue
+        distribution_round.distributor_share -= amount
+        paid += amount
+
+        payout: uint256 = amount
+        if entry & HAS_PAYOUT_POLICY != 0:
+            released: uint256 = 0
+            payout, released = self._apply_payout_policy(receiver, amount)
+            if payout == 0:
+                distribution_round.carried_over += amount
+            distribution_round.carry_released += released
+        if payout > 0:
+            extcall fee_token.transfer(receiver, payout, default_return_value=True)
+            if log_payouts:
+                payouts.append(self._pack_payout(receiver, payout))
+    self._release(paid)
+    if log_payouts:
+        log ReceiversPaid(payouts=payouts)
+
+    if end < len(self.round_receivers):
+        distribution_round.cursor = end
+        self.distribution_round = distribution_round
+        return False
+
+    self.distribution_round = empty(DistributionRound)
+    self._release(distribution_round.distributor_share)
+    self._burn(distribution_round.distributor_share)
+    log FeesDistributed(
+        total_amount=balance, distributor_share=distribution_round.distributor_share
+    )
+    if distribution_round.carried_over > 0 or distribution_round.carry_released > 0:
+        log FeesCarriedOver(
+            carried_over=distribution_round.carried_over,
+            carry_released=distribution_round.carry_released,
+        )
+    return True
+
+
+@external
+@nonreentrant
+def accrue_fees():
+    """
+    @notice Accrue the hooker's crvUSD to receivers based on their weights, to be
+            claimed later with `claim`
+    @dev Costs the same whatever the number of receivers: only the fees per weight
+         accumulator is updated. The veCRV share is sent straight to the fee
+         distributor and accounted for at its next token checkpoint
+    """
+    assert msg.sender == self.hooker, "distribute: hooker only"
+
+    fee_token: IERC20 = self._fee_token()
+    balance: uint256 = staticcall fee_token.balanceOf(msg.sender)
+    assert balance > 0, "receivers: no fees to distribute"
+
+    state: uint256 = self.packed_state
+    # weights are in bps of the fees, so each unit of weight accrues balance / MAX_BPS
+    fees_per_weight: uint256 = self.fees_per_weight + balance * FEES_PER_WEIGHT_PRECISION // MAX_BPS
+    # rounded up so that the claims can never exceed what is reserved for them
+    receivers_share: uint256 = (
+        (balance * FEES_PER_WEIGHT_PRECISION // MAX_BPS) * (state & WEIGHT_MASK)
+        + FEES_PER_WEIGHT_PRECISION
+        - 1
+    ) // FEES_PER_WEIGHT_PRECISION
+    self.fees_per_weight = fees_per_weight
+    merkle_amount: uint256 = self._start_merkle_epoch(balance, state)
+
+    if receivers_share + merkle_amount > 0:
+        self._reserve(receivers_share)
+        extcall fee_token.transferFrom(
+            msg.sender, self, receivers_share + merkle_amount, default_return_value=True
+        )
+    extcall fee_token.transferFrom(
+        msg.sender,
+        self._fee_distributor().address,
+        balance - receivers_share - merkle_amount,
+        default_return_value=True,
+    )
+    log FeesAccrued(
+        total_amount=balance, receivers_share=receivers_share, fees_per_weight=fees_per_weight
+    )
+
+
+@external
+@nonreentrant
+def claim(_receiver: address = msg.sender) -> uint256:
+    """
+    @notice Claim the fees accrued to a receiver through `accrue_fees`
+    @dev Anyone can trigger the claim, the fees are always sent to the receiver
+    @param _receiver The address of the receiver, defaults to the caller
+    @return The amount claimed
+    """
+    self._settle(_receiver, self._receiver_weight(_receiver))
+
+    amount: uint256 = self.settled_fees[_receiver]
+    if amount > 0:
+        self.settled_fees[_receiver] = 0
+        self._release(amount)
+        extcall self._fee_token().transfer(_receiver, amount, default_return_value=True)
+
+    log FeesClaimed(receiver=_receiver, amount=amount)
+    return amount
+
+
+@external
+def set_token_distributor(_token: address, _distributor: FeeDistributor):
+    """
+    @notice Set the fee distributor receiving the veCRV share of a token distributed
+            with `distribute_fees_batch`
+    @param _token The address of the token
+    @param _distributor The distributor, which must pull the token through `burn`
+    """
+    ownable._check_owner()
+    assert _token != self._fee_token().address, "distribute: fee token uses fee_distributor"
+
+    self.token_distributors[_token] = _distributor
+
+    log TokenDistributorSet(token=_token, distributor=_distributor.address)
+
+
+@external
+def set_merkle_root(_root: bytes32, _total_weight: uint256):
+    """
+    @notice Set the merkle root of (index, receiver, weight) leaves used by the
+            claim epochs of the next distributions
+    @dev Leaves are keccak256(abi_encode(index, receiver, weight)) and nodes hash
+         their sorted children, see script/merkle.py. Use an empty root and a
+         zero weight to stop funding merkle epochs
+    @param _root The merkle root
+    @param _total_weight The sum of the weights of the root's leaves, in bps
+    """
+    ownable._check_owner()
+    assert (_root == empty(bytes32)) == (_total_weight == 0), "merkle: invalid root"
+    assert _total_weight <= MAX_TOTAL_WEIGHT, "merkle: exceeds max total weight"
+
+    self.merkle_root = _root
+    merkle_weight_mask: uint256 = WEIGHT_MASK << MERKLE_WEIGHT_SHIFT
+    self.packed_state = (self.packed_state & ~merkle_weight_mask) | (
+        _total_weight << MERKLE_WEIGHT_SHIFT
+    )
+
+    log MerkleRootSet(root=_root, total_weight=_total_weight)
+
+
+@external
+@nonreentrant
+def claim_merkle(
+    _epoch: uint256,
+    _index: uint256,
+    _receiver: address,
+    _weight: uint256,
+    _proof: DynArray[bytes32, MAX_MERKLE_DEPTH],
+) -> uint256:
+    """
+    @notice Claim a receiver's share of a merkle epoch
+    @dev Anyone can submit the claim, the fees are always sent to the receiver
+    @param _epoch The merkle epoch to claim from
+    @param _index The index of the receiver's leaf
+    @param _receiver The address of the receiver
+    @param _weight The weight of the receiver's leaf, in bps
+    @param _proof The sibling hashes from the leaf up to the root
+    @return The amount claimed
+    """
+    root: bytes32 = self.merkle_epoch_roots[_epoch]
+    assert root != empty(bytes32), "merkle: unknown epoch"
+
+    word: uint256 = _index >> 8
+    bit: uint256 = 1 << (_index & 255)
+    claimed_bitmap: uint256 = self.merkle_claimed_bitmap[_epoch][word]
+    assert claimed_bitmap & bit == 0, "merkle: already claimed"
+
+    node: bytes32 = keccak256(abi_encode(_index, _receiver, _weight))
+    for sibling: bytes32 in _proof:
+        if convert(node, uint256) < convert(sibling, uint256):
+            node = keccak256(concat(node, sibling))
+        else:
+            node = keccak256(concat(sibling, node))
+    assert node == root, "merkle: invalid proof"
+
+    self.merkle_claimed_bitmap[_epoch][word] = claimed_bitmap | bit
+
+    epoch_data: uint256 = self.merkle_epoch_data[_epoch]
+    epoch_amount: uint256 = epoch_data & EPOCH_AMOUNT_MASK
+    epoch_weight: uint256 = (epoch_data >> EPOCH_WEIGHT_SHIFT) & EPOCH_WEIGHT_MASK
+    amount: uint256 = epoch_amount * _weight // epoch_weight
+    claimed: uint256 = self.merkle_epoch_claimed[_epoch] + amount
+    assert claimed <= epoch_amount, "merkle: exceeds epoch amount"
+    self.merkle_epoch_claimed[_epoch] = claimed
+
+    self._release(amount)
+    extcall self._fee_token().transfer(_receiver, amount, default_return_value=True)
+
+    log MerkleFeesClaimed(epoch=_epoch, receiver=_receiver, amount=amount)
+    return amount
+
+
+@external
+@nonreentrant
+def sweep_merkle_epoch(_epoch: uint256):
+    """
+    @notice Send what was not claimed from a merkle epoch to veCRV holders
+    @dev Permissionless once MERKLE_CLAIM_PERIOD has passed since the epoch started
+    @param _epoch The merkle epoch to sweep
+    """
+    assert self.merkle_epoch_roots[_epoch] != empty(bytes32), "merkle: unknown epoch"
+    epoch_data: uint256 = self.merkle_epoch_data[_epoch]
+    assert (
+        block.timestamp >= (epoch_data >> EPOCH_TIMESTAMP_SHIFT) + MERKLE_CLAIM_PERIOD
+    ), "merkle: claim period not over"
+
+    epoch_amount: uint256 = epoch_data & EPOCH_AMOUNT_MASK
+    unclaimed: uint256 = epoch_amount - self.merkle_epoch_claimed[_epoch]
+    self.merkle_epoch_claimed[_epoch] = epoch_amount
+    if unclaimed > 0:
+        self._release(unclaimed)
+        self._burn(unclaimed)
+
+
+@external
+@nonreentrant
+def set_payout_policy(_receiver: address, _min_payout: uint256, _interval: uint256):
+    """
+    @notice Set the minimum payout and/or the payout interval of a receiver
+    @dev Shares of fee_token pushed by `distribute_fees`, `distribute_fees_batch`,
+         `distribute_fees_direct` or `distribute_fees_paginated` are carried over in
+         this contract until they add up to `_min_payout` or `_interval` weeks have
+         passed since the last payout, and are then paid out all at once. Setting
+         both to 0 removes the policy and pays out the carry-over
+    @param _receiver The address of the receiver
+    @param _min_payout The minimum amount to pay out, 0 for none
+    @param _interval The number of weeks after which the carry-over is paid out
+           whatever its amount, 0 for none
+    """
+    ownable._check_owner()
+    index: uint256 = self.receiver_indices[_receiver]
+    assert index > 0, "receivers: does not exist"
+    assert _min_payout <= MIN_PAYOUT_MASK, "payouts: invalid min payout"
+    assert _interval <= PAYOUT_INTERVAL_MASK, "payouts: invalid interval"
+
+    entry: uint256 = self.packed_receivers[index - 1]
+    if _min_payout == 0 and _interval == 0:
+        if entry & HAS_PAYOUT_POLICY != 0:
+            self._pay_carry_over(_receiver)
+            self.packed_receivers[index - 1] = entry ^ HAS_PAYOUT_POLICY
+    else:
+        policy: uint256 = self.payout_policies[_receiver]
+        last_payout_week: uint256 = policy >> PAYOUT_WEEK_SHIFT
+        if policy == 0:
+            last_payout_week = block.timestamp // WEEK
+        self.payout_policies[_receiver] = (
+            (last_payout_week << PAYOUT_WEEK_SHIFT)
+            | (_interval << PAYOUT_INTERVAL_SHIFT)
+            | (_min_payout << PAYOUT_MIN_SHIFT)
+            | (policy & CARRY_MASK)
+        )
+        self.packed_receivers[index - 1] = entry | HAS_PAYOUT_POLICY
+
+    log PayoutPolicySet(receiver=_receiver, min_payout=_min_payout, interval=_interval)
+
+
+@external
+def set_log_payouts(_enabled: bool):
+    """
+    @notice Enable or disable the ReceiversPaid event of crvUSD distributions
+    @dev ReceiversPaid packs what each receiver was paid by a run into a single log,
+         as amount << 160 | receiver, so indexers don't have to filter the token's
+         Transfer logs. Receivers whose share is carried over are left out. While it
+         is enabled, a distribution reverts if a payout, carry-over included, does
+         not fit in 96 bits
+    @param _enabled Whether to log the payouts
+    """
+    ownable._check_owner()
+    if _enabled:
+        self.packed_state |= LOG_PAYOUTS_FLAG
+    else:
+        self.packed_state &= ~LOG_PAYOUTS_FLAG
+    log LogPayoutsSet(enabled=_enabled)
+
+
+@external
+def sync_hooker():
+    """
+    @notice Refresh the cached hooker used by the hooker-only entry points other than
+            `distribute_fees`
+    @dev Permissionless, to be called whenever the fee collector's hooker changes
+    """
+    old_hooker: address = self.hooker
+    new_hooker: address = staticcall self._fee_collector().hooker()
+    self.hooker = new_hooker
+    log HookerSynced(old_hooker=old_hooker, new_hooker=new_hooker)
 
 
 @external
@@ -211,7 +1307,173 @@ def n_receivers() -> uint256:
     @notice Get the number of receivers
     @return The number of receivers
     """
-    return len(self.receivers)
+    return len(self.packed_receivers)
+
+
+@external
+@view
+def receivers(_index: uint256) -> address:
+    """
+    @notice Get the receiver at a given index
+    @param _index The index of the receiver
+    @return The address of the receiver
+    """
+    return convert(self.packed_receivers[_index] & ADDRESS_MASK, address)
+
+
+@external
+@view
+def get_receivers() -> (DynArray[ReceiverConfig, MAX_RECEIVERS], uint256, uint256):
+    """
+    @notice Get the whole receiver configuration in a single call
+    @return The receivers and their weights in storage order, the total weight
+            and the fee distributor's weight
+    """
+    configs: DynArray[ReceiverConfig, MAX_RECEIVERS] = []
+    for entry: uint256 in self.packed_receivers:
+        receiver: address = empty(address)
+        weight: uint256 = 0
+        receiver, weight = self._unpack(entry)
+        configs.append(ReceiverConfig(receiver=receiver, weight=weight))
+    total_weight: uint256 = self.packed_state & WEIGHT_MASK
+    return configs, total_weight, MAX_BPS - total_weight
+
+
+@external
+@view
+def preview_distribution(_amount: uint256) -> (DynArray[uint256, MAX_RECEIVERS], uint256, uint256):
+    """
+    @notice Preview how `distribute_fees` would split an amount of crvUSD
+    @dev Uses the same rounding as the distribution. Shares of receivers with a
+         payout policy may be carried over instead of paid out
+    @param _amount The amount to distribute
+    @return The amount of each receiver in the order of `get_receivers`, the share
+            of the current merkle root's epoch and the fee distributor's share
+    """
+    remaining_amount: uint256 = _amount
+    merkle_amount: uint256 = self._merkle_amount(_amount, self.packed_state)
+    remaining_amount -= merkle_amount
+
+    amounts: DynArray[uint256, MAX_RECEIVERS] = []
+    for entry: uint256 in self.packed_receivers:
+        amount: uint256 = _amount * ((entry >> WEIGHT_SHIFT) & WEIGHT_MASK) // MAX_BPS
+        amounts.append(amount)
+        remaining_amount -= amount
+    return amounts, merkle_amount, remaining_amount
+
+
+@external
+@view
+def receiver_weights(_receiver: address) -> uint256:
+    """
+    @notice Get the weight of a receiver
+    @param _receiver The address of the receiver
+    @return The weight of the receiver, 0 if it is not a receiver
+    """
+    return self._receiver_weight(_receiver)
+
+
+@external
+@view
+def claimable(_receiver: address) -> uint256:
+    """
+    @notice Get the fees accrued to a receiver that can be claimed
+    @param _receiver The address of the receiver
+    @return The claimable amount
+    """
+    accrued_per_weight: uint256 = self.fees_per_weight - self.receiver_fees_per_weight[_receiver]
+    return self.settled_fees[_receiver] + (
+        self._receiver_weight(_receiver) * accrued_per_weight // FEES_PER_WEIGHT_PRECISION
+    )
+
+
+@external
+@view
+def payout_policy(_receiver: address) -> PayoutPolicy:
+    """
+    @notice Get the payout policy of a receiver and the fees carried over for it
+    @param _receiver The address of the receiver
+    @return The minimum payout, the payout interval in weeks, the week of the last
+            payout and the carried over amount
+    """
+    policy: uint256 = self.payout_policies[_receiver]
+    return PayoutPolicy(
+        min_payout=(policy >> PAYOUT_MIN_SHIFT) & MIN_PAYOUT_MASK,
+        interval=(policy >> PAYOUT_INTERVAL_SHIFT) & PAYOUT_INTERVAL_MASK,
+        last_payout_week=policy >> PAYOUT_WEEK_SHIFT,
+        carried_over=policy & CARRY_MASK,
+    )
+
+
+@external
+@view
+def fee_distributor() -> FeeDistributor:
+    """
+    @notice Get the fee distributor receiving the veCRV share of crvUSD
+    @return The fee distributor
+    """
+    return self._fee_distributor()
+
+
+@external
+@view
+def fee_collector() -> FeeCollector:
+    """
+    @notice Get the fee collector whose hooker distributes the fees
+    @return The fee collector
+    """
+    return self._fee_collector()
+
+
+@external
+@view
+def fee_token() -> IERC20:
+    """
+    @notice Get the token distributed by `distribute_fees`, the fee collector's target
+    @return The fee token
+    """
+    return self._fee_token()
+
+
+@external
+@view
+def total_weight() -> uint256:
+    """
+    @notice Get the sum of the weights of the receivers
+    @return The total weight, in bps
+    """
+    return self.packed_state & WEIGHT_MASK
+
+
+@external
+@view
+def log_payouts() -> bool:
+    """
+    @notice Get whether crvUSD distributions log ReceiversPaid
+    @return Whether the payouts are logged
+    """
+    return self.packed_state & LOG_PAYOUTS_FLAG != 0
+
+
+@external
+@view
+def merkle_weight() -> uint256:
+    """
+    @notice Get the sum of the weights of the current merkle root's leaves
+    @return The merkle weight, in bps
+    """
+    return (self.packed_state >> MERKLE_WEIGHT_SHIFT) & WEIGHT_MASK
+
+
+@external
+@view
+def reserved_balance() -> uint256:
+    """
+    @notice Get the fee_token held for accrual, merkle claims, carry-overs and
+            paginated rounds, which distributions leave untouched
+    @return The reserved balance
+    """
+    return self.packed_state >> RESERVED_SHIFT
 
 
 @external
@@ -221,4 +1483,4 @@ def distributor_weight() -> uint256:
     @notice Get the portion of fees going to the fee distributor for veCRV
     @return The distributors' weight
     """
-    return MAX_BPS - self.total_weight
+    return MAX_BPS - (self.packed_state & WEIGHT_MASK)
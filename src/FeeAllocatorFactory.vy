@@ -0,0 +1,75 @@
+# pragma version ^0.4.1
+"""
+@title FeeAllocatorFactory
+@license MIT
+@author Curve Finance
+@notice Deploy FeeAllocator instances as minimal proxies (EIP-1167) of a
+        single implementation
+"""
+
+
+interface FeeAllocator:
+    def initialize(_fee_distributor: address, _fee_collector: address, _owner: address): nonpayable
+    def fee_collector() -> address: view
+
+
+event FeeAllocatorDeployed:
+    fee_allocator: indexed(address)
+    fee_collector: indexed(address)
+    fee_distributor: address
+    owner: address
+
+
+implementation: public(immutable(address))
+
+n_fee_allocators: public(uint256)
+fee_allocators: public(HashMap[uint256, address])
+is_fee_allocator: public(HashMap[address, bool])
+
+VERSION: public(constant(String[8])) = "0.1.0"
+
+
+@deploy
+def __init__(_implementation: address):
+    """
+    @notice Initialize the factory with the FeeAllocator to clone
+    @dev The implementation must be a FeeAllocator deployed without fee distributor
+         and fee collector. Its constructor sets its owner, so that it can't be
+         initialized by anyone else
+    @param _implementation The address of the FeeAllocator implementation
+    """
+    assert _implementation != empty(address), "zeroaddr: implementation"
+    assert (
+        staticcall FeeAllocator(_implementation).fee_collector() == empty(address)
+    ), "factory: implementation is configured"
+    implementation = _implementation
+
+
+@external
+def deploy_fee_allocator(
+    _fee_distributor: address, _fee_collector: address, _owner: address
+) -> address:
+    """
+    @notice Deploy and initialize a new FeeAllocator
+    @dev The clone is initialized in the same call so that its initialization
+         can't be front-run
+    @param _fee_distributor The address of the fee distributor contract
+    @param _fee_collector The address of the fee collector contract
+    @param _owner The address of the new FeeAllocator's owner
+    @return The address of the new FeeAllocator
+    """
+    fee_allocator: address = create_minimal_proxy_to(implementation)
+    extcall FeeAllocator(fee_allocator).initialize(_fee_distributor, _fee_collector, _owner)
+
+    n_fee_allocators: uint256 = self.n_fee_allocators
+    self.fee_allocators[n_fee_allocators] = fee_allocator
+    self.n_fee_allocators = n_fee_allocators + 1
+    self.is_fee_allocator[fee_allocator] = True
+
+    log FeeAllocatorDeployed(
+        fee_allocator=fee_allocator,
+        fee_collector=_fee_collector,
+        fee_distributor=_fee_distributor,
+        owner=_owner,
+    )
+    return fee_allocator
@@ -1,4 +1,4 @@
-import time
+from contextlib import nullcontext
 from typing import Callable
 
 import boa
@@ -8,33 +8,47 @@ from moccasin.boa_tools import VyperContract
 from moccasin.config import get_config
 from moccasin.moccasin_account import MoccasinAccount
 
+from script.prepared_world import dump_world, restore_world, world_key
+from script.utils import xdist
+from script.utils.fee_collector import WEEK, set_epoch_to_forward
+from script.utils.gas import reset_access_lists
+from script.utils.hooker import add_fee_allocator_to_hooker
 from src import FeeAllocator
 
-EMPTY_COMPENSATION = (0, (0, 0, 0), 0, 0, False)
-
-FEE_COLLECTOR_ADMIN = "0x40907540d8a6C65c637785e8f8B742ae6b0b9968"
 ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
-WEEK = 7 * 24 * 3600
+
+# every test runs in a boa anchor (see boa's pytest plugin), so it starts
+# from the prepared session state and its changes are rolled back after it.
+# Tests are therefore independent and can be spread over xdist workers
+if xdist.is_worker():
+    xdist.setup_worker()
+else:
+    xdist.share_network()
+
+# the local network (pyevm) deploys the stand-ins from script/mocks, only a fork
+# has the veCRV and DAO contracts the deployment test needs
+IS_FORK = get_config().get_active_network().is_fork
+collect_ignore = [] if IS_FORK else ["test_deploy.py"]
 
 
 @pytest.fixture(scope="session")
-def actual_fee_collector() -> VyperContract:
-    return get_config().get_active_network().manifest_named("fee_collector")
+def actual_fee_collector(world) -> VyperContract:
+    return world["fee_collector"]
 
 
 @pytest.fixture(scope="session")
-def actual_hooker() -> VyperContract:
-    return get_config().get_active_network().manifest_named("hooker")
+def actual_hooker(world) -> VyperContract:
+    return world["hooker"]
 
 
 @pytest.fixture(scope="session")
-def actual_crvusd() -> VyperContract:
-    return get_config().get_active_network().manifest_named("crvusd")
+def actual_crvusd(world) -> VyperContract:
+    return world["crvusd"]
 
 
 @pytest.fixture(scope="session")
-def actual_fee_distributor() -> VyperContract:
-    return get_config().get_active_network().manifest_named("fee_distributor")
+def actual_fee_distributor(world) -> VyperContract:
+    return world["fee_distributor"]
 
 
 @pytest.fixture(scope="session")
@@ -94,59 +108,84 @@ def mint_to_receiver(
 
 
 @pytest.fixture(scope="session")
-def fee_allocator(
-    actual_fee_distributor, actual_fee_collector, admin
-) -> VyperContract:
-    return FeeAllocator.deploy(
-        actual_fee_distributor, actual_fee_collector, admin
-    )
+def measure_gas() -> Callable[..., int]:
+    # `call` is measured as a fresh transaction to `contract`, with cold
+    # accounts and slots, made by `sender` if given. A deployment is
+    # measured with no `contract`, on the contract `call` returns
+    def inner(contract, call: Callable[[], object], sender=None) -> int:
+        reset_access_lists()
+        with boa.env.prank(sender) if sender else nullcontext():
+            result = call()
+        return (contract or result)._computation.get_gas_used()
 
+    return inner
 
-@pytest.fixture(scope="session", autouse=True)
-def lock_vecrv_on_main(crv_token, vecrv, admin):
-    amount = int(10_000 * 1e18)
-    with boa.env.prank(vecrv.address):
-        crv_token.transfer(admin, amount)
-    with boa.env.prank(admin.address):
-        crv_token.approve(vecrv, amount)
-        vecrv.create_lock(amount, int(time.time()) + WEEK * 52 * 4)
+
+@pytest.fixture(scope="session")
+def fee_allocator(world) -> VyperContract:
+    return world["fee_allocator"]
 
 
 @pytest.fixture(scope="session", autouse=True)
-def set_epoch_to_forward(
-    actual_fee_collector,
-):  # move forward, so all time travels lead to positive values
+def world(request, admin) -> dict[str, VyperContract]:
+    # the session setup is run once per world key, later sessions restore
+    # the state it left from the pytest cache (see script/prepared_world.py)
+    cache_key = f"prepared_world/{get_config().get_active_network().name}"
+    key = world_key()
+    saved = request.config.cache.get(cache_key, None)
+    if saved is not None and saved["key"] == key:
+        return restore_world(saved)
+
+    contracts = prepare_world(admin)
+    # xdist workers all prepare the same world, one of them saves it
+    if xdist.is_first_process():
+        request.config.cache.set(
+            cache_key, dump_world(key, contracts, [admin.address])
+        )
+    return contracts
 
-    boa.env.time_travel(seconds=52 * WEEK)
-    timeframe = actual_fee_collector.epoch_time_frame(8)  # FORWARD period = 8
-    seconds = timeframe[0] - boa.env.evm.vm.state.timestamp
-    extra_week = WEEK * (seconds // WEEK)
-    boa.env.time_travel(seconds=seconds + extra_week)
 
+def prepare_world(admin) -> dict[str, VyperContract]:
+    network = get_config().get_active_network()
+    if IS_FORK:
+        lock_vecrv_on_main(network, admin)
 
-@pytest.fixture(scope="session", autouse=True)
-def add_fee_allocator_to_hooker(actual_hooker, actual_crvusd, fee_allocator):
-    with boa.env.prank(FEE_COLLECTOR_ADMIN):
-        actual_hooker.set_hooks(
-            [
-                (
-                    fee_allocator.address,
-                    fee_allocator.distribute_fees.prepare_calldata(),
-                    EMPTY_COMPENSATION,
-                    True,
-                )
-            ]
-        )
-        actual_hooker.one_time_hooks(
-            [
-                (
-                    actual_crvusd.address,
-                    actual_crvusd.approve.prepare_calldata(
-                        fee_allocator.address, 2**256 - 1
-                    ),
-                    EMPTY_COMPENSATION,
-                    False,
+    fee_collector = network.manifest_named("fee_collector")
+    set_epoch_to_forward(fee_collector)
+
+    contracts = {
+        "fee_collector": fee_collector,
+        "hooker": network.manifest_named("hooker"),
+        "crvusd": network.manifest_named("crvusd"),
+        "fee_distributor": network.manifest_named("fee_distributor"),
+    }
+    contracts["fee_allocator"] = FeeAllocator.deploy(
+        contracts["fee_distributor"], fee_collector, admin
+    )
+    add_fee_allocator_to_hooker(
+        contracts["hooker"], contracts["crvusd"], contracts["fee_allocator"]
+    )
+    return contracts
+
+
+def lock_vecrv_on_main(network, admin):
+    crv_token = network.manifest_named("crv_token")
+    vecrv = network.manifest_named("vecrv")
+    amount = int(10_000 * 1e18)
+    with boa.env.prank(vecrv.address):
+        crv_token.transfer(admin, amount)
+    with boa.env.prank(admin.address):
+        crv_token.approve(vecrv, amount)
+        # from the fork block rather than the wall clock, so that the slots
+        # read are the same on every run, see script/rpc_cassette.py
+        vecrv.create_lock(amount, boa.env.evm.patch.timestamp + WEEK * 52 * 4)
+
+
+def pytest_terminal_summary(terminalreporter):
+    # fuzzing throughput, recorded by tests/test_fuzz.py
+    for report in terminalreporter.stats.get("passed", []):
+        for name, value in report.user_properties:
+            if name == "examples_per_second":
+                terminalreporter.write_line(
+                    f"{report.nodeid}: {value:.1f} examples/s"
                 )
-            ],
-            [(0, 0, b"")],
-        )
@@ -1,6 +1,8 @@
 import boa
 import pytest
 
+from script.utils.receivers import pack_receivers
+
 
 def test_access_control_set_receiver(fee_allocator, admin, fee_receiver):
     random_address = boa.env.generate_address()
@@ -62,3 +64,122 @@ def test_access_control_distribute_fees(fee_allocator, actual_crvusd, admin):
     with boa.env.prank(random_address):
         with pytest.raises(Exception):
             fee_allocator.distribute_fees()
+
+
+def test_access_control_distribute_fees_direct(fee_allocator):
+    random_address = boa.env.generate_address()
+
+    with boa.env.prank(random_address):
+        with pytest.raises(Exception):
+            fee_allocator.distribute_fees_direct()
+
+
+def test_access_control_accrue_fees(fee_allocator):
+    random_address = boa.env.generate_address()
+
+    with boa.env.prank(random_address):
+        with pytest.raises(Exception):
+            fee_allocator.accrue_fees()
+
+
+def test_access_control_set_merkle_root(fee_allocator, admin):
+    random_address = boa.env.generate_address()
+    root = b"\x01" * 32
+
+    with boa.env.prank(random_address):
+        with pytest.raises(Exception):
+            fee_allocator.set_merkle_root(root, 1000)
+
+    with boa.env.prank(admin.address):
+        fee_allocator.set_merkle_root(root, 1000)
+        assert fee_allocator.merkle_root() == root
+
+
+def test_access_control_distribute_fees_batch(fee_allocator, actual_crvusd):
+    random_address = boa.env.generate_address()
+
+    with boa.env.prank(random_address):
+        with pytest.raises(Exception):
+            fee_allocator.distribute_fees_batch([actual_crvusd])
+
+
+def test_access_control_set_token_distributor(fee_allocator, admin):
+    random_address = boa.env.generate_address()
+    token = boa.env.generate_address()
+    distributor = boa.env.generate_address()
+
+    with boa.env.prank(random_address):
+        with pytest.raises(Exception):
+            fee_allocator.set_token_distributor(token, distributor)
+
+    with boa.env.prank(admin.address):
+        fee_allocator.set_token_distributor(token, distributor)
+        assert fee_allocator.token_distributors(token) == distributor
+
+
+def test_access_control_set_payout_policy(fee_allocator, admin, fee_receiver):
+    random_address = boa.env.generate_address()
+    with boa.env.prank(admin.address):
+        fee_allocator.set_receiver(fee_receiver, 1000)
+
+    with boa.env.prank(random_address):
+        with pytest.raises(Exception):
+            fee_allocator.set_payout_policy(fee_receiver, 10**18, 4)
+
+    with boa.env.prank(admin.address):
+        fee_allocator.set_payout_policy(fee_receiver, 10**18, 4)
+        assert fee_allocator.payout_policy(fee_receiver)[:2] == (10**18, 4)
+
+
+def test_access_control_set_log_payouts(fee_allocator, admin):
+    random_address = boa.env.generate_address()
+
+    with boa.env.prank(random_address):
+        with pytest.raises(Exception):
+            fee_allocator.set_log_payouts(True)
+
+    with boa.env.prank(admin.address):
+        fee_allocator.set_log_payouts(True)
+        assert fee_allocator.log_payouts()
+
+
+def test_access_control_replace_receivers(fee_allocator, admin, fee_receiver):
+    random_address = boa.env.generate_address()
+
+    with boa.env.prank(random_address):
+        with pytest.raises(Exception):
+            fee_allocator.replace_receivers([(fee_receiver, 1000)])
+
+    with boa.env.prank(admin.address):
+        fee_allocator.replace_receivers([(fee_receiver, 1000)])
+        assert fee_allocator.receiver_weights(fee_receiver) == 1000
+
+
+def test_access_control_set_receivers_packed(
+    fee_allocator, admin, fee_receiver
+):
+    random_address = boa.env.generate_address()
+    packed_configs = pack_receivers([(fee_receiver, 1000)])
+
+    with boa.env.prank(random_address):
+        with pytest.raises(Exception):
+            fee_allocator.set_receivers_packed(packed_configs)
+
+    with boa.env.prank(admin.address):
+        fee_allocator.set_receivers_packed(packed_configs)
+        assert fee_allocator.receiver_weights(fee_receiver) == 1000
+
+
+def test_access_control_remove_receivers(fee_allocator, admin, fee_receiver):
+    random_address = boa.env.generate_address()
+
+    with boa.env.prank(admin.address):
+        fee_allocator.set_receiver(fee_receiver, 1000)
+
+    with boa.env.prank(random_address):
+        with pytest.raises(Exception):
+            fee_allocator.remove_receivers([fee_receiver])
+
+    with boa.env.prank(admin.address):
+        fee_allocator.remove_receivers([fee_receiver])
+        assert fee_allocator.receiver_weights(fee_receiver) == 0
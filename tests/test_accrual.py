@@ -0,0 +1,187 @@
+import boa
+import pytest
+
+AMOUNT_TO_ACCRUE = int(100_000 * 1e18)
+PRECISION = 10**18
+
+
+def accrued(weight: int, amounts: list[int]) -> int:
+    # mirrors the fees per weight accumulator of FeeAllocator
+    return weight * sum(a * PRECISION // 10000 for a in amounts) // PRECISION
+
+
+@pytest.fixture
+def accrue(fee_allocator, actual_hooker, actual_crvusd, mint_to_receiver):
+    def inner(amount: int) -> int:
+        mint_to_receiver(actual_hooker.address, amount)
+        balance = actual_crvusd.balanceOf(actual_hooker.address)
+        with boa.env.prank(actual_hooker.address):
+            fee_allocator.accrue_fees()
+        return balance
+
+    return inner
+
+
+def test_accrue_and_claim(
+    fee_allocator,
+    actual_crvusd,
+    actual_fee_distributor,
+    admin,
+    multiple_fee_receivers,
+    accrue,
+):
+    receiver_weights = [500, 1000, 1500, 2000]
+    receivers_to_use = multiple_fee_receivers[: len(receiver_weights)]
+    with boa.env.prank(admin.address):
+        fee_allocator.set_multiple_receivers(
+            list(zip(receivers_to_use, receiver_weights))
+        )
+
+    pre_distribution_distributor_balance = actual_crvusd.balanceOf(
+        actual_fee_distributor
+    )
+    amount = accrue(AMOUNT_TO_ACCRUE)
+
+    reserved = fee_allocator.reserved_balance()
+    assert actual_crvusd.balanceOf(fee_allocator.address) == reserved
+    assert actual_crvusd.balanceOf(
+        actual_fee_distributor
+    ) == pre_distribution_distributor_balance + (amount - reserved)
+
+    for receiver, weight in zip(receivers_to_use, receiver_weights):
+        expected = amount * weight // 10000
+        assert fee_allocator.claimable(receiver) == expected
+        with boa.env.prank(receiver):
+            assert fee_allocator.claim() == expected
+        assert actual_crvusd.balanceOf(receiver) == expected
+        assert fee_allocator.claimable(receiver) == 0
+
+    assert fee_allocator.reserved_balance() <= len(receiver_weights)
+    assert (
+        actual_crvusd.balanceOf(fee_allocator.address)
+        == fee_allocator.reserved_balance()
+    )
+
+
+def test_claim_accumulates_over_epochs(
+    fee_allocator, actual_crvusd, admin, fee_receiver, accrue
+):
+    with boa.env.prank(admin.address):
+        fee_allocator.set_receiver(fee_receiver, 1000)
+
+    amounts = [accrue(AMOUNT_TO_ACCRUE * (i + 1)) for i in range(3)]
+
+    expected = accrued(1000, amounts)
+    assert fee_allocator.claim(fee_receiver) == expected
+    assert actual_crvusd.balanceOf(fee_receiver) == expected
+
+
+def test_weight_change_settles_accrued_fees(
+    fee_allocator, admin, multiple_fee_receivers, accrue
+):
+    receiver, other_receiver = multiple_fee_receivers[:2]
+    with boa.env.prank(admin.address):
+        fee_allocator.set_receiver(receiver, 1000)
+
+    first_amount = accrue(AMOUNT_TO_ACCRUE)
+
+    with boa.env.prank(admin.address):
+        fee_allocator.set_receiver(receiver, 3000)
+        fee_allocator.set_receiver(other_receiver, 2000)
+
+    second_amount = accrue(AMOUNT_TO_ACCRUE)
+
+    with boa.env.prank(admin.address):
+        fee_allocator.remove_receiver(receiver)
+
+    third_amount = accrue(AMOUNT_TO_ACCRUE)
+
+    assert fee_allocator.claimable(receiver) == accrued(
+        1000, [first_amount]
+    ) + accrued(3000, [second_amount])
+    assert fee_allocator.claimable(other_receiver) == accrued(
+        2000, [second_amount, third_amount]
+    )
+
+    with boa.env.prank(receiver):
+        fee_allocator.claim()
+    with boa.env.prank(other_receiver):
+        fee_allocator.claim()
+    assert fee_allocator.claimable(receiver) == 0
+    assert fee_allocator.claimable(other_receiver) == 0
+
+
+def test_new_receiver_does_not_claim_past_fees(
+    fee_allocator, admin, multiple_fee_receivers, accrue
+):
+    receiver, late_receiver = multiple_fee_receivers[:2]
+    with boa.env.prank(admin.address):
+        fee_allocator.set_receiver(receiver, 1000)
+
+    accrue(AMOUNT_TO_ACCRUE)
+
+    with boa.env.prank(admin.address):
+        fee_allocator.set_receiver(late_receiver, 1000)
+
+    assert fee_allocator.claimable(late_receiver) == 0
+    with boa.env.prank(late_receiver):
+        assert fee_allocator.claim() == 0
+
+
+def test_distribute_fees_keeps_reserved_balance(
+    fee_allocator,
+    actual_hooker,
+    actual_crvusd,
+    admin,
+    fee_receiver,
+    mint_to_receiver,
+    accrue,
+):
+    with boa.env.prank(admin.address):
+        fee_allocator.set_receiver(fee_receiver, 2000)
+
+    amount = accrue(AMOUNT_TO_ACCRUE)
+    reserved = fee_allocator.reserved_balance()
+
+    mint_to_receiver(actual_hooker.address, AMOUNT_TO_ACCRUE)
+    pushed_amount = actual_crvusd.balanceOf(actual_hooker.address)
+    with boa.env.prank(actual_hooker.address):
+        fee_allocator.distribute_fees()
+
+    assert actual_crvusd.balanceOf(fee_allocator.address) == reserved
+    assert actual_crvusd.balanceOf(fee_receiver) == (
+        pushed_amount * 2000 // 10000
+    )
+
+    with boa.env.prank(fee_receiver):
+        fee_allocator.claim()
+    assert actual_crvusd.balanceOf(fee_receiver) == (
+        pushed_amount * 2000 // 10000 + amount * 2000 // 10000
+    )
+
+
+def test_accrue_fees_gas_is_flat(
+    fee_allocator, actual_hooker, admin, mint_to_receiver, measure_gas
+):
+    gas_used = []
+    for n_receivers in (1, 10):
+        with boa.env.anchor():
+            with boa.env.prank(admin.address):
+                for _ in range(n_receivers):
+                    fee_allocator.set_receiver(boa.env.generate_address(), 100)
+            mint_to_receiver(actual_hooker.address, AMOUNT_TO_ACCRUE)
+            gas_used.append(
+                measure_gas(
+                    fee_allocator,
+                    fee_allocator.accrue_fees,
+                    actual_hooker.address,
+                )
+            )
+
+    assert gas_used[0] == gas_used[1]
+
+
+def test_accrue_fees_no_balance(fee_allocator, actual_hooker):
+    with boa.env.prank(actual_hooker.address):
+        with pytest.raises(Exception):
+            fee_allocator.accrue_fees()
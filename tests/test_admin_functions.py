@@ -91,6 +91,32 @@ def test_remove_middle_receiver(fee_allocator, admin, multiple_fee_receivers):
         assert fee_allocator.receivers(1) == receivers[2]
 
 
+def test_remove_middle_receiver_moves_last_entry(
+    fee_allocator, admin, multiple_fee_receivers
+):
+    receivers = multiple_fee_receivers[:3]
+    weights = [1000, 1500, 2000]
+
+    with boa.env.prank(admin.address):
+        for i in range(3):
+            fee_allocator.set_receiver(receivers[i], weights[i])
+
+        fee_allocator.remove_receiver(receivers[0])
+        assert fee_allocator.receivers(0) == receivers[2]
+        assert fee_allocator.receiver_weights(receivers[2]) == weights[2]
+
+        # the moved receiver can still be updated and removed in place
+        fee_allocator.set_receiver(receivers[2], 500)
+        assert fee_allocator.receiver_weights(receivers[2]) == 500
+        assert fee_allocator.receivers(0) == receivers[2]
+        assert fee_allocator.total_weight() == weights[1] + 500
+
+        fee_allocator.remove_receiver(receivers[2])
+        assert fee_allocator.n_receivers() == 1
+        assert fee_allocator.receivers(0) == receivers[1]
+        assert fee_allocator.receiver_weights(receivers[1]) == weights[1]
+
+
 def test_remove_last_receiver(fee_allocator, admin, multiple_fee_receivers):
     receivers = multiple_fee_receivers[:3]
     weights = [1000, 1500, 2000]
@@ -0,0 +1,189 @@
+import boa
+import pytest
+
+from script.mocks import MockERC20, MockFeeDistributor
+from script.utils.hooker import EMPTY_COMPENSATION, FEE_COLLECTOR_ADMIN
+
+AMOUNT_TO_DISTRIBUTE = int(100_000 * 1e18)
+N_EXTRA_TOKENS = 3
+
+
+@pytest.fixture
+def extra_tokens(fee_allocator, actual_hooker, admin):
+    tokens = [MockERC20.deploy() for _ in range(N_EXTRA_TOKENS)]
+    distributors = [MockFeeDistributor.deploy(token) for token in tokens]
+
+    with boa.env.prank(admin.address):
+        for token, distributor in zip(tokens, distributors):
+            fee_allocator.set_token_distributor(token, distributor)
+
+    with boa.env.prank(FEE_COLLECTOR_ADMIN):
+        actual_hooker.one_time_hooks(
+            [
+                (
+                    token.address,
+                    token.approve.prepare_calldata(
+                        fee_allocator.address, 2**256 - 1
+                    ),
+                    EMPTY_COMPENSATION,
+                    False,
+                )
+                for token in tokens
+            ],
+            [(i, 0, b"") for i in range(len(tokens))],
+        )
+    return list(zip(tokens, distributors))
+
+
+@pytest.fixture
+def batch_receivers(fee_allocator, admin, multiple_fee_receivers):
+    receiver_weights = [500, 1000, 1500, 2000]
+    configs = list(zip(multiple_fee_receivers, receiver_weights))
+    with boa.env.prank(admin.address):
+        fee_allocator.set_multiple_receivers(configs)
+    return configs
+
+
+def test_distribute_fees_batch(
+    fee_allocator,
+    actual_hooker,
+    actual_crvusd,
+    actual_fee_distributor,
+    mint_to_receiver,
+    extra_tokens,
+    batch_receivers,
+):
+    mint_to_receiver(actual_hooker.address, AMOUNT_TO_DISTRIBUTE)
+    amounts = {
+        actual_crvusd.address: actual_crvusd.balanceOf(actual_hooker.address)
+    }
+    for i, (token, _) in enumerate(extra_tokens):
+        token.mint(actual_hooker.address, AMOUNT_TO_DISTRIBUTE * (i + 2))
+        amounts[token.address] = AMOUNT_TO_DISTRIBUTE * (i + 2)
+
+    pre_distribution_distributor_balance = actual_crvusd.balanceOf(
+        actual_fee_distributor
+    )
+    pre_distribution_receiver_balances = [
+        actual_crvusd.balanceOf(receiver) for receiver, _ in batch_receivers
+    ]
+
+    with boa.env.prank(actual_hooker.address):
+        fee_allocator.distribute_fees_batch(
+            [actual_crvusd] + [token for token, _ in extra_tokens]
+        )
+
+    crvusd_amount = amounts[actual_crvusd.address]
+    crvusd_to_receivers = 0
+    for i, (receiver, weight) in enumerate(batch_receivers):
+        receiver_amount = crvusd_amount * weight // 10000
+        crvusd_to_receivers += receiver_amount
+        assert (
+            actual_crvusd.balanceOf(receiver)
+            == pre_distribution_receiver_balances[i] + receiver_amount
+        )
+    assert actual_crvusd.balanceOf(actual_fee_distributor) == (
+        pre_distribution_distributor_balance
+        + crvusd_amount
+        - crvusd_to_receivers
+    )
+
+    for token, distributor in extra_tokens:
+        amount = amounts[token.address]
+        to_receivers = 0
+        for receiver, weight in batch_receivers:
+            receiver_amount = amount * weight // 10000
+            to_receivers += receiver_amount
+            assert token.balanceOf(receiver) == receiver_amount
+        assert token.balanceOf(distributor) == amount - to_receivers
+        assert token.balanceOf(actual_hooker.address) == 0
+        assert token.balanceOf(fee_allocator.address) == 0
+
+
+def test_distribute_fees_batch_skips_empty_tokens(
+    fee_allocator, actual_hooker, extra_tokens, batch_receivers
+):
+    (token, distributor), (empty_token, _) = extra_tokens[:2]
+    token.mint(actual_hooker.address, AMOUNT_TO_DISTRIBUTE)
+
+    with boa.env.prank(actual_hooker.address):
+        fee_allocator.distribute_fees_batch([empty_token, token])
+
+    assert token.balanceOf(actual_hooker.address) == 0
+    assert token.balanceOf(distributor) > 0
+
+
+def test_distribute_fees_batch_approves_once(
+    fee_allocator, actual_hooker, extra_tokens, batch_receivers
+):
+    token, distributor = extra_tokens[0]
+    assert token.allowance(fee_allocator.address, distributor) == 0
+
+    n_approvals = []
+    for _ in range(2):
+        token.mint(actual_hooker.address, AMOUNT_TO_DISTRIBUTE)
+        with boa.env.prank(actual_hooker.address):
+            fee_allocator.distribute_fees_batch([token])
+        logs = fee_allocator.get_logs()
+        n_approvals.append(sum("Approval" in repr(log) for log in logs))
+        assert token.allowance(fee_allocator.address, distributor) == (
+            2**256 - 1
+        )
+
+    assert n_approvals == [1, 0]
+
+
+def test_distribute_fees_batch_without_distributor(
+    fee_allocator, actual_hooker
+):
+    token = MockERC20.deploy()
+    token.mint(actual_hooker.address, AMOUNT_TO_DISTRIBUTE)
+    with boa.env.prank(actual_hooker.address):
+        with pytest.raises(Exception):
+            fee_allocator.distribute_fees_batch([token])
+
+
+def test_set_token_distributor_rejects_fee_token(
+    fee_allocator, admin, actual_crvusd
+):
+    with boa.env.prank(admin.address):
+        with pytest.raises(Exception):
+            fee_allocator.set_token_distributor(
+                actual_crvusd, boa.env.generate_address()
+            )
+
+
+def test_distribute_fees_batch_gas(
+    fee_allocator,
+    actual_hooker,
+    actual_crvusd,
+    mint_to_receiver,
+    extra_tokens,
+    batch_receivers,
+    measure_gas,
+):
+    tokens = [actual_crvusd] + [token for token, _ in extra_tokens]
+
+    def fund():
+        mint_to_receiver(actual_hooker.address, AMOUNT_TO_DISTRIBUTE)
+        for token, _ in extra_tokens:
+            token.mint(actual_hooker.address, AMOUNT_TO_DISTRIBUTE)
+
+    def distribute(tokens):
+        return measure_gas(
+            fee_allocator,
+            lambda: fee_allocator.distribute_fees_batch(tokens),
+            actual_hooker.address,
+        )
+
+    # approve every distributor beforehand so that both runs start alike
+    fund()
+    with boa.env.prank(actual_hooker.address):
+        fee_allocator.distribute_fees_batch(tokens)
+
+    fund()
+    with boa.env.anchor():
+        separate_gas = sum(distribute([token]) for token in tokens)
+    batch_gas = distribute(tokens)
+
+    assert batch_gas < separate_gas
@@ -0,0 +1,45 @@
+import csv
+import io
+
+from script.benchmark_compiler import (
+    MAX_CODE_SIZE,
+    MAX_RECEIVERS,
+    MODES,
+    benchmark,
+)
+from script.utils.report import write_csv
+
+
+def test_benchmark_compiler():
+    rows = benchmark(["codesize"])
+    assert [row.n_receivers for row in rows] == list(range(MAX_RECEIVERS + 1))
+
+    assert rows[0].set_receiver is None and rows[0].remove_receiver is None
+    for previous, row in zip(rows, rows[1:]):
+        assert row.distribute_fees > previous.distribute_fees
+        assert row.deploy_gas == rows[0].deploy_gas
+
+    file = io.StringIO()
+    write_csv(rows, file)
+    file.seek(0)
+    table = list(csv.DictReader(file))
+    assert len(table) == len(rows)
+    assert table[0]["mode"] == "codesize"
+    assert int(table[-1]["distribute_fees"]) == rows[-1].distribute_fees
+
+
+def test_benchmark_compiler_every_mode():
+    # a build the compiler fails on or that can't be deployed is reported
+    # in its rows, it doesn't stop the run
+    rows = benchmark(list(MODES))
+    assert {row.mode for row in rows} == set(MODES)
+
+    for row in rows:
+        if row.failure is not None:
+            assert row.runtime_size is None
+        elif not row.deployable:
+            assert row.runtime_size > MAX_CODE_SIZE
+            assert row.deploy_gas is None and row.distribute_fees is None
+        else:
+            assert row.runtime_size <= MAX_CODE_SIZE
+            assert row.distribute_fees > 0
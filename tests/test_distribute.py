@@ -1,7 +1,9 @@
 import boa
 import pytest
+from eth_utils import to_checksum_address
 
-from tests.conftest import FEE_COLLECTOR_ADMIN
+from script.utils.fee_collector import WEEK
+from script.utils.hooker import FEE_COLLECTOR_ADMIN
 
 AMOUNT_TO_DISTRIBUTE = int(100_000 * 1e18)
 
@@ -121,11 +123,6 @@ def test_distribute_multiple_receivers(
     multiple_fee_receivers,
     mint_to_receiver,
 ):
-    # Reset any existing receivers
-    with boa.env.prank(admin.address):
-        for receiver in range(fee_allocator.n_receivers()):
-            fee_allocator.remove_receiver(receiver)
-
     receiver_weights = [500, 1000, 1500, 2000]  # Total: 5000 bps (50%)
     receivers_to_use = multiple_fee_receivers[: len(receiver_weights)]
 
@@ -196,3 +193,254 @@ def test_distribute_fees_no_balance(
     with boa.env.prank(actual_hooker.address):
         with pytest.raises(Exception):
             fee_allocator.distribute_fees()
+
+
+def test_distribute_fees_direct(
+    fee_allocator,
+    actual_hooker,
+    actual_crvusd,
+    actual_fee_distributor,
+    admin,
+    multiple_fee_receivers,
+    mint_to_receiver,
+):
+    receiver_weights = [500, 1000, 1500, 2000]
+    receivers_to_use = multiple_fee_receivers[: len(receiver_weights)]
+
+    with boa.env.prank(admin.address):
+        fee_allocator.set_multiple_receivers(
+            list(zip(receivers_to_use, receiver_weights))
+        )
+
+    mint_to_receiver(actual_hooker.address, AMOUNT_TO_DISTRIBUTE)
+    amount = actual_crvusd.balanceOf(actual_hooker.address)
+    pre_distribution_distributor_balance = actual_crvusd.balanceOf(
+        actual_fee_distributor
+    )
+    pre_distribution_receiver_balances = [
+        actual_crvusd.balanceOf(receiver) for receiver in receivers_to_use
+    ]
+
+    with boa.env.prank(actual_hooker.address):
+        fee_allocator.distribute_fees_direct()
+
+    total_to_receivers = 0
+    for i, weight in enumerate(receiver_weights):
+        receiver_amount = amount * weight // 10000
+        total_to_receivers += receiver_amount
+        assert (
+            actual_crvusd.balanceOf(receivers_to_use[i])
+            == pre_distribution_receiver_balances[i] + receiver_amount
+        )
+
+    assert actual_crvusd.balanceOf(actual_hooker.address) == 0
+    assert actual_crvusd.balanceOf(fee_allocator.address) == 0
+    assert actual_crvusd.balanceOf(
+        actual_fee_distributor
+    ) == pre_distribution_distributor_balance + (amount - total_to_receivers)
+
+
+def test_distribute_fees_direct_gas(
+    fee_allocator,
+    actual_hooker,
+    admin,
+    multiple_fee_receivers,
+    mint_to_receiver,
+    measure_gas,
+):
+    with boa.env.prank(admin.address):
+        fee_allocator.set_multiple_receivers(
+            [(receiver, 500) for receiver in multiple_fee_receivers[:4]]
+        )
+
+    gas_used = {}
+    for distribute in (
+        fee_allocator.distribute_fees,
+        fee_allocator.distribute_fees_direct,
+    ):
+        with boa.env.anchor():
+            mint_to_receiver(actual_hooker.address, AMOUNT_TO_DISTRIBUTE)
+            gas_used[distribute.func_t.name] = measure_gas(
+                fee_allocator, distribute, actual_hooker.address
+            )
+
+    assert gas_used["distribute_fees_direct"] < gas_used["distribute_fees"]
+
+
+def test_distribute_fees_direct_no_balance(fee_allocator, actual_hooker):
+    with boa.env.prank(actual_hooker.address):
+        with pytest.raises(Exception):
+            fee_allocator.distribute_fees_direct()
+
+
+def test_sync_hooker(
+    fee_allocator,
+    actual_fee_collector,
+    actual_hooker,
+    actual_crvusd,
+    fee_receiver,
+    admin,
+    mint_to_receiver,
+):
+    if not hasattr(actual_fee_collector, "_storage"):
+        pytest.skip("the hooker is only swapped on the fee collector mock")
+    with boa.env.prank(admin.address):
+        fee_allocator.set_receiver(fee_receiver, 1000)
+
+    new_hooker = boa.env.generate_address()
+    boa.env.set_storage(
+        actual_fee_collector.address,
+        actual_fee_collector._storage.hooker.slot,
+        int(new_hooker, 16),
+    )
+    mint_to_receiver(new_hooker, AMOUNT_TO_DISTRIBUTE)
+    with boa.env.prank(new_hooker):
+        actual_crvusd.approve(fee_allocator, 2**256 - 1)
+
+    cached_calls = [
+        fee_allocator.distribute_fees_direct,
+        lambda: fee_allocator.distribute_fees_batch([actual_crvusd]),
+        fee_allocator.accrue_fees,
+        lambda: fee_allocator.distribute_fees_paginated(10),
+    ]
+    # every hooker-only entry point but distribute_fees checks the cached
+    # hooker, so the new hooker is rejected until the cache is refreshed
+    for call in cached_calls:
+        with boa.env.prank(new_hooker), boa.reverts("distribute: hooker only"):
+            call()
+    with boa.env.anchor(), boa.env.prank(new_hooker):
+        fee_allocator.distribute_fees()
+
+    with boa.env.prank(boa.env.generate_address()):
+        fee_allocator.sync_hooker()
+    (log,) = fee_allocator.get_logs()
+    assert (log.old_hooker, log.new_hooker) == (
+        actual_hooker.address,
+        new_hooker,
+    )
+    assert fee_allocator.hooker() == new_hooker
+
+    for call in cached_calls:
+        with boa.env.prank(actual_hooker.address):
+            with boa.reverts("distribute: hooker only"):
+                call()
+        with boa.env.anchor(), boa.env.prank(new_hooker):
+            call()
+
+
+def receivers_paid(fee_allocator) -> list[tuple[str, int]] | None:
+    logs = [
+        log
+        for log in fee_allocator.get_logs()
+        if type(log).__name__ == "ReceiversPaid"
+    ]
+    if not logs:
+        return None
+    (log,) = logs
+    return [
+        (to_checksum_address(f"{p & (2**160 - 1):040x}"), p >> 160)
+        for p in log.payouts
+    ]
+
+
+@pytest.mark.parametrize("direct", [False, True])
+def test_log_payouts(
+    fee_allocator,
+    actual_hooker,
+    actual_crvusd,
+    admin,
+    multiple_fee_receivers,
+    mint_to_receiver,
+    direct,
+):
+    receivers = multiple_fee_receivers[:4]
+    with boa.env.prank(admin.address):
+        fee_allocator.set_multiple_receivers([(r, 500) for r in receivers])
+        fee_allocator.set_payout_policy(receivers[1], 2**96 - 1, 0)
+
+    distribute = (
+        fee_allocator.distribute_fees_direct
+        if direct
+        else fee_allocator.distribute_fees
+    )
+    mint_to_receiver(actual_hooker.address, AMOUNT_TO_DISTRIBUTE)
+    with boa.env.prank(actual_hooker.address):
+        distribute()
+    assert receivers_paid(fee_allocator) is None
+
+    with boa.env.prank(admin.address):
+        fee_allocator.set_log_payouts(True)
+    mint_to_receiver(actual_hooker.address, AMOUNT_TO_DISTRIBUTE)
+    balances = [actual_crvusd.balanceOf(r) for r in receivers]
+    with boa.env.prank(actual_hooker.address):
+        distribute()
+
+    # the receiver whose share is carried over is left out
+    assert receivers_paid(fee_allocator) == [
+        (r, actual_crvusd.balanceOf(r) - balance)
+        for r, balance in zip(receivers, balances)
+        if r != receivers[1]
+    ]
+
+
+def test_log_payouts_too_large(
+    fee_allocator,
+    actual_hooker,
+    admin,
+    fee_receiver,
+    mint_to_receiver,
+):
+    amount = 2**95
+    with boa.env.prank(admin.address):
+        fee_allocator.set_receiver(fee_receiver, 5000)
+        fee_allocator.set_payout_policy(fee_receiver, 0, 1)
+        fee_allocator.set_log_payouts(True)
+
+    # every share fits in a log, but their carry-over does not
+    for _ in range(4):
+        mint_to_receiver(actual_hooker.address, amount)
+        with boa.env.prank(actual_hooker.address):
+            fee_allocator.distribute_fees()
+    assert fee_allocator.payout_policy(fee_receiver)[3] == 2**96
+
+    boa.env.time_travel(seconds=WEEK)
+    mint_to_receiver(actual_hooker.address, amount)
+    with boa.env.prank(actual_hooker.address):
+        with boa.reverts("distribute: too large to log"):
+            fee_allocator.distribute_fees()
+
+    with boa.env.prank(admin.address):
+        fee_allocator.set_log_payouts(False)
+    with boa.env.prank(actual_hooker.address):
+        fee_allocator.distribute_fees()
+    assert fee_allocator.payout_policy(fee_receiver)[3] == 0
+
+
+def test_log_payouts_gas(
+    fee_allocator,
+    actual_hooker,
+    admin,
+    multiple_fee_receivers,
+    mint_to_receiver,
+    measure_gas,
+):
+    with boa.env.prank(admin.address):
+        fee_allocator.set_multiple_receivers(
+            [(receiver, 500) for receiver in multiple_fee_receivers]
+        )
+
+    gas_used = {}
+    for enabled in (False, True):
+        with boa.env.anchor():
+            with boa.env.prank(admin.address):
+                fee_allocator.set_log_payouts(enabled)
+            mint_to_receiver(actual_hooker.address, AMOUNT_TO_DISTRIBUTE)
+            gas_used[enabled] = measure_gas(
+                fee_allocator,
+                fee_allocator.distribute_fees,
+                actual_hooker.address,
+            )
+
+    # a single log for all receivers, about one word of log data each
+    n_receivers = len(multiple_fee_receivers)
+    assert gas_used[True] - gas_used[False] < 1500 + 500 * n_receivers
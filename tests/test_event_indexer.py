@@ -0,0 +1,207 @@
+import boa
+import pytest
+from boa.rpc import RPCError
+
+from script.event_indexer import WEEK, EventIndexer
+from script.utils.local_chain import LocalChainRPC, record_chain
+
+AMOUNT_TO_DISTRIBUTE = int(100_000 * 1e18)
+
+
+class FlakyRPC(LocalChainRPC):
+    # fails the first `failures` batched requests, as a node under load would
+    def __init__(self, chain, failures: int, **kwargs):
+        super().__init__(chain, **kwargs)
+        self.failures = failures
+        self.requests = 0
+
+    def fetch_multi(self, payloads):
+        self.requests += 1
+        if self.failures > 0:
+            self.failures -= 1
+            raise RPCError("rate limited", 429)
+        return super().fetch_multi(payloads)
+
+
+@pytest.fixture
+def history(
+    fee_allocator,
+    admin,
+    actual_fee_collector,
+    actual_crvusd,
+    mint_to_receiver,
+    multiple_fee_receivers,
+):
+    """
+    A few weeks of a FeeAllocator on a recorded local chain, with the
+    receivers it had after each step, by block.
+    """
+    r = [receiver.lower() for receiver in multiple_fee_receivers[:4]]
+    keeper = boa.env.generate_address()
+    checkpoints: list[tuple[int, dict[str, int]]] = []
+
+    def step(call=None):
+        # one block a step, so that every checkpoint has its own block
+        boa.env.time_travel(blocks=1)
+        if call is not None:
+            with boa.env.prank(admin.address):
+                call()
+        receivers, _, _ = fee_allocator.get_receivers()
+        checkpoints.append(
+            (
+                boa.env.evm.patch.block_number,
+                {receiver.lower(): weight for receiver, weight in receivers},
+            )
+        )
+
+    def forward():
+        boa.env.time_travel(seconds=WEEK)
+        mint_to_receiver(actual_fee_collector.address, AMOUNT_TO_DISTRIBUTE)
+        with boa.env.prank(keeper):
+            actual_fee_collector.forward([(0, 0, b"")], keeper)
+        step()
+
+    with record_chain() as chain:
+        start = boa.env.evm.patch.block_number + 1
+        before = {
+            receiver: actual_crvusd.balanceOf(receiver) for receiver in r
+        }
+        step(
+            lambda: fee_allocator.set_multiple_receivers(
+                [(r[0], 1000), (r[1], 500), (r[2], 250)]
+            )
+        )
+        # r[2]'s shares are carried over rather than paid
+        step(lambda: fee_allocator.set_payout_policy(r[2], 2**96 - 1, 0))
+        forward()
+        step(lambda: fee_allocator.set_receiver(r[1], 1500))
+        step(lambda: fee_allocator.remove_receiver(r[0]))
+        forward()
+        step(
+            lambda: fee_allocator.replace_receivers(
+                [(r[3], 2000), (r[2], 100)]
+            )
+        )
+        forward()
+        received = {
+            receiver: actual_crvusd.balanceOf(receiver) - before[receiver]
+            for receiver in r
+        }
+    return chain, start, checkpoints, received
+
+
+def make_indexer(rpc, fee_allocator, actual_crvusd, actual_hooker, **kwargs):
+    kwargs.setdefault("db_path", ":memory:")
+    return EventIndexer(
+        rpc,
+        fee_allocator.address,
+        actual_crvusd.address,
+        actual_hooker.address,
+        backoff=0,
+        **kwargs,
+    )
+
+
+def test_event_indexer(history, fee_allocator, actual_crvusd, actual_hooker):
+    chain, start, checkpoints, received = history
+    # a query over more than a chunk fails, as on providers that limit it
+    rpc = LocalChainRPC(chain, max_block_range=10_000)
+    indexer = make_indexer(
+        rpc,
+        fee_allocator,
+        actual_crvusd,
+        actual_hooker,
+        start_block=start,
+        chunk_size=10_000,
+        batch_size=4,
+    )
+    assert indexer.sync() == chain.head
+
+    for block, receivers in checkpoints:
+        assert indexer.receivers_at(block) == receivers
+    assert indexer.receivers_at(start - 1) == {}
+    for receiver, amount in received.items():
+        assert indexer.received(receiver) == amount
+    assert sum(received.values()) > 0
+
+    distributions = indexer.distributions()
+    assert len(distributions) == 3
+    # one forward a week, each in its epoch
+    epochs = [distribution.epoch for distribution in distributions]
+    assert epochs == list(range(epochs[0], epochs[0] + 3))
+    (second,) = indexer.distributions(epochs[1])
+    assert second == distributions[1]
+    # all that was neither paid to receivers nor carried over went to veCRV
+    assert distributions[0].carried_over > 0
+    paid = sum(
+        d.total_amount - d.distributor_share - d.carried_over
+        for d in distributions
+    )
+    assert paid == sum(received.values())
+
+    with pytest.raises(AssertionError, match="not indexed"):
+        indexer.receivers_at(chain.head + 1)
+
+
+def test_event_indexer_is_incremental(
+    history, fee_allocator, actual_crvusd, actual_hooker, tmp_path
+):
+    chain, start, checkpoints, received = history
+    rpc = LocalChainRPC(chain)
+    db_path = tmp_path / "events.db"
+    middle = checkpoints[3][0]
+
+    def indexer(**kwargs):
+        return make_indexer(
+            rpc,
+            fee_allocator,
+            actual_crvusd,
+            actual_hooker,
+            db_path=db_path,
+            start_block=start,
+            chunk_size=5_000,
+            **kwargs,
+        )
+
+    first = indexer()
+    assert first.sync(middle) == middle
+    assert first.receivers_at(middle) == checkpoints[3][1]
+    first.close()
+
+    # a later run picks up from the saved cursor, and a run with nothing new
+    # leaves the index as it is
+    second = indexer(confirmations=1)
+    assert second.cursor == middle
+    assert second.sync() == chain.head - 1
+    assert second.sync() == chain.head - 1
+    assert indexer().sync() == chain.head
+    for receiver, amount in received.items():
+        assert second.received(receiver) == amount
+    assert len(second.distributions()) == 3
+
+
+def test_event_indexer_retries(
+    history, fee_allocator, actual_crvusd, actual_hooker
+):
+    chain, start, checkpoints, received = history
+
+    rpc = FlakyRPC(chain, failures=3)
+    indexer = make_indexer(
+        rpc, fee_allocator, actual_crvusd, actual_hooker, start_block=start
+    )
+    assert indexer.sync() == chain.head
+    assert rpc.requests > 3
+    assert indexer.receivers_at(chain.head) == checkpoints[-1][1]
+
+    rpc = FlakyRPC(chain, failures=3)
+    indexer = make_indexer(
+        rpc,
+        fee_allocator,
+        actual_crvusd,
+        actual_hooker,
+        start_block=start,
+        retries=2,
+    )
+    with pytest.raises(RPCError, match="rate limited"):
+        indexer.sync()
+    assert indexer.cursor == start - 1
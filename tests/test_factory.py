@@ -0,0 +1,148 @@
+import boa
+import pytest
+
+from script.benchmark_compiler import MAX_CODE_SIZE
+from script.utils.hooker import EMPTY_COMPENSATION, FEE_COLLECTOR_ADMIN
+from script.utils.receivers import ZERO_ADDRESS
+from src import FeeAllocator, FeeAllocatorFactory
+
+AMOUNT_TO_DISTRIBUTE = int(100_000 * 1e18)
+
+
+@pytest.fixture(scope="module")
+def implementation(admin):
+    return FeeAllocator.deploy(ZERO_ADDRESS, ZERO_ADDRESS, admin)
+
+
+@pytest.fixture(scope="module")
+def factory(implementation):
+    return FeeAllocatorFactory.deploy(implementation)
+
+
+@pytest.fixture
+def clone(factory, actual_fee_distributor, actual_fee_collector, admin):
+    return FeeAllocator.at(
+        factory.deploy_fee_allocator(
+            actual_fee_distributor, actual_fee_collector, admin
+        )
+    )
+
+
+def test_deploy_fee_allocator(
+    factory,
+    clone,
+    actual_fee_distributor,
+    actual_fee_collector,
+    actual_crvusd,
+    admin,
+):
+    assert clone.owner() == admin.address
+    assert clone.fee_distributor() == actual_fee_distributor.address
+    assert clone.fee_collector() == actual_fee_collector.address
+    assert clone.fee_token() == actual_crvusd.address
+    assert clone.hooker() == actual_fee_collector.hooker()
+    assert actual_crvusd.allowance(clone, actual_fee_distributor) == 2**256 - 1
+
+    assert factory.n_fee_allocators() == 1
+    assert factory.fee_allocators(0) == clone.address
+    assert factory.is_fee_allocator(clone)
+
+
+def test_initialize_only_once(
+    clone,
+    implementation,
+    fee_allocator,
+    actual_fee_distributor,
+    actual_fee_collector,
+):
+    attacker = boa.env.generate_address()
+    for instance in (clone, implementation, fee_allocator):
+        with boa.env.prank(attacker):
+            with boa.reverts("initialize: already initialized"):
+                instance.initialize(
+                    actual_fee_distributor, actual_fee_collector, attacker
+                )
+
+
+def test_factory_rejects_configured_implementation(fee_allocator):
+    with boa.reverts("factory: implementation is configured"):
+        FeeAllocatorFactory.deploy(fee_allocator)
+
+
+def test_clone_distribute_fees(
+    clone,
+    actual_hooker,
+    actual_crvusd,
+    actual_fee_distributor,
+    admin,
+    fee_receiver,
+    mint_to_receiver,
+):
+    with boa.env.prank(FEE_COLLECTOR_ADMIN):
+        actual_hooker.one_time_hooks(
+            [
+                (
+                    actual_crvusd.address,
+                    actual_crvusd.approve.prepare_calldata(
+                        clone.address, 2**256 - 1
+                    ),
+                    EMPTY_COMPENSATION,
+                    False,
+                )
+            ],
+            [(0, 0, b"")],
+        )
+    with boa.env.prank(admin.address):
+        clone.set_receiver(fee_receiver, 1000)
+
+    mint_to_receiver(actual_hooker.address, AMOUNT_TO_DISTRIBUTE)
+    amount = actual_crvusd.balanceOf(actual_hooker.address)
+    distributor_balance = actual_crvusd.balanceOf(actual_fee_distributor)
+    with boa.env.prank(actual_hooker.address):
+        clone.distribute_fees()
+
+    assert actual_crvusd.balanceOf(fee_receiver) == amount * 1000 // 10000
+    assert actual_crvusd.balanceOf(
+        actual_fee_distributor
+    ) == distributor_balance + (amount - amount * 1000 // 10000)
+
+
+def test_clone_deploy_gas(
+    factory, actual_fee_distributor, actual_fee_collector, admin, measure_gas
+):
+    args = (actual_fee_distributor, actual_fee_collector, admin)
+    full_deploy_gas = measure_gas(None, lambda: FeeAllocator.deploy(*args))
+    clone_deploy_gas = measure_gas(
+        factory, lambda: factory.deploy_fee_allocator(*args)
+    )
+
+    assert clone_deploy_gas * 10 < full_deploy_gas
+
+
+def test_code_size():
+    # the factory, clones and direct deployments all need the implementation
+    # to stay under EIP-170 with the default build
+    assert len(FeeAllocator.compiler_data.bytecode_runtime) <= MAX_CODE_SIZE
+
+
+def test_storage_layout(implementation, clone, admin, fee_receiver):
+    layout = FeeAllocator.compiler_data.storage_layout["storage_layout"]
+    owner_slot = layout["ownable"]["owner"]["slot"]
+
+    slots = {}
+    for name, item in layout.items():
+        if name == "ownable":
+            continue
+        for slot in range(item["slot"], item["slot"] + item["n_slots"]):
+            assert slot not in slots, (name, slots.get(slot))
+            slots[slot] = name
+    # the owner guards the initialization of clones, no other variable uses it
+    assert owner_slot not in slots
+
+    # clones only write their own storage, never the implementation's
+    with boa.env.prank(admin.address):
+        clone.set_receiver(fee_receiver, 1000)
+        clone.transfer_ownership(fee_receiver)
+    assert implementation.owner() == admin.address
+    assert implementation.n_receivers() == 0
+    assert clone.owner() == fee_receiver
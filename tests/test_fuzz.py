@@ -1,19 +1,57 @@
+import time
+from pathlib import Path
+
 import boa
 import pytest
-from boa.test.strategies import strategy
-from hypothesis import settings
+from eth_utils import to_checksum_address
+from hypothesis import seed, settings
+from hypothesis import strategies as st
+from hypothesis.database import DirectoryBasedExampleDatabase
 from hypothesis.stateful import (
     RuleBasedStateMachine,
+    get_state_machine_test,
     invariant,
     rule,
-    run_state_machine_as_test,
 )
 
-from tests.conftest import ZERO_ADDRESS
+from script.fee_allocator_model import (
+    FEES_PER_WEIGHT_PRECISION,
+    FeeAllocatorModel,
+    ModelRevert,
+)
+from script.utils.fee_collector import WEEK
+from script.utils.receivers import MAX_BPS, WEIGHT_SHIFT, ZERO_ADDRESS
+
+N_SHARDS = 4
+MAX_EXAMPLES = 1000  # over all shards
+STEPS = 50
+# more than MAX_RECEIVERS, to reach the limit, and the same in every run so
+# that saved examples replay
+RECEIVERS = [
+    to_checksum_address("0x" + f"{i:02x}" * 20) for i in range(0x11, 0x1D)
+]
+ADDRESS_MASK = 2**160 - 1
+CARRY_MASK = 2**128 - 1
+# failing examples are replayed first by later runs
+DATABASE = DirectoryBasedExampleDatabase(
+    Path(__file__).parents[1] / ".hypothesis" / "examples"
+)
+
+weights = st.integers(min_value=0, max_value=MAX_BPS)
+amounts = st.integers(min_value=0, max_value=10**30)
+configs = st.lists(st.tuples(st.sampled_from(RECEIVERS), weights), max_size=10)
 
 
-@pytest.mark.fuzz
 class FeeAllocatorStateMachine(RuleBasedStateMachine):
+    """
+    Makes the same calls to the FeeAllocator and to the model of
+    script/fee_allocator_model.py, and checks reverts, events, storage and
+    crvUSD balances against each other after every step.
+
+    Every example starts from the session's prepared state: boa's pytest
+    plugin runs each hypothesis example in an EVM snapshot.
+    """
+
     def __init__(
         self,
         fee_allocator,
@@ -25,154 +63,249 @@ class FeeAllocatorStateMachine(RuleBasedStateMachine):
     ):
         super().__init__()
         self.fee_allocator = fee_allocator
-        self.admin = admin
+        self.admin = admin.address
         self.actual_crvusd = actual_crvusd
         self.actual_hooker = actual_hooker
-        self.actual_fee_distributor = actual_fee_distributor
         self.mint_to_receiver = mint_to_receiver
-        self.active_receivers = []
-        self.receiver_weights = {}
-        self.total_weight = 0
-
-    @rule(
-        receiver=strategy("address"),
-        weight=strategy("uint256", min_value=1, max_value=5000),
-    )
-    def set_receiver(self, receiver, weight):
-        if receiver == ZERO_ADDRESS:
-            return
-        if (
-            self.fee_allocator.n_receivers()
-            >= self.fee_allocator.MAX_RECEIVERS()
-        ):
-            return
-
-        with boa.env.prank(self.admin.address):
-            try:
-                old_weight = self.fee_allocator.receiver_weights(receiver)
-                new_total = self.total_weight - old_weight + weight
+        self.model = FeeAllocatorModel(
+            fee_allocator.address, actual_fee_distributor.address
+        )
+        for account in self._accounts():
+            self.model.balances[account] = actual_crvusd.balanceOf(account)
 
-                if new_total <= 5000:
-                    self.fee_allocator.set_receiver(receiver, weight)
+    def _accounts(self) -> list[str]:
+        return [self.model.address, self.model.fee_distributor, *RECEIVERS]
 
-                    if old_weight == 0:
-                        self.active_receivers.append(receiver)
+    def _events(self) -> list[tuple]:
+        return [
+            (type(log).__name__, *log[1:])
+            for log in self.fee_allocator.get_logs()
+            if log.address == self.fee_allocator.address
+        ]
 
-                    self.receiver_weights[receiver] = weight
-                    self.total_weight = new_total
-            except Exception as e:
-                print("Unexpected exception in set_receiver")
-                raise e
+    def _storage(self) -> dict:
+        # read directly, an order of magnitude faster than view calls
+        storage = self.fee_allocator._storage
+        packed_state = storage.packed_state.get()
+        return {
+            "packed_receivers": storage.packed_receivers.get(),
+            "receiver_indices": _nonzero(storage.receiver_indices.get()),
+            "total_weight": packed_state & (2**16 - 1),
+            "reserved_balance": packed_state >> 128,
+            "payout_policies": _nonzero(storage.payout_policies.get()),
+            "fees_per_weight": storage.fees_per_weight.get(),
+            "receiver_fees_per_weight": _nonzero(
+                storage.receiver_fees_per_weight.get()
+            ),
+            "settled_fees": _nonzero(storage.settled_fees.get()),
+            "distribution_round": tuple(
+                storage.distribution_round.get().values()
+            ),
+            "round_receivers": storage.round_receivers.get(),
+        }
 
-    @rule(index=strategy("uint256", min_value=0, max_value=9))
-    def remove_receiver(self, index):
-        if not self.active_receivers:
+    def _check(self, sender, call, model_call):
+        try:
+            expected = model_call()
+        except ModelRevert as e:
+            with boa.env.prank(sender), boa.reverts(str(e)):
+                call()
             return
+        with boa.env.prank(sender):
+            call()
+        assert self._events() == expected
 
-        if index >= len(self.active_receivers):
-            return
+    @rule(receiver=st.sampled_from(RECEIVERS + [ZERO_ADDRESS]), weight=weights)
+    def set_receiver(self, receiver, weight):
+        self._check(
+            self.admin,
+            lambda: self.fee_allocator.set_receiver(receiver, weight),
+            lambda: self.model.set_receiver(receiver, weight),
+        )
 
-        receiver = self.active_receivers[index]
+    @rule(configs=configs)
+    def set_multiple_receivers(self, configs):
+        self._check(
+            self.admin,
+            lambda: self.fee_allocator.set_multiple_receivers(configs),
+            lambda: self.model.set_multiple_receivers(configs),
+        )
 
-        with boa.env.prank(self.admin.address):
-            try:
-                weight = self.fee_allocator.receiver_weights(receiver)
-                self.fee_allocator.remove_receiver(receiver)
+    @rule(receiver=st.sampled_from(RECEIVERS))
+    def remove_receiver(self, receiver):
+        self._check(
+            self.admin,
+            lambda: self.fee_allocator.remove_receiver(receiver),
+            lambda: self.model.remove_receiver(receiver),
+        )
 
-                self.active_receivers.remove(receiver)
-                self.total_weight -= weight
-                self.receiver_weights[receiver] = 0
-            except Exception as e:
-                print("Unexpected exception in remove_receiver")
-                raise e
+    @rule(configs=configs)
+    def replace_receivers(self, configs):
+        self._check(
+            self.admin,
+            lambda: self.fee_allocator.replace_receivers(configs),
+            lambda: self.model.replace_receivers(configs),
+        )
 
     @rule(
-        amount=strategy("uint256", min_value=1000, max_value=1000000 * 10**18)
+        receiver=st.sampled_from(RECEIVERS),
+        min_payout=st.integers(min_value=0, max_value=10**24) | st.just(0),
+        interval=st.integers(min_value=0, max_value=4),
     )
+    def set_payout_policy(self, receiver, min_payout, interval):
+        self._check(
+            self.admin,
+            lambda: self.fee_allocator.set_payout_policy(
+                receiver, min_payout, interval
+            ),
+            lambda: self.model.set_payout_policy(
+                receiver, min_payout, interval, boa.env.timestamp
+            ),
+        )
+
+    @rule(amount=amounts)
     def distribute_fees(self, amount):
-        if amount == 0:
-            return
+        hooker = self.actual_hooker.address
+        self.mint_to_receiver(hooker, amount)
+        hooker_balance = self.actual_crvusd.balanceOf(hooker)
+        self._check(
+            hooker,
+            self.fee_allocator.distribute_fees,
+            lambda: self.model.distribute_fees(
+                hooker_balance, boa.env.timestamp
+            ),
+        )
 
-        with boa.env.prank(self.actual_hooker.address):
-            try:
-                self.mint_to_receiver(self.actual_hooker.address, amount)
-
-                pre_balances = {
-                    receiver: self.actual_crvusd.balanceOf(receiver)
-                    for receiver in self.active_receivers
-                }
-                pre_distributor_balance = self.actual_crvusd.balanceOf(
-                    self.actual_fee_distributor.address
-                )
-
-                self.fee_allocator.distribute_fees(self.actual_crvusd.address)
-
-                post_balances = {
-                    receiver: self.actual_crvusd.balanceOf(receiver)
-                    for receiver in self.active_receivers
-                }
-                post_distributor_balance = self.actual_crvusd.balanceOf(
-                    self.actual_fee_distributor.address
-                )
-
-                total_distributed = 0
-                for receiver in self.active_receivers:
-                    received = post_balances[receiver] - pre_balances[receiver]
-                    expected = (
-                        amount * self.receiver_weights[receiver] // 10000
-                    )
-                    assert abs(received - expected) <= len(
-                        self.active_receivers
-                    )
-                    total_distributed += received
-
-                distributor_received = (
-                    post_distributor_balance - pre_distributor_balance
-                )
-                assert (
-                    abs(total_distributed + distributor_received - amount)
-                    <= len(self.active_receivers) + 1
-                )
-
-            except Exception as e:
-                print("Unexpected exception in distribute_fees")
-                raise e
+    @rule(amount=amounts)
+    def accrue_fees(self, amount):
+        hooker = self.actual_hooker.address
+        self.mint_to_receiver(hooker, amount)
+        hooker_balance = self.actual_crvusd.balanceOf(hooker)
+        self._check(
+            hooker,
+            self.fee_allocator.accrue_fees,
+            lambda: self.model.accrue_fees(hooker_balance),
+        )
 
-    @invariant()
-    def total_weight_invariant(self):
-        assert self.fee_allocator.total_weight() == self.total_weight
-        assert self.fee_allocator.total_weight() <= 5000
+    @rule(receiver=st.sampled_from(RECEIVERS))
+    def claim(self, receiver):
+        self._check(
+            boa.env.generate_address(),
+            lambda: self.fee_allocator.claim(receiver),
+            lambda: self.model.claim(receiver),
+        )
+
+    @rule(
+        amount=amounts,
+        max_receivers=st.integers(min_value=0, max_value=4),
+        is_hooker=st.booleans(),
+    )
+    def distribute_fees_paginated(self, amount, max_receivers, is_hooker):
+        # a round is started by the hooker, and continued by anyone
+        hooker = self.actual_hooker.address
+        sender = hooker if is_hooker else boa.env.generate_address()
+        if is_hooker:
+            self.mint_to_receiver(hooker, amount)
+        hooker_balance = self.actual_crvusd.balanceOf(hooker)
+        self._check(
+            sender,
+            lambda: self.fee_allocator.distribute_fees_paginated(
+                max_receivers
+            ),
+            lambda: self.model.distribute_fees_paginated(
+                max_receivers, is_hooker, hooker_balance, boa.env.timestamp
+            ),
+        )
+
+    @rule(weeks=st.integers(min_value=1, max_value=3))
+    def time_travel(self, weeks):
+        boa.env.time_travel(seconds=weeks * WEEK)
 
     @invariant()
-    def receiver_count_invariant(self):
-        assert self.fee_allocator.n_receivers() == len(self.active_receivers)
-        assert self.fee_allocator.n_receivers() <= 10
+    def storage_matches_model(self):
+        assert self._storage() == self.model.storage()
 
     @invariant()
-    def distributor_weight_invariant(self):
-        assert (
-            self.fee_allocator.distributor_weight()
-            == 10000 - self.total_weight
+    def reserved_balance_conserved(self):
+        # everything the FeeAllocator holds is reserved, and covers what it
+        # owes: the rest of a round, carry-overs and accrued fees
+        storage = self._storage()
+        reserved = storage["reserved_balance"]
+        assert self.actual_crvusd.balanceOf(self.fee_allocator) == reserved
+
+        owed = storage["distribution_round"][1]
+        owed += sum(
+            policy & CARRY_MASK
+            for policy in storage["payout_policies"].values()
         )
+        owed += sum(storage["settled_fees"].values())
+        fees_per_weight = storage["fees_per_weight"]
+        for entry in storage["packed_receivers"]:
+            receiver = to_checksum_address(f"{entry & ADDRESS_MASK:040x}")
+            last_fees_per_weight = storage["receiver_fees_per_weight"].get(
+                receiver, 0
+            )
+            weight = (entry >> WEIGHT_SHIFT) & (2**16 - 1)
+            owed += (
+                weight
+                * (fees_per_weight - last_fees_per_weight)
+                // FEES_PER_WEIGHT_PRECISION
+            )
+        assert owed <= reserved
+
+    @invariant()
+    def balances_match_model(self):
+        for account in self._accounts():
+            assert self.actual_crvusd.balanceOf(account) == (
+                self.model.balances[account]
+            ), account
+
+
+def _nonzero(mapping: dict) -> dict:
+    # storage reads also list the keys that were written back to zero
+    return {key: value for key, value in mapping.items() if value != 0}
 
 
 @pytest.mark.fuzz
+@pytest.mark.parametrize("shard", range(N_SHARDS))
 def test_fee_allocator(
+    shard,
     fee_allocator,
     admin,
     actual_crvusd,
     actual_hooker,
     actual_fee_distributor,
     mint_to_receiver,
+    record_property,
 ):
-    run_state_machine_as_test(
-        lambda: FeeAllocatorStateMachine(
+    # each shard draws from a seed of its own, so that the shards cover
+    # different examples, and `mox test -k fuzz -n auto` runs them on
+    # different workers
+    n_examples = 0
+
+    def state_machine():
+        nonlocal n_examples
+        n_examples += 1
+        return FeeAllocatorStateMachine(
             fee_allocator,
             admin,
             actual_crvusd,
             actual_hooker,
             actual_fee_distributor,
             mint_to_receiver,
+        )
+
+    state_machine_test = get_state_machine_test(
+        state_machine,
+        settings=settings(
+            max_examples=MAX_EXAMPLES // N_SHARDS,
+            stateful_step_count=STEPS,
+            database=DATABASE,
+            deadline=None,
         ),
-        settings=settings(max_examples=1000, stateful_step_count=50),
+    )
+    start = time.perf_counter()
+    seed(shard)(state_machine_test)()
+    record_property(
+        "examples_per_second", n_examples / (time.perf_counter() - start)
     )
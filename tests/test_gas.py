@@ -0,0 +1,141 @@
+import json
+import os
+import warnings
+from pathlib import Path
+
+import boa
+import pytest
+from moccasin.config import get_config
+
+from script.utils.receivers import MAX_RECEIVERS
+from src import FeeAllocator
+
+# gas figures of the last accepted build, per network
+BASELINE = Path(__file__).parent / "gas_baseline.json"
+# UPDATE_GAS_BASELINE=1 records the figures measured instead of checking them
+UPDATE = os.environ.get("UPDATE_GAS_BASELINE") == "1"
+# a figure this far above its baseline fails
+GAS_TOLERANCE = 0.01
+
+AMOUNT_TO_DISTRIBUTE = int(100_000 * 1e18)
+# the same in every run, so that the figures do not depend on test order
+RECEIVERS = ["0x" + f"{i:02x}" * 20 for i in range(0x21, 0x21 + MAX_RECEIVERS)]
+CONFIGS = [(receiver, 500) for receiver in RECEIVERS]
+
+
+def gas_figures(
+    fee_allocator,
+    admin,
+    actual_hooker,
+    actual_fee_distributor,
+    actual_fee_collector,
+    mint_to_receiver,
+    measure_gas,
+) -> dict[str, int]:
+    def admin_gas(call) -> int:
+        return measure_gas(fee_allocator, call, admin.address)
+
+    def distribute() -> int:
+        mint_to_receiver(actual_hooker.address, AMOUNT_TO_DISTRIBUTE)
+        return measure_gas(
+            fee_allocator, fee_allocator.distribute_fees, actual_hooker.address
+        )
+
+    gas = {}
+    with boa.env.anchor():
+        gas["deploy"] = measure_gas(
+            None,
+            lambda: FeeAllocator.deploy(
+                actual_fee_distributor, actual_fee_collector, admin
+            ),
+        )
+
+    # what every weekly FeeCollector.forward pays
+    for n in range(MAX_RECEIVERS + 1):
+        with boa.env.anchor():
+            if n > 0:
+                with boa.env.prank(admin.address):
+                    fee_allocator.set_multiple_receivers(CONFIGS[:n])
+            # a first run so that receivers hold a balance, as they do after
+            # their first week
+            distribute()
+            gas[f"distribute_fees/{n}"] = distribute()
+
+    with boa.env.anchor():
+        with boa.env.prank(admin.address):
+            fee_allocator.set_multiple_receivers(CONFIGS[:-1])
+        gas["set_receiver/add"] = admin_gas(
+            lambda: fee_allocator.set_receiver(*CONFIGS[-1])
+        )
+        gas["set_receiver/update"] = admin_gas(
+            lambda: fee_allocator.set_receiver(RECEIVERS[0], 400)
+        )
+
+    with boa.env.anchor():
+        gas[f"set_multiple_receivers/{MAX_RECEIVERS}"] = admin_gas(
+            lambda: fee_allocator.set_multiple_receivers(CONFIGS)
+        )
+        # the last receiver is moved into the slot of the removed one
+        with boa.env.anchor():
+            gas["remove_receiver/swap"] = admin_gas(
+                lambda: fee_allocator.remove_receiver(RECEIVERS[0])
+            )
+        # the last receiver is removed, nothing is moved
+        with boa.env.anchor():
+            gas["remove_receiver/tail"] = admin_gas(
+                lambda: fee_allocator.remove_receiver(RECEIVERS[-1])
+            )
+    return gas
+
+
+def test_gas_regressions(
+    fee_allocator,
+    admin,
+    actual_hooker,
+    actual_fee_distributor,
+    actual_fee_collector,
+    mint_to_receiver,
+    measure_gas,
+):
+    gas = gas_figures(
+        fee_allocator,
+        admin,
+        actual_hooker,
+        actual_fee_distributor,
+        actual_fee_collector,
+        mint_to_receiver,
+        measure_gas,
+    )
+    network = get_config().get_active_network().name
+    baselines = json.loads(BASELINE.read_text()) if BASELINE.exists() else {}
+
+    if UPDATE:
+        baselines[network] = gas
+        BASELINE.write_text(json.dumps(baselines, indent=2) + "\n")
+        return
+
+    if network not in baselines:
+        pytest.skip(
+            f"no gas baseline for {network}, record it with "
+            "UPDATE_GAS_BASELINE=1"
+        )
+    baseline = baselines[network]
+    assert sorted(gas) == sorted(
+        baseline
+    ), "the figures measured changed, record the baseline again"
+
+    regressions = {
+        name: (baseline[name], used)
+        for name, used in gas.items()
+        if used > baseline[name] * (1 + GAS_TOLERANCE)
+    }
+    for name, used in gas.items():
+        if used < baseline[name] * (1 - GAS_TOLERANCE):
+            warnings.warn(
+                f"{name}: {baseline[name]} -> {used} gas, record the baseline"
+                " again"
+            )
+    assert not regressions, "\n".join(
+        f"{name}: {old} -> {new} gas (+{(new - old) / old:.1%})"
+        for name, (old, new) in regressions.items()
+    )
@@ -0,0 +1,44 @@
+import json
+
+from script.gas_profile import format_report, gas_profile, write_report
+
+
+def test_gas_profile(tmp_path):
+    entry_points, lines = gas_profile()
+    assert [entry.function for entry in entry_points] == [
+        "set_multiple_receivers",
+        "set_receiver",
+        "set_receiver",
+        "distribute_fees",
+        "distribute_fees",
+        "distribute_fees",
+        "remove_receiver",
+        "remove_receiver",
+    ]
+    # lines of every entry point, in source order
+    assert {stats.function for stats in lines} >= {
+        entry.function for entry in entry_points
+    }
+    assert lines == sorted(lines, key=lambda s: (s.module, s.line))
+
+    # the lines cover the gas of the calls
+    total = sum(stats.gas + stats.call_gas for stats in lines)
+    assert 0.99 < total / sum(entry.gas for entry in entry_points) <= 1
+
+    distribute = [s for s in lines if s.function == "_distribute"]
+    assert sum(s.call_gas for s in distribute) > 0
+    assert sum(s.sload for s in distribute) > 0
+    assert sum(s.sstore for s in lines) > 0
+    assert 0 < sum(s.memory_gas for s in lines) < total
+
+    # profiles are the same on every run, so that they can be diffed
+    assert format_report(*gas_profile()) == format_report(entry_points, lines)
+
+    write_report(entry_points, lines, tmp_path)
+    data = json.loads((tmp_path / "gas_profile.json").read_text())
+    assert [entry["gas"] for entry in data["entry_points"]] == [
+        entry.gas for entry in entry_points
+    ]
+    assert len(data["lines"]) == len(lines)
+    text = (tmp_path / "gas_profile.txt").read_text()
+    assert "# src/FeeAllocator.vy: distribute_fees" in text
@@ -0,0 +1,226 @@
+import boa
+import pytest
+
+from script.merkle import build_tree
+
+AMOUNT_TO_DISTRIBUTE = int(100_000 * 1e18)
+WEEK = 7 * 24 * 3600
+
+
+@pytest.fixture
+def merkle_receivers():
+    return [(boa.env.generate_address(), 100 + i) for i in range(20)]
+
+
+@pytest.fixture
+def distribute(fee_allocator, actual_hooker, actual_crvusd, mint_to_receiver):
+    def inner() -> int:
+        mint_to_receiver(actual_hooker.address, AMOUNT_TO_DISTRIBUTE)
+        balance = actual_crvusd.balanceOf(actual_hooker.address)
+        with boa.env.prank(actual_hooker.address):
+            fee_allocator.distribute_fees_direct()
+        return balance
+
+    return inner
+
+
+def claim(fee_allocator, tree, epoch, index):
+    receiver, weight = tree.leaves[index]
+    return fee_allocator.claim_merkle(
+        epoch, index, receiver, weight, tree.proof(index)
+    )
+
+
+def test_merkle_tree_proofs(merkle_receivers):
+    tree = build_tree(merkle_receivers)
+    assert tree.depth == 5
+    for i, (receiver, weight) in enumerate(merkle_receivers):
+        assert tree.verify(i, receiver, weight, tree.proof(i))
+        assert not tree.verify(i, receiver, weight + 1, tree.proof(i))
+
+
+def test_merkle_tree_duplicate_receiver(merkle_receivers):
+    receiver, _ = merkle_receivers[3]
+    leaves = merkle_receivers + [(receiver.lower(), 1)]
+    with pytest.raises(AssertionError, match="merkle: duplicate receiver"):
+        build_tree(leaves)
+
+
+def test_merkle_claims(
+    fee_allocator,
+    actual_crvusd,
+    actual_fee_distributor,
+    admin,
+    merkle_receivers,
+    distribute,
+):
+    tree = build_tree(merkle_receivers)
+    with boa.env.prank(admin.address):
+        fee_allocator.set_merkle_root(tree.root, tree.total_weight)
+
+    pre_distribution_distributor_balance = actual_crvusd.balanceOf(
+        actual_fee_distributor
+    )
+    amount = distribute()
+
+    epoch_amount = amount * tree.total_weight // 10000
+    assert fee_allocator.n_merkle_epochs() == 1
+    assert fee_allocator.merkle_epoch_roots(0) == tree.root
+    assert fee_allocator.reserved_balance() == epoch_amount
+    assert actual_crvusd.balanceOf(fee_allocator.address) == epoch_amount
+    assert actual_crvusd.balanceOf(
+        actual_fee_distributor
+    ) == pre_distribution_distributor_balance + (amount - epoch_amount)
+
+    for i, (receiver, weight) in enumerate(merkle_receivers):
+        expected = epoch_amount * weight // tree.total_weight
+        assert claim(fee_allocator, tree, 0, i) == expected
+        assert actual_crvusd.balanceOf(receiver) == expected
+
+    reserved = fee_allocator.reserved_balance()
+    assert reserved == epoch_amount - fee_allocator.merkle_epoch_claimed(0)
+    assert reserved < len(merkle_receivers)
+    assert actual_crvusd.balanceOf(fee_allocator.address) == reserved
+
+
+def test_merkle_double_claim(
+    fee_allocator, admin, merkle_receivers, distribute
+):
+    tree = build_tree(merkle_receivers)
+    with boa.env.prank(admin.address):
+        fee_allocator.set_merkle_root(tree.root, tree.total_weight)
+    distribute()
+
+    claim(fee_allocator, tree, 0, 3)
+    with pytest.raises(Exception):
+        claim(fee_allocator, tree, 0, 3)
+
+
+def test_merkle_invalid_proof(
+    fee_allocator, admin, merkle_receivers, distribute
+):
+    tree = build_tree(merkle_receivers)
+    with boa.env.prank(admin.address):
+        fee_allocator.set_merkle_root(tree.root, tree.total_weight)
+    distribute()
+
+    receiver, weight = merkle_receivers[3]
+    with pytest.raises(Exception):
+        fee_allocator.claim_merkle(0, 3, receiver, weight + 1, tree.proof(3))
+    with pytest.raises(Exception):
+        fee_allocator.claim_merkle(0, 3, receiver, weight, tree.proof(4))
+    with pytest.raises(Exception):
+        fee_allocator.claim_merkle(1, 3, receiver, weight, tree.proof(3))
+
+
+def test_merkle_epochs_keep_their_root(
+    fee_allocator, admin, merkle_receivers, distribute
+):
+    first_tree = build_tree(merkle_receivers[:10])
+    second_tree = build_tree(merkle_receivers[10:])
+    with boa.env.prank(admin.address):
+        fee_allocator.set_merkle_root(first_tree.root, first_tree.total_weight)
+    distribute()
+    with boa.env.prank(admin.address):
+        fee_allocator.set_merkle_root(
+            second_tree.root, second_tree.total_weight
+        )
+    distribute()
+
+    assert claim(fee_allocator, first_tree, 0, 0) > 0
+    assert claim(fee_allocator, second_tree, 1, 0) > 0
+    with pytest.raises(Exception):
+        claim(fee_allocator, first_tree, 1, 1)
+
+
+def test_merkle_weight_capped_at_distribution(
+    fee_allocator,
+    admin,
+    fee_receiver,
+    merkle_receivers,
+    actual_crvusd,
+    distribute,
+):
+    tree = build_tree(merkle_receivers)  # total weight 2190
+    with boa.env.prank(admin.address):
+        fee_allocator.set_merkle_root(tree.root, tree.total_weight)
+        fee_allocator.set_receiver(fee_receiver, 4000)
+
+    amount = distribute()
+
+    # only 1000 bps are left for the merkle leaves below the 50% veCRV floor
+    epoch_amount = amount * 1000 // 10000
+    assert fee_allocator.reserved_balance() == epoch_amount
+    assert actual_crvusd.balanceOf(fee_receiver) == amount * 4000 // 10000
+
+    total_claimed = sum(
+        claim(fee_allocator, tree, 0, i) for i in range(len(merkle_receivers))
+    )
+    assert total_claimed <= epoch_amount
+    assert epoch_amount - total_claimed < len(merkle_receivers)
+
+
+def test_sweep_merkle_epoch(
+    fee_allocator,
+    admin,
+    merkle_receivers,
+    actual_crvusd,
+    actual_fee_distributor,
+    distribute,
+):
+    tree = build_tree(merkle_receivers)
+    with boa.env.prank(admin.address):
+        fee_allocator.set_merkle_root(tree.root, tree.total_weight)
+    distribute()
+    claimed = claim(fee_allocator, tree, 0, 0)
+
+    with pytest.raises(Exception):
+        fee_allocator.sweep_merkle_epoch(0)
+
+    boa.env.time_travel(seconds=fee_allocator.MERKLE_CLAIM_PERIOD())
+    pre_sweep_distributor_balance = actual_crvusd.balanceOf(
+        actual_fee_distributor
+    )
+    reserved = fee_allocator.reserved_balance()
+    fee_allocator.sweep_merkle_epoch(0)
+
+    assert fee_allocator.reserved_balance() == 0
+    assert actual_crvusd.balanceOf(actual_fee_distributor) == (
+        pre_sweep_distributor_balance + reserved
+    )
+    assert claimed > 0
+    with pytest.raises(Exception):
+        claim(fee_allocator, tree, 0, 1)
+
+
+def test_set_merkle_root_invalid(fee_allocator, admin, merkle_receivers):
+    tree = build_tree(merkle_receivers)
+    with boa.env.prank(admin.address):
+        with pytest.raises(Exception):
+            fee_allocator.set_merkle_root(tree.root, 0)
+        with pytest.raises(Exception):
+            fee_allocator.set_merkle_root(tree.root, 5001)
+        with pytest.raises(Exception):
+            fee_allocator.set_merkle_root(b"\x00" * 32, 100)
+
+
+def test_merkle_claim_gas_by_depth(
+    fee_allocator, admin, distribute, measure_gas
+):
+    receivers = [boa.env.generate_address() for _ in range(4096)]
+    gas_used = {}
+    for n_leaves in (2, 16, 256, 4096):
+        tree = build_tree([(r, 1) for r in receivers[:n_leaves]])
+        with boa.env.anchor():
+            with boa.env.prank(admin.address):
+                fee_allocator.set_merkle_root(tree.root, tree.total_weight)
+            distribute()
+            gas_used[tree.depth] = measure_gas(
+                fee_allocator,
+                lambda: claim(fee_allocator, tree, 0, n_leaves - 1),
+            )
+
+    depths = list(gas_used)
+    assert gas_used[depths[-1]] - gas_used[depths[0]] < 1_000 * (
+        depths[-1] - depths[0]
+    )
@@ -0,0 +1,178 @@
+import boa
+import pytest
+
+AMOUNT_TO_DISTRIBUTE = int(100_000 * 1e18)
+
+
+@pytest.fixture
+def receivers(fee_allocator, admin, multiple_fee_receivers):
+    configs = [
+        (receiver, 100 * (i + 1))
+        for i, receiver in enumerate(multiple_fee_receivers[:5])
+    ]
+    with boa.env.prank(admin.address):
+        fee_allocator.set_multiple_receivers(configs)
+    return configs
+
+
+@pytest.fixture
+def fund_hooker(actual_hooker, actual_crvusd, mint_to_receiver):
+    def inner() -> int:
+        mint_to_receiver(actual_hooker.address, AMOUNT_TO_DISTRIBUTE)
+        return actual_crvusd.balanceOf(actual_hooker.address)
+
+    return inner
+
+
+def test_distribute_fees_paginated(
+    fee_allocator,
+    actual_hooker,
+    actual_crvusd,
+    actual_fee_distributor,
+    receivers,
+    fund_hooker,
+):
+    amount = fund_hooker()
+    distributor_balance = actual_crvusd.balanceOf(actual_fee_distributor)
+
+    with boa.env.prank(actual_hooker.address):
+        assert not fee_allocator.distribute_fees_paginated(2)
+    assert actual_crvusd.balanceOf(actual_hooker.address) == 0
+    assert fee_allocator.distribution_round()[0] == amount
+    assert fee_allocator.distribution_round()[4] == 2
+    assert fee_allocator.reserved_balance() == amount - sum(
+        amount * weight // 10000 for _, weight in receivers[:2]
+    )
+
+    # anyone can continue a round
+    with boa.env.prank(boa.env.generate_address()):
+        assert not fee_allocator.distribute_fees_paginated(2)
+        assert fee_allocator.distribute_fees_paginated(2)
+
+    distributor_share = amount
+    for receiver, weight in receivers:
+        assert actual_crvusd.balanceOf(receiver) == amount * weight // 10000
+        distributor_share -= amount * weight // 10000
+    assert (
+        actual_crvusd.balanceOf(actual_fee_distributor)
+        == distributor_balance + distributor_share
+    )
+    assert actual_crvusd.balanceOf(fee_allocator) == 0
+    assert fee_allocator.reserved_balance() == 0
+    assert fee_allocator.distribution_round() == (0, 0, 0, 0, 0)
+
+    # a new round can be started once the previous one is complete
+    amount = fund_hooker()
+    with boa.env.prank(actual_hooker.address):
+        assert fee_allocator.distribute_fees_paginated(10)
+    receiver, weight = receivers[0]
+    assert actual_crvusd.balanceOf(receiver) == 2 * (amount * weight // 10000)
+
+
+def test_round_uses_snapshot(
+    fee_allocator,
+    actual_hooker,
+    actual_crvusd,
+    admin,
+    multiple_fee_receivers,
+    receivers,
+    fund_hooker,
+):
+    amount = fund_hooker()
+    with boa.env.prank(actual_hooker.address):
+        fee_allocator.distribute_fees_paginated(2)
+
+    # a paid receiver is reweighted, unpaid ones are removed or reweighted
+    # and a new one is added: none of it applies before the next round
+    new_receiver = multiple_fee_receivers[5]
+    with boa.env.prank(admin.address):
+        fee_allocator.set_receiver(receivers[0][0], 1000)
+        fee_allocator.remove_receiver(receivers[2][0])
+        fee_allocator.set_receiver(receivers[3][0], 50)
+        fee_allocator.set_receiver(new_receiver, 500)
+
+    with boa.env.prank(actual_hooker.address):
+        assert fee_allocator.distribute_fees_paginated(10)
+
+    for receiver, weight in receivers:
+        assert actual_crvusd.balanceOf(receiver) == amount * weight // 10000
+    assert actual_crvusd.balanceOf(new_receiver) == 0
+    assert fee_allocator.reserved_balance() == 0
+
+
+def test_round_funds_reserved(
+    fee_allocator,
+    actual_hooker,
+    actual_crvusd,
+    receivers,
+    fund_hooker,
+):
+    amount = fund_hooker()
+    with boa.env.prank(actual_hooker.address):
+        fee_allocator.distribute_fees_paginated(1)
+
+    # a regular distribution only splits the new fees
+    new_amount = fund_hooker()
+    with boa.env.prank(actual_hooker.address):
+        fee_allocator.distribute_fees()
+        # the round in progress is continued rather than restarted
+        assert fee_allocator.distribute_fees_paginated(10)
+
+    for receiver, weight in receivers:
+        assert actual_crvusd.balanceOf(receiver) == (
+            amount * weight // 10000 + new_amount * weight // 10000
+        )
+    assert actual_crvusd.balanceOf(fee_allocator) == 0
+    assert fee_allocator.reserved_balance() == 0
+
+
+def test_round_payout_policies(
+    fee_allocator,
+    actual_hooker,
+    actual_crvusd,
+    admin,
+    receivers,
+    fund_hooker,
+):
+    (a, weight_a), (b, weight_b) = receivers[3:5]
+    with boa.env.prank(admin.address):
+        fee_allocator.set_payout_policy(a, 2**96 - 1, 0)
+        fee_allocator.set_payout_policy(b, 2**96 - 1, 0)
+
+    amount = fund_hooker()
+    with boa.env.prank(actual_hooker.address):
+        fee_allocator.distribute_fees_paginated(4)
+    carried = amount * weight_a // 10000
+    assert fee_allocator.payout_policy(a)[3] == carried
+
+    # b's policy is removed before it is paid: its share is paid as is
+    with boa.env.prank(admin.address):
+        fee_allocator.set_payout_policy(b, 0, 0)
+    with boa.env.prank(actual_hooker.address):
+        assert fee_allocator.distribute_fees_paginated(4)
+    (log,) = [
+        log
+        for log in fee_allocator.get_logs()
+        if type(log).__name__ == "FeesCarriedOver"
+    ]
+    assert log.carried_over == carried
+
+    assert actual_crvusd.balanceOf(a) == 0
+    assert actual_crvusd.balanceOf(b) == amount * weight_b // 10000
+    assert fee_allocator.reserved_balance() == carried
+    assert actual_crvusd.balanceOf(fee_allocator) == carried
+
+
+def test_distribute_fees_paginated_invalid(
+    fee_allocator, actual_hooker, receivers, fund_hooker
+):
+    with boa.env.prank(actual_hooker.address):
+        with boa.reverts("distribute: invalid page size"):
+            fee_allocator.distribute_fees_paginated(0)
+        with boa.reverts("receivers: no fees to distribute"):
+            fee_allocator.distribute_fees_paginated(1)
+
+    fund_hooker()
+    with boa.env.prank(boa.env.generate_address()):
+        with boa.reverts("distribute: hooker only"):
+            fee_allocator.distribute_fees_paginated(1)
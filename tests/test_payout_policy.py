@@ -0,0 +1,189 @@
+import boa
+import pytest
+
+from script.utils.fee_collector import WEEK
+
+AMOUNT_TO_DISTRIBUTE = int(100_000 * 1e18)
+
+
+@pytest.fixture
+def distribute(fee_allocator, actual_hooker, actual_crvusd, mint_to_receiver):
+    def inner(direct: bool = False) -> int:
+        mint_to_receiver(actual_hooker.address, AMOUNT_TO_DISTRIBUTE)
+        balance = actual_crvusd.balanceOf(actual_hooker.address)
+        with boa.env.prank(actual_hooker.address):
+            if direct:
+                fee_allocator.distribute_fees_direct()
+            else:
+                fee_allocator.distribute_fees()
+        return balance
+
+    return inner
+
+
+def fees_distributed(fee_allocator) -> tuple[int, int, int, int]:
+    logs = fee_allocator.get_logs()
+    (log,) = [log for log in logs if type(log).__name__ == "FeesDistributed"]
+    # FeesCarriedOver is only logged when something was carried over or paid
+    carry_logs = [
+        (log.carried_over, log.carry_released)
+        for log in logs
+        if type(log).__name__ == "FeesCarriedOver"
+    ]
+    assert carry_logs != [(0, 0)]
+    (carry,) = carry_logs or [(0, 0)]
+    return (log.total_amount, log.distributor_share, *carry)
+
+
+@pytest.mark.parametrize("direct", [False, True])
+def test_min_payout_carries_over(
+    fee_allocator,
+    actual_crvusd,
+    actual_fee_distributor,
+    admin,
+    fee_receiver,
+    distribute,
+    direct,
+):
+    weight = 100
+    with boa.env.prank(admin.address):
+        fee_allocator.set_receiver(fee_receiver, weight)
+        fee_allocator.set_payout_policy(
+            fee_receiver, AMOUNT_TO_DISTRIBUTE * weight // 10000 * 5 // 2, 0
+        )
+
+    shares = []
+    for _ in range(2):
+        distributor_balance = actual_crvusd.balanceOf(actual_fee_distributor)
+        amount = distribute(direct)
+        share = amount * weight // 10000
+        shares.append(share)
+
+        assert fees_distributed(fee_allocator) == (
+            amount,
+            amount - share,
+            share,
+            0,
+        )
+        assert actual_crvusd.balanceOf(fee_receiver) == 0
+        assert actual_crvusd.balanceOf(fee_allocator.address) == sum(shares)
+        assert fee_allocator.reserved_balance() == sum(shares)
+        assert fee_allocator.payout_policy(fee_receiver)[3] == sum(shares)
+        assert actual_crvusd.balanceOf(
+            actual_fee_distributor
+        ) == distributor_balance + (amount - share)
+
+    amount = distribute(direct)
+    share = amount * weight // 10000
+    assert fees_distributed(fee_allocator) == (
+        amount,
+        amount - share,
+        0,
+        sum(shares),
+    )
+    assert actual_crvusd.balanceOf(fee_receiver) == sum(shares) + share
+    assert actual_crvusd.balanceOf(fee_allocator.address) == 0
+    assert fee_allocator.reserved_balance() == 0
+    assert fee_allocator.payout_policy(fee_receiver)[3] == 0
+
+
+def test_payout_interval(
+    fee_allocator, actual_crvusd, admin, fee_receiver, distribute
+):
+    weight = 100
+    with boa.env.prank(admin.address):
+        fee_allocator.set_receiver(fee_receiver, weight)
+        fee_allocator.set_payout_policy(fee_receiver, 0, 2)
+
+    carried = 0
+    for _ in range(2):
+        carried += distribute() * weight // 10000
+        assert actual_crvusd.balanceOf(fee_receiver) == 0
+        assert fee_allocator.payout_policy(fee_receiver)[3] == carried
+        boa.env.time_travel(seconds=WEEK)
+
+    paid = carried + distribute() * weight // 10000
+    assert actual_crvusd.balanceOf(fee_receiver) == paid
+    assert fee_allocator.payout_policy(fee_receiver)[2] == (
+        boa.env.evm.patch.timestamp // WEEK
+    )
+
+    # the interval restarts from the last payout
+    distribute()
+    assert actual_crvusd.balanceOf(fee_receiver) == paid
+
+
+def test_policy_kept_on_weight_update(
+    fee_allocator, admin, fee_receiver, distribute
+):
+    with boa.env.prank(admin.address):
+        fee_allocator.set_receiver(fee_receiver, 100)
+        fee_allocator.set_payout_policy(fee_receiver, 2**96 - 1, 0)
+        fee_allocator.set_receiver(fee_receiver, 200)
+
+    assert fee_allocator.receiver_weights(fee_receiver) == 200
+    amount = distribute()
+    assert (
+        fee_allocator.payout_policy(fee_receiver)[3] == amount * 200 // 10000
+    )
+
+
+@pytest.mark.parametrize("remove", [False, True])
+def test_carry_over_paid_when_policy_removed(
+    fee_allocator, actual_crvusd, admin, fee_receiver, distribute, remove
+):
+    with boa.env.prank(admin.address):
+        fee_allocator.set_receiver(fee_receiver, 100)
+        fee_allocator.set_payout_policy(fee_receiver, 2**96 - 1, 0)
+    carried = distribute() * 100 // 10000
+    assert actual_crvusd.balanceOf(fee_receiver) == 0
+
+    with boa.env.prank(admin.address):
+        if remove:
+            fee_allocator.remove_receiver(fee_receiver)
+        else:
+            fee_allocator.set_payout_policy(fee_receiver, 0, 0)
+
+    assert actual_crvusd.balanceOf(fee_receiver) == carried
+    assert fee_allocator.reserved_balance() == 0
+    assert fee_allocator.payout_policy(fee_receiver) == (0, 0, 0, 0)
+
+    if not remove:
+        # without a policy, shares are paid out right away again
+        amount = distribute()
+        assert actual_crvusd.balanceOf(fee_receiver) == (
+            carried + amount * 100 // 10000
+        )
+
+
+def test_set_payout_policy_invalid(fee_allocator, admin, fee_receiver):
+    with boa.env.prank(admin.address):
+        with boa.reverts("receivers: does not exist"):
+            fee_allocator.set_payout_policy(fee_receiver, 1, 0)
+
+        fee_allocator.set_receiver(fee_receiver, 100)
+        with boa.reverts("payouts: invalid min payout"):
+            fee_allocator.set_payout_policy(fee_receiver, 2**96, 0)
+        with boa.reverts("payouts: invalid interval"):
+            fee_allocator.set_payout_policy(fee_receiver, 0, 2**16)
+
+
+def test_carry_over_gas(
+    fee_allocator, admin, multiple_fee_receivers, distribute, measure_gas
+):
+    receivers = multiple_fee_receivers[:4]
+    with boa.env.prank(admin.address):
+        fee_allocator.set_multiple_receivers([(r, 100) for r in receivers])
+
+    gas_used = {}
+    for carry in (False, True):
+        with boa.env.anchor():
+            if carry:
+                with boa.env.prank(admin.address):
+                    for receiver in receivers:
+                        fee_allocator.set_payout_policy(receiver, 2**96 - 1, 0)
+            # a first run so that receivers hold a balance or a carry-over
+            distribute()
+            gas_used[carry] = measure_gas(fee_allocator, distribute)
+
+    assert gas_used[True] < gas_used[False]
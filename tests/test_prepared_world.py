@@ -0,0 +1,52 @@
+import json
+
+import boa
+from moccasin.config import get_config
+
+import script.prepared_world
+from script.prepared_world import dump_world, restore_world, world_key
+from script.utils.fee_collector import WEEK
+
+
+def test_restore_world(world, admin, fee_allocator):
+    def dump() -> dict:
+        # through JSON, like the pytest cache
+        return json.loads(
+            json.dumps(dump_world("key", world, [admin.address]))
+        )
+
+    saved = dump()
+    next_address = boa.env.generate_address()
+
+    boa.env.time_travel(seconds=WEEK)
+    boa.env.set_balance(admin.address, 0)
+    boa.env.set_code(fee_allocator.address, b"")
+
+    contracts = restore_world(saved)
+    assert contracts.keys() == world.keys()
+    for name, contract in contracts.items():
+        assert contract.address == world[name].address
+    assert dump() == saved
+    assert boa.env.generate_address() == next_address
+    assert contracts["fee_allocator"].owner() == admin.address
+
+
+def test_world_key_covers_snekmate(monkeypatch, tmp_path):
+    ownable = tmp_path / "lib" / "pypi" / "snekmate" / "auth" / "ownable.vy"
+    ownable.parent.mkdir(parents=True)
+    ownable.write_text("# 0.1.0")
+    monkeypatch.setattr(script.prepared_world, "ROOT", tmp_path)
+
+    key = world_key()
+    ownable.write_text("# 0.1.1")
+    assert world_key() != key
+
+
+def test_world_key_covers_pinned_block(monkeypatch):
+    network = get_config().get_active_network()
+    monkeypatch.setattr(network, "block_identifier", 22_500_000)
+    key = world_key()
+    assert world_key() == key
+
+    monkeypatch.setattr(network, "block_identifier", 22_500_001)
+    assert world_key() != key
@@ -0,0 +1,267 @@
+import boa
+import pytest
+
+from script.utils.receivers import ZERO_ADDRESS, pack_receivers
+
+AMOUNT_TO_DISTRIBUTE = int(100_000 * 1e18)
+
+
+def get_configs(fee_allocator) -> list[tuple[str, int]]:
+    configs = []
+    for i in range(fee_allocator.n_receivers()):
+        receiver = fee_allocator.receivers(i)
+        configs.append((receiver, fee_allocator.receiver_weights(receiver)))
+    return configs
+
+
+def calldata_gas(calldata: bytes) -> int:
+    return sum(16 if byte else 4 for byte in calldata)
+
+
+def count_logs(fee_allocator, name: str) -> int:
+    return sum(type(log).__name__ == name for log in fee_allocator.get_logs())
+
+
+def test_replace_receivers(fee_allocator, admin, multiple_fee_receivers):
+    a, b, c, d = multiple_fee_receivers[:4]
+    with boa.env.prank(admin.address):
+        fee_allocator.set_multiple_receivers([(a, 3000), (b, 1000), (d, 1000)])
+
+        # growing c first would go over the cap with set_multiple_receivers
+        new_configs = [(c, 4000), (a, 500), (b, 500)]
+        with pytest.raises(Exception):
+            with boa.env.anchor():
+                fee_allocator.set_multiple_receivers(new_configs)
+
+        fee_allocator.replace_receivers(new_configs)
+
+    assert count_logs(fee_allocator, "ReceiverRemoved") == 1
+    assert count_logs(fee_allocator, "ReceiverSet") == 3
+    assert get_configs(fee_allocator) == new_configs
+    assert fee_allocator.total_weight() == 5000
+    assert fee_allocator.receiver_weights(d) == 0
+
+    with boa.env.prank(admin.address):
+        fee_allocator.remove_receiver(c)
+    assert get_configs(fee_allocator) == [(b, 500), (a, 500)]
+
+
+def test_replace_receivers_shrink_and_clear(
+    fee_allocator, admin, multiple_fee_receivers
+):
+    configs = [(receiver, 100) for receiver in multiple_fee_receivers]
+    with boa.env.prank(admin.address):
+        fee_allocator.replace_receivers(configs)
+        assert get_configs(fee_allocator) == configs
+
+        fee_allocator.replace_receivers(configs[3:1:-1])
+        assert get_configs(fee_allocator) == configs[3:1:-1]
+        assert fee_allocator.total_weight() == 200
+
+        fee_allocator.replace_receivers([])
+    assert fee_allocator.n_receivers() == 0
+    assert fee_allocator.total_weight() == 0
+    for receiver, _ in configs:
+        assert fee_allocator.receiver_weights(receiver) == 0
+
+
+def test_replace_receivers_unchanged(
+    fee_allocator, admin, multiple_fee_receivers
+):
+    configs = [(receiver, 100) for receiver in multiple_fee_receivers]
+    with boa.env.prank(admin.address):
+        fee_allocator.replace_receivers(configs)
+        fee_allocator.replace_receivers(configs)
+
+    assert count_logs(fee_allocator, "ReceiverSet") == 0
+    assert get_configs(fee_allocator) == configs
+
+
+@pytest.mark.parametrize(
+    "configs,error",
+    [
+        ([(ZERO_ADDRESS, 100)], "zeroaddr: receiver"),
+        (
+            [("0x" + "11" * 20, 0)],
+            "receivers: invalid weight, use remove_receiver",
+        ),
+        (
+            [("0x" + "11" * 20, 100), ("0x" + "11" * 20, 200)],
+            "receivers: duplicate receiver",
+        ),
+        (
+            [("0x" + "11" * 20, 2500), ("0x" + "22" * 20, 2501)],
+            "receivers: exceeds max total weight",
+        ),
+    ],
+)
+def test_replace_receivers_invalid(fee_allocator, admin, configs, error):
+    with boa.env.prank(admin.address):
+        with boa.reverts(error):
+            fee_allocator.replace_receivers(configs)
+
+
+def test_replace_receivers_keeps_accrual_and_policies(
+    fee_allocator,
+    actual_hooker,
+    actual_crvusd,
+    admin,
+    multiple_fee_receivers,
+    mint_to_receiver,
+):
+    a, b, c = multiple_fee_receivers[:3]
+    with boa.env.prank(admin.address):
+        fee_allocator.replace_receivers([(a, 1000), (b, 1000)])
+        fee_allocator.set_payout_policy(a, 2**96 - 1, 0)
+        fee_allocator.set_payout_policy(b, 2**96 - 1, 0)
+
+    mint_to_receiver(actual_hooker.address, AMOUNT_TO_DISTRIBUTE)
+    with boa.env.prank(actual_hooker.address):
+        fee_allocator.accrue_fees()
+    mint_to_receiver(actual_hooker.address, AMOUNT_TO_DISTRIBUTE)
+    with boa.env.prank(actual_hooker.address):
+        fee_allocator.distribute_fees()
+    accrued = fee_allocator.claimable(a)
+    carried = fee_allocator.payout_policy(b)[3]
+    assert accrued > 0 and carried > 0
+
+    with boa.env.prank(admin.address):
+        fee_allocator.replace_receivers([(c, 1000), (a, 2000)])
+
+    # a keeps what it accrued with its old weight and its policy
+    assert fee_allocator.claimable(a) == accrued
+    assert fee_allocator.payout_policy(a)[0] == 2**96 - 1
+    # b is removed, its carry-over is paid out
+    assert actual_crvusd.balanceOf(b) == carried
+    assert fee_allocator.payout_policy(b) == (0, 0, 0, 0)
+
+    mint_to_receiver(actual_hooker.address, AMOUNT_TO_DISTRIBUTE)
+    balance = actual_crvusd.balanceOf(actual_hooker.address)
+    with boa.env.prank(actual_hooker.address):
+        fee_allocator.distribute_fees()
+    assert actual_crvusd.balanceOf(c) == balance * 1000 // 10000
+    assert fee_allocator.payout_policy(a)[3] == (
+        AMOUNT_TO_DISTRIBUTE * 1000 // 10000 + balance * 2000 // 10000
+    )
+
+
+def test_replace_receivers_gas(fee_allocator, admin, measure_gas):
+    receivers = [boa.env.generate_address() for _ in range(10)]
+    with boa.env.prank(admin.address):
+        fee_allocator.replace_receivers([(r, 100) for r in receivers])
+
+    # unchanged entries are skipped, set_multiple_receivers rewrites them
+    new_configs = [(r, 100) for r in receivers]
+    new_configs[3] = (receivers[3], 300)
+    new_configs[7] = (receivers[7], 50)
+    gas_used = {}
+    for name in ("set_multiple_receivers", "replace_receivers"):
+        with boa.env.anchor():
+            gas_used[name] = measure_gas(
+                fee_allocator,
+                lambda: getattr(fee_allocator, name)(new_configs),
+                admin.address,
+            )
+            assert get_configs(fee_allocator) == new_configs
+
+    assert gas_used["replace_receivers"] < gas_used["set_multiple_receivers"]
+
+
+def test_set_receivers_packed(fee_allocator, admin, multiple_fee_receivers):
+    configs = [
+        (receiver, 100 * (i + 1))
+        for i, receiver in enumerate(multiple_fee_receivers[:5])
+    ]
+    with boa.env.prank(admin.address):
+        fee_allocator.set_receivers_packed(pack_receivers(configs))
+        assert get_configs(fee_allocator) == configs
+        assert fee_allocator.total_weight() == 1500
+
+        configs[2] = (configs[2][0], 1000)
+        fee_allocator.set_receivers_packed(pack_receivers(configs[2:3]))
+    assert get_configs(fee_allocator) == configs
+    assert fee_allocator.total_weight() == 2200
+
+
+def test_set_receivers_packed_invalid(fee_allocator, admin, fee_receiver):
+    with boa.env.prank(admin.address):
+        with boa.reverts("receivers: empty array"):
+            fee_allocator.set_receivers_packed([])
+        with boa.reverts("zeroaddr: receiver"):
+            fee_allocator.set_receivers_packed(
+                pack_receivers([(ZERO_ADDRESS, 100)])
+            )
+        with boa.reverts("receivers: invalid weight, use remove_receiver"):
+            fee_allocator.set_receivers_packed(
+                pack_receivers([(fee_receiver, 0)])
+            )
+        # weights that would spill into the flag bits are over the cap
+        with boa.reverts("receivers: exceeds max total weight"):
+            fee_allocator.set_receivers_packed(
+                pack_receivers([(fee_receiver, 1 << 95)])
+            )
+
+
+def test_remove_receivers(fee_allocator, admin, multiple_fee_receivers):
+    configs = [(receiver, 100) for receiver in multiple_fee_receivers[:6]]
+    with boa.env.prank(admin.address):
+        fee_allocator.set_multiple_receivers(configs)
+        fee_allocator.remove_receivers(
+            [configs[1][0], configs[5][0], configs[0][0]]
+        )
+
+    assert sorted(get_configs(fee_allocator)) == sorted(
+        [configs[2], configs[3], configs[4]]
+    )
+    assert fee_allocator.total_weight() == 300
+    for receiver, _ in (configs[0], configs[1], configs[5]):
+        assert fee_allocator.receiver_weights(receiver) == 0
+
+
+def test_remove_receivers_invalid(fee_allocator, admin, fee_receiver):
+    with boa.env.prank(admin.address):
+        with boa.reverts("receivers: empty array"):
+            fee_allocator.remove_receivers([])
+
+        fee_allocator.set_receiver(fee_receiver, 100)
+        with boa.reverts("receivers: does not exist"):
+            fee_allocator.remove_receivers([fee_receiver, fee_receiver])
+        with boa.reverts("receivers: does not exist"):
+            fee_allocator.remove_receivers([boa.env.generate_address()])
+
+
+def test_packed_configuration_gas(fee_allocator, admin, measure_gas):
+    old_receivers = [boa.env.generate_address() for _ in range(10)]
+    new_configs = [(boa.env.generate_address(), 100) for _ in range(10)]
+    with boa.env.prank(admin.address):
+        fee_allocator.set_multiple_receivers([(r, 100) for r in old_receivers])
+
+    reconfigurations = {
+        "single": [
+            (fee_allocator.remove_receiver, (r,)) for r in old_receivers
+        ]
+        + [(fee_allocator.set_multiple_receivers, (new_configs,))],
+        "batched": [
+            (fee_allocator.remove_receivers, (old_receivers,)),
+            (
+                fee_allocator.set_receivers_packed,
+                (pack_receivers(new_configs),),
+            ),
+        ],
+    }
+    execution_gas = {}
+    calldata_bytes = {}
+    for name, calls in reconfigurations.items():
+        execution_gas[name] = 0
+        calldata_bytes[name] = b""
+        with boa.env.anchor():
+            for fn, args in calls:
+                execution_gas[name] += measure_gas(
+                    fee_allocator, lambda: fn(*args), admin.address
+                )
+                calldata_bytes[name] += fn.prepare_calldata(*args)
+            assert get_configs(fee_allocator) == new_configs
+
+    calldata = {k: calldata_gas(v) for k, v in calldata_bytes.items()}
+    assert execution_gas["batched"] < execution_gas["single"]
+    assert calldata["batched"] < calldata["single"]
@@ -0,0 +1,44 @@
+import csv
+import io
+
+import pytest
+
+from script.receiver_cap_study import compile_variant, study, summary
+from script.utils.report import write_csv
+from src import FeeAllocator
+
+
+def test_compile_variant():
+    # the current cap compiles to the contract itself
+    assert (
+        compile_variant(10).compiler_data.bytecode
+        == FeeAllocator.compiler_data.bytecode
+    )
+    with pytest.raises(AssertionError, match="out of range"):
+        compile_variant(257)
+
+
+def test_receiver_cap_study():
+    rows = study([10, 20], budget=2_000_000)
+    assert [row.max_receivers for row in rows] == [10, 20]
+
+    for row in rows:
+        assert row.deployable
+        assert row.distribute_fees < row.distribute_fees_worst
+        assert row.max_receivers_in_budget > row.max_receivers
+    assert rows[0].distribute_fees < rows[1].distribute_fees
+    assert rows[0].set_multiple_receivers < rows[1].set_multiple_receivers
+    # the worst case grows linearly with the receivers
+    assert rows[0].gas_per_receiver == pytest.approx(
+        rows[1].gas_per_receiver, rel=0.01
+    )
+    assert "largest cap deployable and within budget: 20" in summary(
+        rows, 2_000_000
+    )
+
+    file = io.StringIO()
+    write_csv(rows, file)
+    file.seek(0)
+    table = list(csv.DictReader(file))
+    assert int(table[1]["max_receivers"]) == 20
+    assert float(table[1]["budget_share"]) == rows[1].budget_share
@@ -0,0 +1,148 @@
+import os
+import shutil
+import socket
+from pathlib import Path
+
+import boa
+import pytest
+from boa.environment import Env
+from boa.rpc import RPC
+
+import script.rpc_cassette
+from script.mocks import MockERC20
+from script.rpc_cassette import Cassette, CassetteMiss, use_cassette
+from script.utils.local_chain import LocalChain, LocalChainRPC, serve_rpc
+
+# recorded from the local node below, RECORD_CASSETTE=1 records it again
+LOCAL_NODE_CASSETTE = (
+    Path(__file__).parent / "cassettes" / "local-node.json.gz"
+)
+RECORD = os.environ.get("RECORD_CASSETTE") == "1"
+
+BLOCK = {
+    "number": "0x10",
+    "timestamp": "0x65000000",
+    "gasLimit": "0x1c9c380",
+    "baseFeePerGas": "0x1",
+    "hash": "0x" + "11" * 32,
+    "parentHash": "0x" + "22" * 32,
+}
+ACCOUNT = "0x" + "33" * 20
+TOKEN = "0x" + "55" * 20
+MINTER = "0x" + "66" * 20
+
+
+class FakeNode(RPC):
+    # an upstream node of an empty chain, counting the requests it serves
+    identifier = name = "fake"
+
+    def __init__(self, url):
+        self.n_requests = 0
+
+    def fetch(self, method, params):
+        self.n_requests += 1
+        return {
+            "eth_chainId": "0x1",
+            "eth_getBlockByNumber": BLOCK,
+            "eth_getCode": "0x",
+            "eth_getStorageAt": "0x" + "00" * 32,
+        }.get(method, "0x0")
+
+    fetch_uncached = fetch
+
+    def fetch_multi(self, payloads):
+        return [self.fetch(method, params) for method, params in payloads]
+
+
+@pytest.fixture
+def nodes(monkeypatch):
+    nodes = []
+
+    def connect(url):
+        nodes.append(FakeNode(url))
+        return nodes[-1]
+
+    monkeypatch.setattr(script.rpc_cassette, "EthereumRPC", connect)
+    return nodes
+
+
+def fork_and_read(account: str) -> tuple[int, bytes, int]:
+    with boa.fork("http://node"):
+        return (
+            boa.env.get_balance(account),
+            boa.env.get_code(account),
+            boa.env.evm.patch.block_number,
+        )
+
+
+def test_record_and_replay(tmp_path, nodes):
+    fork = boa.fork
+    path = tmp_path / "cassette.json.gz"
+    with use_cassette(Cassette(path, record=True)):
+        recorded = fork_and_read(ACCOUNT)
+    assert nodes[0].n_requests > 0
+    assert recorded == (0, b"", 0x10)
+
+    with use_cassette(Cassette.load(path)):
+        assert fork_and_read(ACCOUNT) == recorded
+        with pytest.raises(CassetteMiss):
+            fork_and_read("0x" + "44" * 20)
+    # replay never connects to the node
+    assert len(nodes) == 1
+    assert boa.fork is fork
+
+
+def test_cassette_is_deterministic(tmp_path, nodes):
+    paths = [tmp_path / "a.json.gz", tmp_path / "b.json.gz"]
+    for path in paths:
+        with use_cassette(Cassette(path, record=True)):
+            fork_and_read(ACCOUNT)
+    assert paths[0].read_bytes() == paths[1].read_bytes()
+
+
+@pytest.fixture
+def local_node():
+    # a node over HTTP, serving a chain where ACCOUNT holds tokens
+    env = Env()
+    env.evm.patch.timestamp = int(BLOCK["timestamp"], 16)
+    with boa.swap_env(env), boa.env.prank(MINTER):
+        token = MockERC20.deploy(override_address=TOKEN)
+        token.mint(ACCOUNT, 10**24)
+    with serve_rpc(LocalChainRPC(LocalChain(env))) as url:
+        yield url
+
+
+def disable_network(*args, **kwargs):
+    raise OSError("the network is disabled")
+
+
+def fork_and_transfer(url: str) -> tuple[int, ...]:
+    receiver = "0x" + "44" * 20
+    with boa.fork(url):
+        token = MockERC20.at(TOKEN)
+        with boa.env.prank(ACCOUNT):
+            token.transfer(receiver, 10**18)
+        return (
+            boa.env.evm.patch.block_number,
+            boa.env.evm.patch.timestamp,
+            token.totalSupply(),
+            token.balanceOf(ACCOUNT),
+            token.balanceOf(receiver),
+        )
+
+
+def test_replay_committed_cassette(tmp_path, local_node, monkeypatch):
+    path = tmp_path / "cassette.json.gz"
+    with use_cassette(Cassette(path, record=True)):
+        live = fork_and_transfer(local_node)
+    if RECORD:
+        shutil.copy(path, LOCAL_NODE_CASSETTE)
+    assert (
+        path.read_bytes() == LOCAL_NODE_CASSETTE.read_bytes()
+    ), "the recording changed, record it again with RECORD_CASSETTE=1"
+
+    monkeypatch.setattr(socket.socket, "connect", disable_network)
+    with pytest.raises(OSError):
+        socket.create_connection(("127.0.0.1", 1))
+    with use_cassette(Cassette.load(LOCAL_NODE_CASSETTE)):
+        assert fork_and_transfer("http://unreachable") == live
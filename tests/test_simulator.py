@@ -0,0 +1,178 @@
+import csv
+import io
+
+import boa
+import numpy as np
+import pytest
+
+from script.simulator import (
+    MAX_BPS,
+    load_fees,
+    simulate,
+    synthetic_fees,
+)
+from script.simulator.report import load_scenarios, summarize, weight_matrix
+from script.utils.fee_collector import WEEK
+from script.utils.report import write_csv
+
+# receiver weights, 0 for an empty slot
+SCENARIOS = [
+    [5000],
+    [1, 3333, 7, 0],
+    [499, 500, 501, 1, 1, 1, 1, 1, 1, 2],
+]
+# odd amounts, so that every share is floored, and one past 2**128
+FEES = [10**23 + 123_456_789, 9_999, 3, 2**190 + 2**64 + 1]
+
+
+def test_simulate_rounding():
+    split = simulate([1000, 1, 3], [10_001, 9], caller_fee=10**17)
+    # 10% of 10_001, floored, to the caller
+    assert split.caller_fee.tolist() == [1000, 0]
+    assert split.distributed.tolist() == [9001, 9]
+    assert split.payouts.tolist() == [[900, 0, 2], [0, 0, 0]]
+    assert split.vecrv.tolist() == [8099, 9]
+    # 9001 * 1004 // 10_000 = 903
+    assert split.dust.tolist() == [1, 0]
+    assert split.total_payouts.tolist() == [900, 0, 2]
+    assert split.total_vecrv == 8108
+
+
+def test_simulate_broadcasts():
+    fees = synthetic_fees(scenarios=200, weeks=8, seed=3)
+    assert fees.shape == (200, 8)
+    weights = np.array([[1000, 500], [1500, 0]], dtype=object)
+
+    split = simulate(weights, fees[:, None, :])
+    assert split.payouts.shape == (200, 2, 8, 2)
+    assert split.vecrv.shape == split.dust.shape == (200, 2, 8)
+    # all of the fees are accounted for, with the dust under a wei per
+    # receiver
+    assert (split.payouts.sum(axis=-1) + split.vecrv == fees[:, None]).all()
+    assert (split.dust >= 0).all() and (split.dust < 2).all()
+    # the second configuration pays its one receiver the first one's total
+    # share or more, as it floors once
+    assert (
+        split.payouts[:, 1, :, 0] >= split.payouts[:, 0].sum(axis=-1)
+    ).all()
+
+    one = simulate(weights[1], fees[7])
+    assert (one.payouts == split.payouts[7, 1]).all()
+
+
+def test_simulate_exact_to_uint256():
+    fees = [2**256 // MAX_BPS, 2**255 + 1]
+    split = simulate([MAX_BPS // 2], fees[:1])
+    assert split.payouts[0, 0] == fees[0] // 2
+    # the contracts revert where the product overflows
+    with pytest.raises(OverflowError, match="balance \\* weight"):
+        simulate([MAX_BPS // 2], fees)
+    with pytest.raises(OverflowError, match="fees \\* caller_fee"):
+        simulate([1], fees[1:], caller_fee=10**16)
+    with pytest.raises(OverflowError, match="out of uint256 range"):
+        simulate([1], [2**256])
+    with pytest.raises(TypeError, match="integers expected"):
+        simulate([1], [1e18])
+
+
+def test_simulate_receiver_limits():
+    with pytest.raises(ValueError, match="max total weight"):
+        simulate([[5000, 0], [4000, 1001]], [1])
+    with pytest.raises(ValueError, match="max limit reached"):
+        simulate([1] * 11, [1])
+    with pytest.raises(ValueError, match="above 100%"):
+        simulate([1], [1], caller_fee=10**18 + 1)
+
+
+def test_simulator_matches_fee_allocator(
+    fee_allocator,
+    admin,
+    actual_fee_collector,
+    actual_fee_distributor,
+    actual_crvusd,
+    mint_to_receiver,
+):
+    keeper = boa.env.generate_address()
+    width = max(len(weights) for weights in SCENARIOS)
+    weights = np.array(
+        [weights + [0] * (width - len(weights)) for weights in SCENARIOS],
+        dtype=object,
+    )
+
+    forwarded, caller_fees, caller, payouts, vecrv = [], [], [], [], []
+    for scenario in SCENARIOS:
+        receivers = [boa.env.generate_address() for _ in scenario]
+        with boa.env.anchor():
+            with boa.env.prank(admin.address):
+                fee_allocator.set_multiple_receivers(
+                    [(r, w) for r, w in zip(receivers, scenario) if w > 0]
+                )
+            for week, amount in enumerate(FEES):
+                boa.env.time_travel(seconds=WEEK * (week > 0))
+                mint_to_receiver(actual_fee_collector.address, amount)
+                forwarded.append(actual_crvusd.balanceOf(actual_fee_collector))
+                caller_fees.append(actual_fee_collector.fee(8))
+
+                before = [
+                    actual_crvusd.balanceOf(account)
+                    for account in [keeper, actual_fee_distributor, *receivers]
+                ]
+                with boa.env.prank(keeper):
+                    actual_fee_collector.forward([(0, 0, b"")], keeper)
+                after = [
+                    actual_crvusd.balanceOf(account)
+                    for account in [keeper, actual_fee_distributor, *receivers]
+                ]
+                delta = [b - a for a, b in zip(before, after)]
+                caller.append(delta[0])
+                vecrv.append(delta[1])
+                payouts.append(delta[2:] + [0] * (width - len(receivers)))
+
+    shape = (len(SCENARIOS), len(FEES))
+    split = simulate(
+        weights,
+        np.array(forwarded, dtype=object).reshape(shape),
+        np.array(caller_fees, dtype=object).reshape(shape),
+    )
+    assert split.caller_fee.flatten().tolist() == caller
+    assert split.vecrv.flatten().tolist() == vecrv
+    assert split.payouts.reshape(-1, width).tolist() == payouts
+
+
+def test_simulator_report(tmp_path):
+    scenarios_path = tmp_path / "scenarios.csv"
+    scenarios_path.write_text(
+        "scenario,receiver,weight\n"
+        "current,0x1111111111111111111111111111111111111111,1000\n"
+        "current,0x2222222222222222222222222222222222222222,500\n"
+        "proposal,0x1111111111111111111111111111111111111111,1500\n"
+    )
+    fees_path = tmp_path / "fees.csv"
+    fees_path.write_text("fees\n1000\n250000.5\n0.000000000000000007\n")
+
+    scenarios = load_scenarios(scenarios_path)
+    fees = load_fees(fees_path)
+    assert fees.tolist() == [1000 * 10**18, 250000_5 * 10**17, 7]
+    assert weight_matrix(scenarios).tolist() == [[1000, 500], [1500, 0]]
+
+    split = simulate(weight_matrix(scenarios), fees[None, None, :])
+    file = io.StringIO()
+    write_csv(summarize(scenarios, split), file)
+    file.seek(0)
+    table = {
+        (row["scenario"], row["recipient"]): row
+        for row in csv.DictReader(file)
+    }
+    assert len(table) == 9
+    assert table["proposal", "veCRV"]["weight"] == "8500"
+    # a single series: its total is the minimum, mean and maximum
+    row = table["current", "0x2222222222222222222222222222222222222222"]
+    assert (
+        row["min"]
+        == row["mean"]
+        == row["max"]
+        == str(sum(fees) * 500 // MAX_BPS)
+    )
+    # 7 wei pay neither receiver, 1 wei of their 15% goes to veCRV
+    assert table["current", "dust"]["max"] == "1"
+    assert table["proposal", "dust"]["max"] == "0"
@@ -0,0 +1,42 @@
+import csv
+import io
+
+import pytest
+
+from script.simulator.fees import load_fees
+from script.soak_benchmark import soak, trend_report
+from script.utils.report import write_csv
+
+
+def test_soak_benchmark():
+    rows = soak(epochs=40, seed=1, churn_rate=0.5)
+    assert [row.epoch for row in rows] == list(range(40))
+    assert max(row.n_receivers for row in rows) > 0
+
+    for row in rows:
+        assert 0 < row.distribute_gas < row.forward_gas
+        assert row.allocator_dust == 0
+        # each receiver's share is floored by less than 1 wei
+        assert 0 <= row.rounding < max(row.n_receivers, 1)
+    assert rows[-1].cumulative_rounding == pytest.approx(
+        sum(row.rounding for row in rows)
+    )
+
+    assert "dust: 0 wei" in trend_report(rows)
+
+    file = io.StringIO()
+    write_csv(rows, file)
+    file.seek(0)
+    table = list(csv.DictReader(file))
+    assert len(table) == len(rows)
+    assert int(table[-1]["distribute_gas"]) == rows[-1].distribute_gas
+
+
+def test_soak_benchmark_recorded_fees(tmp_path):
+    path = tmp_path / "fees.csv"
+    path.write_text("fees\n1000\n250000.5\n0.000000000000000001\n")
+    fees = list(load_fees(path))
+    assert fees == [1000 * 10**18, 250000_5 * 10**17, 1]
+
+    rows = soak(fees=fees)
+    assert [row.fees for row in rows] == fees
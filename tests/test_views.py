@@ -0,0 +1,82 @@
+import boa
+
+from script.utils.receivers import MAX_BPS, MAX_RECEIVERS, MAX_TOTAL_WEIGHT
+
+AMOUNT_TO_DISTRIBUTE = int(100_000 * 1e18) + 7
+
+
+def test_limits_match_contract(fee_allocator):
+    # the model, the simulator and the benchmarks import these
+    assert fee_allocator.MAX_RECEIVERS() == MAX_RECEIVERS
+    assert fee_allocator.MAX_TOTAL_WEIGHT() == MAX_TOTAL_WEIGHT
+    assert fee_allocator._constants.MAX_BPS == MAX_BPS
+
+
+def test_get_receivers(fee_allocator, admin, multiple_fee_receivers):
+    assert fee_allocator.get_receivers() == ([], 0, 10000)
+
+    configs = [
+        (receiver, 100 * (i + 1))
+        for i, receiver in enumerate(multiple_fee_receivers[:4])
+    ]
+    with boa.env.prank(admin.address):
+        fee_allocator.set_multiple_receivers(configs)
+        fee_allocator.set_payout_policy(configs[1][0], 10**18, 0)
+        fee_allocator.remove_receiver(configs[0][0])
+
+    configs = [configs[3], configs[1], configs[2]]
+    assert fee_allocator.get_receivers() == (configs, 900, 9100)
+
+
+def test_preview_distribution(
+    fee_allocator,
+    actual_hooker,
+    actual_crvusd,
+    actual_fee_distributor,
+    admin,
+    multiple_fee_receivers,
+    mint_to_receiver,
+):
+    configs = [
+        (receiver, 333 * (i + 1))
+        for i, receiver in enumerate(multiple_fee_receivers[:4])
+    ]
+    with boa.env.prank(admin.address):
+        fee_allocator.set_multiple_receivers(configs)
+
+    mint_to_receiver(actual_hooker.address, AMOUNT_TO_DISTRIBUTE)
+    amount = actual_crvusd.balanceOf(actual_hooker.address)
+    amounts, merkle_amount, distributor_share = (
+        fee_allocator.preview_distribution(amount)
+    )
+    assert merkle_amount == 0
+    assert sum(amounts) + distributor_share == amount
+
+    distributor_balance = actual_crvusd.balanceOf(actual_fee_distributor)
+    with boa.env.prank(actual_hooker.address):
+        fee_allocator.distribute_fees()
+
+    for (receiver, _), expected in zip(configs, amounts):
+        assert actual_crvusd.balanceOf(receiver) == expected
+    assert (
+        actual_crvusd.balanceOf(actual_fee_distributor)
+        == distributor_balance + distributor_share
+    )
+
+
+def test_preview_distribution_merkle(
+    fee_allocator, admin, multiple_fee_receivers
+):
+    with boa.env.prank(admin.address):
+        fee_allocator.set_receiver(multiple_fee_receivers[0], 4000)
+        fee_allocator.set_merkle_root(b"\x01" * 32, 2000)
+
+    amounts, merkle_amount, distributor_share = (
+        fee_allocator.preview_distribution(AMOUNT_TO_DISTRIBUTE)
+    )
+    # the merkle root's weight is capped to what the receivers leave
+    assert merkle_amount == AMOUNT_TO_DISTRIBUTE * 1000 // 10000
+    assert amounts == [AMOUNT_TO_DISTRIBUTE * 4000 // 10000]
+    assert distributor_share == (
+        AMOUNT_TO_DISTRIBUTE - merkle_amount - amounts[0]
+    )